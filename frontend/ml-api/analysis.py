@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+import time
+
+
+class AnalysisStore:
+    """Analysis results in one SQLite file, shared by every worker process.
+
+    A gunicorn worker can compute a result that another worker is asked for,
+    so results cannot live in process memory. Rows expire after ttl seconds
+    (wall clock, which all processes agree on). Every prune_interval seconds
+    a write also deletes expired rows and all but the newest max_results.
+    Each process and thread opens its own connection, since SQLite
+    connections must not cross a fork.
+    """
+
+    def __init__(self, path, ttl=300, max_results=10000, prune_interval=60, dumps=json.dumps):
+        self.path = path
+        self.ttl = ttl
+        self.max_results = max_results
+        self.prune_interval = prune_interval
+        self.dumps = dumps
+        self._local = threading.local()
+        self._next_prune = 0.0
+
+    def _connection(self):
+        if getattr(self._local, 'pid', None) != os.getpid():
+            # Imported here, like the pool's modules, so that importing the
+            # API does not pay for what only async analysis uses
+            import sqlite3
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            # WAL lets readers and the writer proceed together; NORMAL skips
+            # the fsync on every commit, which results that expire anyway
+            # do not need
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS results ('
+                               'request_id TEXT PRIMARY KEY, expires_at REAL NOT NULL, '
+                               'status TEXT NOT NULL, payload TEXT)')
+            connection.execute('CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def add(self, request_id, status, payload=None):
+        """Store a result, pruning the table if prune_interval has passed"""
+        now = time.time()
+        self._connection().execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                                   (request_id, now + self.ttl, status, self._encode(payload)))
+        if now >= self._next_prune:
+            self._next_prune = now + self.prune_interval
+            self.prune(now)
+
+    def prune(self, now=None):
+        """Delete expired results and all but the newest max_results"""
+        connection = self._connection()
+        connection.execute('DELETE FROM results WHERE expires_at <= ?',
+                           (time.time() if now is None else now,))
+        connection.execute('DELETE FROM results WHERE rowid <= (SELECT MAX(rowid) FROM results) - ?',
+                           (self.max_results,))
+
+    def get(self, request_id):
+        """(status, payload) for request_id, or None if unknown or expired"""
+        row = self._connection().execute(
+            'SELECT status, payload FROM results WHERE request_id = ? AND expires_at > ?',
+            (request_id, time.time())).fetchone()
+        if row is None:
+            return None
+        status, payload = row
+        return status, None if payload is None else json.loads(payload)
+
+    def _encode(self, payload):
+        return None if payload is None else self.dumps(payload)
+
+
+class AnalysisPipeline:
+    """Background worker pool for per-request analysis.
+
+    Jobs are keyed by a request ID. Nothing touches the store on the request
+    path: the pool writes each result ('complete' or 'error') once it is
+    ready, and until then this process answers lookups from its own futures
+    ('pending' while the job runs). Other worker processes see a result once
+    it is stored. The pool is created on first use in each process, since
+    threads do not survive a pre-fork server's fork.
+    """
+
+    def __init__(self, store, max_workers=4):
+        self.store = store
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        # request ID -> future of results not stored yet
+        self._unstored = {}
+
+    def _pool(self):
+        if self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor_pid != os.getpid():
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='analysis')
+                    self._executor_pid = os.getpid()
+                    self._unstored = {}
+        return self._executor
+
+    def submit(self, fn, *args):
+        """Run fn(*args) in the background; returns (request ID, future)"""
+        request_id = os.urandom(16).hex()
+        future = self._pool().submit(fn, *args)
+        self._track(request_id, future)
+        return request_id, future
+
+    def completed(self, result):
+        """Store an already computed result in the background; returns (request ID, future)"""
+        from concurrent.futures import Future
+        request_id = os.urandom(16).hex()
+        future = Future()
+        future.set_result(result)
+        self._track(request_id, future)
+        return request_id, future
+
+    def lookup(self, request_id):
+        """(status, result) for request_id, or None if unknown or expired.
+
+        The result of a failed job is {'error': message, 'error_type': name}.
+        """
+        future = self._unstored.get(request_id)
+        if future is None:
+            return self.store.get(request_id)
+        if not future.done():
+            return 'pending', None
+        return self._outcome(future)
+
+    def _track(self, request_id, future):
+        pool = self._pool()
+        self._unstored[request_id] = future
+        future.add_done_callback(lambda done: pool.submit(self._store, request_id, done))
+
+    @staticmethod
+    def _outcome(future):
+        error = future.exception()
+        if error is None:
+            return 'complete', future.result()
+        return 'error', {'error': str(error), 'error_type': type(error).__name__}
+
+    def _store(self, request_id, future):
+        try:
+            self.store.add(request_id, *self._outcome(future))
+        except Exception as e:
+            print(f"❌ Could not store analysis {request_id}: {str(e)}")
+        finally:
+            self._unstored.pop(request_id, None)
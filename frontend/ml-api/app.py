@@ -1,111 +1,23 @@
 from flask import Flask, request, jsonify
-import pandas as pd
 import numpy as np
-import random
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-import joblib
 import os
+from metrics import Metrics
+from fast_json import FastJSONProvider
+from quiz_model import CATEGORIES, QUESTIONS, CompiledLogistic, load_artifacts, risk_levels
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+metrics = Metrics("quiz")
 
-MODEL_PATH = "biometric_model.pkl"
-ENCODER_PATH = "label_encoder.pkl"
-SCALER_PATH = "scaler.pkl"
+# Serving only loads the artifacts built by `python quiz_model.py` and fails
+# at startup if they are missing
+model, le, scaler = load_artifacts()
+print("✅ Model loaded from saved files!")
 
-# Enhanced dummy dataset generation with more realistic patterns
-if not os.path.exists("biometric_quiz_data.csv"):
-    rows = []
-    for _ in range(500):  # Increased dataset size
-        # Generate more realistic scores with correlations
-        base_score = random.randint(5, 18)  # Base biosecurity level
-        
-        # Generate correlated scores across categories
-        scores = []
-        for i in range(15):
-            if i < 3:  # Hygiene category
-                score = max(0, min(20, base_score + random.randint(-3, 3)))
-            elif i < 6:  # Access Control
-                score = max(0, min(20, base_score + random.randint(-4, 2)))
-            elif i < 9:  # Quarantine
-                score = max(0, min(20, base_score + random.randint(-5, 1)))
-            elif i < 12:  # Pest Control
-                score = max(0, min(20, base_score + random.randint(-3, 3)))
-            else:  # Feed & Water
-                score = max(0, min(20, base_score + random.randint(-2, 4)))
-            scores.append(score)
-        
-        # Calculate biometric score (0-100)
-        biometric_score = int((sum(scores) / 300) * 100)
-        
-        # Determine risk level based on biometric score
-        if biometric_score < 40:
-            risk = "High"
-        elif biometric_score < 70:
-            risk = "Medium"
-        else:
-            risk = "Low"
-            
-        rows.append(scores + [biometric_score, risk])
-    
-    columns = [f"q{i}" for i in range(1,16)] + ["biometric_score", "risk"]
-    pd.DataFrame(rows, columns=columns).to_csv("biometric_quiz_data.csv", index=False)
-    print("✅ Enhanced dummy dataset created with biometric scores!")
-
-# Train enhanced model if not exists
-if os.path.exists(MODEL_PATH) and os.path.exists(ENCODER_PATH) and os.path.exists(SCALER_PATH):
-    model = joblib.load(MODEL_PATH)
-    le = joblib.load(ENCODER_PATH)
-    scaler = joblib.load(SCALER_PATH)
-    print("✅ Model loaded from saved files!")
-else:
-    df = pd.read_csv("biometric_quiz_data.csv")
-    
-    # Prepare features and target
-    X = df.drop(["risk", "biometric_score"], axis=1)
-    y = df["risk"]
-    
-    # Split data for training
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Train logistic regression
-    model = LogisticRegression(max_iter=1000, random_state=42, C=1.0)
-    model.fit(X_train_scaled, y_train)
-    
-    # Evaluate model
-    y_pred = model.predict(X_test_scaled)
-    accuracy = accuracy_score(y_test, y_pred)
-    print(f"✅ Model trained with accuracy: {accuracy:.2f}")
-    
-    # Save model components
-    joblib.dump(model, MODEL_PATH)
-    joblib.dump(le, ENCODER_PATH)
-    joblib.dump(scaler, SCALER_PATH)
-    print("✅ Model, encoder, and scaler saved!")
-
-def calculate_biometric_score(scores):
-    """Calculate biometric score from quiz answers"""
-    total_score = sum(scores)
-    biometric_score = int((total_score / 300) * 100)  # Convert to 0-100 scale
-    return biometric_score
-
-def get_risk_level(biometric_score):
-    """Determine risk level based on biometric score"""
-    if biometric_score < 40:
-        return "High"
-    elif biometric_score < 70:
-        return "Medium"
-    else:
-        return "Low"
+# Scaler folded into the logistic weights: one matmul + softmax per batch
+scorer = CompiledLogistic.from_sklearn(model, scaler)
 
-def get_recommendations(biometric_score, category_scores):
+def get_recommendations(biometric_score, category_averages):
     """Generate specific recommendations based on scores"""
     recommendations = []
     
@@ -124,12 +36,7 @@ def get_recommendations(biometric_score, category_scores):
         recommendations.append("Consider advanced biosecurity measures")
     
     # Category-specific recommendations
-    categories = ["Hygiene", "Access Control", "Quarantine", "Pest Control", "Feed & Water"]
-    for i, category in enumerate(categories):
-        start_idx = i * 3
-        end_idx = start_idx + 3
-        category_avg = sum(category_scores[start_idx:end_idx]) / 3
-        
+    for category, category_avg in zip(CATEGORIES, category_averages):
         if category_avg < 10:
             recommendations.append(f"Priority: Improve {category} practices (current avg: {category_avg:.1f}/20)")
         elif category_avg < 15:
@@ -137,58 +44,88 @@ def get_recommendations(biometric_score, category_scores):
     
     return recommendations
 
+def quiz_row(record):
+    """The 15 answers of a quiz record; missing answers count as 0.
+
+    Raises ValueError unless the record is an object whose answers are
+    numbers (numeric strings such as "5" are rejected, not converted).
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Expected an object of quiz answers")
+    row = [record.get(question, 0) for question in QUESTIONS]
+    invalid = [question for question, answer in zip(QUESTIONS, row) if not isinstance(answer, (int, float))]
+    if invalid:
+        raise ValueError(f"Answers must be numbers: {invalid}")
+    return row
+
+def quiz_matrix(records):
+    """(N, 15) answer matrix from quiz records; see quiz_row"""
+    return np.array([quiz_row(record) for record in records], dtype=np.float64)
+
+def score_quizzes(answers):
+    """Score an (N, 15) answer matrix in one pass.
+
+    Biometric scores, risk levels and category averages are array
+    reductions, and the model runs once: the compiled scorer's
+    predict_proba for the whole batch, with labels taken from its argmax.
+    """
+    totals = answers.sum(axis=1)
+    biometric_scores = ((totals / 300) * 100).astype(int)
+    category_averages = answers.reshape(len(answers), len(CATEGORIES), 3).mean(axis=2)
+    
+    with metrics.stage("predict"):
+        probs = scorer.predict_proba(answers)
+    best = probs.argmax(axis=1)
+    
+    return {
+        "biometric_scores": biometric_scores,
+        "risk_levels": risk_levels(biometric_scores),
+        "predicted_risks": scorer.classes_[best],
+        "confidences": probs[np.arange(len(probs)), best],
+        "category_averages": category_averages
+    }
+
+def build_quiz_result(scored, i):
+    """Response body for row i of score_quizzes output"""
+    biometric_score = int(scored["biometric_scores"][i])
+    risk_level = str(scored["risk_levels"][i])
+    confidence = float(scored["confidences"][i])
+    category_averages = scored["category_averages"][i].tolist()
+    category_scores = {category: int(avg) for category, avg in zip(CATEGORIES, category_averages)}
+    
+    return {
+        "biometric_score": biometric_score,
+        "risk_level": risk_level,
+        "prediction": f"Biosecurity Risk: {scored['predicted_risks'][i]}",
+        "confidence": confidence,
+        "category_scores": category_scores,
+        "recommendations": get_recommendations(biometric_score, category_averages),
+        "detailed_analysis": {
+            "overall_assessment": f"Your farm has a biosecurity score of {biometric_score}/100",
+            "risk_category": f"Risk Level: {risk_level}",
+            "ml_confidence": f"AI Confidence: {confidence:.1%}",
+            "priority_areas": [cat for cat, score in category_scores.items() if score < 15]
+        }
+    }
+
+metrics.instrument(app, lambda: {"model_name": type(model).__name__})
+
 @app.route("/predict", methods=["POST"])
 def predict():
     try:
-        data = request.json
-        
-        # Extract quiz scores
-        quiz_scores = [data.get(f"q{i}", 0) for i in range(1, 16)]
-        
-        # Calculate biometric score
-        biometric_score = calculate_biometric_score(quiz_scores)
-        
-        # Determine risk level
-        risk_level = get_risk_level(biometric_score)
-        
-        # Get ML predictions
-        features = np.array(quiz_scores).reshape(1, -1)
-        features_scaled = scaler.transform(features)
-        
-        # Get prediction probabilities
-        probs = model.predict_proba(features_scaled)[0]
-        predicted_risk = model.predict(features_scaled)[0]
+        with metrics.stage("parse"):
+            answers = quiz_matrix([request.json])
         
-        # Get confidence (highest probability)
-        confidence = float(np.max(probs))
+        scored = score_quizzes(answers)
         
-        # Generate recommendations
-        recommendations = get_recommendations(biometric_score, quiz_scores)
+        with metrics.stage("recommendations"):
+            response = build_quiz_result(scored, 0)
         
-        # Calculate category scores
-        category_scores = {}
-        categories = ["Hygiene", "Access Control", "Quarantine", "Pest Control", "Feed & Water"]
-        for i, category in enumerate(categories):
-            start_idx = i * 3
-            end_idx = start_idx + 3
-            category_scores[category] = int(sum(quiz_scores[start_idx:end_idx]) / 3)
-        
-        return jsonify({
-            "biometric_score": biometric_score,
-            "risk_level": risk_level,
-            "prediction": f"Biosecurity Risk: {predicted_risk}",
-            "confidence": confidence,
-            "category_scores": category_scores,
-            "recommendations": recommendations,
-            "detailed_analysis": {
-                "overall_assessment": f"Your farm has a biosecurity score of {biometric_score}/100",
-                "risk_category": f"Risk Level: {risk_level}",
-                "ml_confidence": f"AI Confidence: {confidence:.1%}",
-                "priority_areas": [cat for cat, score in category_scores.items() if score < 15]
-            }
-        })
+        with metrics.stage("serialize"):
+            return jsonify(response)
         
     except Exception as e:
+        metrics.error(e)
         return jsonify({
             "error": str(e),
             "biometric_score": 0,
@@ -197,9 +134,52 @@ def predict():
             "recommendations": ["Please check your input data and try again"]
         }), 400
 
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    """Score a JSON array of quiz submissions with one model call.
+
+    Results come back in input order; records that are not objects of
+    numeric answers get an error entry instead.
+    """
+    try:
+        with metrics.stage("parse"):
+            records = request.get_json()
+            if not isinstance(records, list) or not records:
+                raise ValueError("Expected a non-empty JSON array of quiz submissions")
+            
+            results = [None] * len(records)
+            rows = []
+            valid_indices = []
+            for index, record in enumerate(records):
+                try:
+                    rows.append(quiz_row(record))
+                    valid_indices.append(index)
+                except ValueError as e:
+                    results[index] = {"index": index, "status": "error", "error": str(e)}
+        
+        if rows:
+            scored = score_quizzes(np.array(rows, dtype=np.float64))
+            with metrics.stage("recommendations"):
+                for i, index in enumerate(valid_indices):
+                    results[index] = {"index": index, "status": "success", **build_quiz_result(scored, i)}
+        
+        response = {
+            "count": len(records),
+            "succeeded": len(valid_indices),
+            "failed": len(records) - len(valid_indices),
+            "results": results
+        }
+        with metrics.stage("serialize"):
+            return jsonify(response)
+        
+    except Exception as e:
+        metrics.error(e)
+        return jsonify({"error": str(e)}), 400
+
 @app.route("/health", methods=["GET"])
 def health_check():
     return jsonify({"status": "healthy", "model_loaded": True})
 
 if __name__ == "__main__":
-    app.run(port=8000, debug=True)
+    # Development server only; use `python serve.py quiz` in production
+    app.run(port=8000, debug=os.environ.get("FLASK_DEBUG") == "1")
@@ -0,0 +1,74 @@
+"""Compare CompiledForest with sklearn's RandomForestRegressor.predict.
+
+    python bench_forest.py                  # 2000 training rows, 10000 batch rows
+    python bench_forest.py 20000 100000     # custom training and batch sizes
+
+Fails if the compiled predictions drift from sklearn's beyond TOLERANCE.
+"""
+import sys
+import time
+import numpy as np
+from biosecurity_model import COMPILED_MAX_ROWS, BiosecurityMLModel
+from tree_compiler import CompiledForest
+
+TOLERANCE = 1e-9
+
+
+def best_time(fn, repeat):
+    """Fastest of repeat calls, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark(n_train=2000, n_batch=10000):
+    from sklearn.ensemble import RandomForestRegressor
+
+    model = BiosecurityMLModel()
+    df = model.generate_synthetic_data(n_samples=n_train)
+    df['biosecurity_score'] = model.calculate_biosecurity_scores(df)
+    X = model.prepare_features(df).drop('biosecurity_score', axis=1).to_numpy(dtype=np.float32)
+    y = df['biosecurity_score'].to_numpy()
+
+    forest = RandomForestRegressor(n_estimators=100, random_state=42).fit(X, y)
+    compiled = CompiledForest.from_sklearn(forest)
+
+    batch = X[np.random.default_rng(0).integers(0, len(X), n_batch)]
+    max_error = float(np.max(np.abs(forest.predict(batch) - compiled.predict(batch))))
+
+    row = batch[:1]
+    small = batch[:COMPILED_MAX_ROWS]
+    return {
+        'nodes': len(compiled.threshold),
+        'max_depth': compiled.max_depth,
+        'max_abs_error': max_error,
+        'single_sklearn_ms': best_time(lambda: forest.predict(row), 50) * 1000,
+        'single_compiled_ms': best_time(lambda: compiled.predict(row), 50) * 1000,
+        'small_sklearn_ms': best_time(lambda: forest.predict(small), 20) * 1000,
+        'small_compiled_ms': best_time(lambda: compiled.predict(small), 20) * 1000,
+        'batch_sklearn_ms': best_time(lambda: forest.predict(batch), 5) * 1000,
+        'batch_compiled_ms': best_time(lambda: compiled.predict(batch), 5) * 1000,
+    }
+
+
+if __name__ == '__main__':
+    n_train = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_batch = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    print(f"🌲 Random Forest on {n_train} rows, batch of {n_batch}...")
+    stats = benchmark(n_train, n_batch)
+    print(f"Nodes: {stats['nodes']}, max depth: {stats['max_depth']}")
+    print(f"Single row: sklearn {stats['single_sklearn_ms']:.3f} ms, "
+          f"compiled {stats['single_compiled_ms']:.3f} ms "
+          f"({stats['single_sklearn_ms'] / stats['single_compiled_ms']:.1f}x)")
+    print(f"{COMPILED_MAX_ROWS} rows:    sklearn {stats['small_sklearn_ms']:.3f} ms, "
+          f"compiled {stats['small_compiled_ms']:.3f} ms "
+          f"({stats['small_sklearn_ms'] / stats['small_compiled_ms']:.1f}x)")
+    print(f"Batch:      sklearn {stats['batch_sklearn_ms']:.1f} ms, "
+          f"compiled {stats['batch_compiled_ms']:.1f} ms "
+          f"({stats['batch_sklearn_ms'] / stats['batch_compiled_ms']:.1f}x)")
+    print(f"Max abs error: {stats['max_abs_error']:.2e} (tolerance {TOLERANCE:.0e})")
+    sys.exit(0 if stats['max_abs_error'] <= TOLERANCE else 1)
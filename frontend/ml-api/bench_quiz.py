@@ -0,0 +1,70 @@
+"""Compare CompiledLogistic with StandardScaler + LogisticRegression.predict_proba.
+
+    python bench_quiz.py                 # batch of 10000 rows
+    python bench_quiz.py 100000          # custom batch size
+
+Fails if the compiled probabilities drift from sklearn's beyond TOLERANCE.
+"""
+import sys
+import time
+import numpy as np
+from quiz_model import CompiledLogistic
+
+TOLERANCE = 1e-9
+
+
+def best_time(fn, repeat):
+    """Fastest of repeat calls, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark(n_batch=10000):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+
+    # Quiz-shaped data: 15 answers of 0-20, risk from the biometric score
+    rng = np.random.default_rng(42)
+    answers = rng.integers(0, 21, size=(2000, 15)).astype(np.float64)
+    scores = (answers.sum(axis=1) / 300 * 100).astype(int)
+    risk = np.where(scores < 40, 'High', np.where(scores < 70, 'Medium', 'Low'))
+
+    scaler = StandardScaler().fit(answers)
+    model = LogisticRegression(max_iter=1000, random_state=42, C=1.0).fit(scaler.transform(answers), risk)
+    compiled = CompiledLogistic.from_sklearn(model, scaler)
+
+    batch = rng.integers(0, 21, size=(n_batch, 15)).astype(np.float64)
+    expected = model.predict_proba(scaler.transform(batch))
+    max_error = float(np.max(np.abs(expected - compiled.predict_proba(batch))))
+    row = batch[:1]
+    row_list = row[0].tolist()
+    max_error = max(max_error, float(np.max(np.abs(
+        model.predict_proba(scaler.transform(row))[0] - compiled.predict_proba_one(row_list)))))
+
+    return {
+        'max_abs_error': max_error,
+        'single_sklearn_us': best_time(lambda: model.predict_proba(scaler.transform(row)), 200) * 1e6,
+        'single_compiled_us': best_time(lambda: compiled.predict_proba(row), 200) * 1e6,
+        'single_python_us': best_time(lambda: compiled.predict_proba_one(row_list), 200) * 1e6,
+        'batch_sklearn_ms': best_time(lambda: model.predict_proba(scaler.transform(batch)), 10) * 1000,
+        'batch_compiled_ms': best_time(lambda: compiled.predict_proba(batch), 10) * 1000,
+    }
+
+
+if __name__ == '__main__':
+    n_batch = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    print(f"📈 Logistic regression, batch of {n_batch}...")
+    stats = benchmark(n_batch)
+    print(f"Single row: sklearn {stats['single_sklearn_us']:.1f} µs, "
+          f"compiled {stats['single_compiled_us']:.1f} µs, "
+          f"predict_proba_one {stats['single_python_us']:.1f} µs")
+    print(f"Batch:      sklearn {stats['batch_sklearn_ms']:.2f} ms, "
+          f"compiled {stats['batch_compiled_ms']:.2f} ms "
+          f"({stats['batch_sklearn_ms'] / stats['batch_compiled_ms']:.1f}x)")
+    print(f"Max abs error: {stats['max_abs_error']:.2e} (tolerance {TOLERANCE:.0e})")
+    sys.exit(0 if stats['max_abs_error'] <= TOLERANCE else 1)
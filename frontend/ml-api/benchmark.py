@@ -0,0 +1,218 @@
+"""Training and inference benchmarks across data sizes.
+
+    python benchmark.py                                  # 1k, 100k and 1m rows
+    python benchmark.py --sizes 1k --save-baseline       # store the baseline
+    python benchmark.py --sizes 1k --baseline benchmark_baseline.json
+
+Each size times data generation, label scoring, prepare_features, fitting
+every candidate, single and batch predictions, and /predict throughput on
+the biosecurity API through Flask's in-process test client. /predict on the
+quiz API (app.py) is measured once. Results are written as flat
+"<size>/<metric>" keys; metrics ending in _rps are throughputs (higher is
+better), everything else is a duration (lower is better). Exits non-zero
+when any metric is more than --threshold worse than the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+import numpy as np
+from biosecurity_model import BiosecurityMLModel, SCALED_MODELS
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+# Candidates that scale superlinearly are fitted on at most this many rows
+TRAIN_ROW_LIMITS = {'SVR': 20_000, 'Neural Network': 200_000}
+
+# Records per batch prediction and distinct payloads for the API runs
+BATCH_SIZE = 1000
+
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def best_of(fn, repeat):
+    """Fastest of repeat calls, in seconds"""
+    return min(timed(fn) for _ in range(repeat))
+
+
+def serving_model(base, name, estimator, scaler):
+    """BiosecurityMLModel serving a fitted candidate with base's encoders"""
+    model = BiosecurityMLModel()
+    model.label_encoders = base.label_encoders
+    model.feature_names = base.feature_names
+    model.scalers = {'standard': scaler}
+    model.best_model = estimator
+    model.best_model_name = name
+    model.compile_inference()
+    return model
+
+
+def biosecurity_api_rps(model, records, n_requests):
+    """/predict requests per second with model active and the cache off"""
+    import biosecurity_api
+
+    biosecurity_api.MODEL_RELOAD_INTERVAL = 0
+    biosecurity_api.prediction_cache.max_size = 0
+    biosecurity_api.activate_model(model)
+    client = biosecurity_api.app.test_client()
+
+    start = time.perf_counter()
+    for i in range(n_requests):
+        response = client.post('/predict', json=records[i % len(records)])
+        if response.status_code != 200:
+            raise RuntimeError(f"/predict returned {response.status_code}: {response.get_data(as_text=True)}")
+    return n_requests / (time.perf_counter() - start)
+
+
+def quiz_api_rps(n_requests):
+    """/predict requests per second on app.py"""
+    import app as quiz_app
+
+    client = quiz_app.app.test_client()
+    rng = random.Random(42)
+    payloads = [{f'q{i}': rng.randint(0, 20) for i in range(1, 16)} for _ in range(BATCH_SIZE)]
+
+    start = time.perf_counter()
+    for i in range(n_requests):
+        response = client.post('/predict', json=payloads[i % len(payloads)])
+        if response.status_code != 200:
+            raise RuntimeError(f"/predict returned {response.status_code}: {response.get_data(as_text=True)}")
+    return n_requests / (time.perf_counter() - start)
+
+
+def bench_size(n_rows, candidates=None, api_requests=2000):
+    """Benchmark every stage on n_rows synthetic assessments"""
+    from sklearn.preprocessing import StandardScaler
+
+    results = {}
+    model = BiosecurityMLModel()
+
+    start = time.perf_counter()
+    df = model.generate_synthetic_data(n_samples=n_rows)
+    results['generate_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df['biosecurity_score'] = model.calculate_biosecurity_scores(df)
+    results['labels_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df_processed = model.prepare_features(df)
+    results['prepare_features_s'] = time.perf_counter() - start
+
+    X = df_processed.drop('biosecurity_score', axis=1)
+    y = df_processed['biosecurity_score']
+    scaler = StandardScaler().fit(X)
+    X_scaled = scaler.transform(X)
+    records = json.loads(df.drop(columns='biosecurity_score').head(BATCH_SIZE).to_json(orient='records'))
+
+    served = {}
+    for name, estimator in model.candidate_models().items():
+        if candidates and name not in candidates:
+            continue
+        rows = min(n_rows, TRAIN_ROW_LIMITS.get(name, n_rows))
+        X_fit = X_scaled[:rows] if name in SCALED_MODELS else X.iloc[:rows]
+        print(f"  fitting {name} on {rows} rows...")
+        results[f'train_s[{name}]'] = timed(lambda: estimator.fit(X_fit, y.iloc[:rows]))
+
+        candidate = serving_model(model, name, estimator, scaler)
+        results[f'predict_single_ms[{name}]'] = best_of(lambda: candidate.predict_score(records[0]), 100) * 1000
+        results[f'predict_batch_ms[{name}]'] = best_of(lambda: candidate.predict_scores(records), 5) * 1000
+        served[name] = candidate
+
+    if served and api_requests:
+        api_model = served.get('Random Forest') or next(iter(served.values()))
+        results['api_predict_rps'] = biosecurity_api_rps(api_model, records, api_requests)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Metrics more than threshold (a fraction) worse than the baseline"""
+    regressions = []
+    for key, value in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if key.endswith('_rps'):
+            change = base / value - 1 if value else float('inf')
+        else:
+            change = value / base - 1
+        if change > threshold:
+            regressions.append((key, base, value, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training and inference")
+    parser.add_argument('--sizes', default=','.join(SIZES),
+                        help=f"comma-separated sizes from {list(SIZES)}")
+    parser.add_argument('--candidates', help="comma-separated model names (default: all)")
+    parser.add_argument('--api-requests', type=int, default=2000,
+                        help="/predict requests per API throughput run (0 skips them)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown before a metric counts as a regression")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="write the results to --baseline instead of comparing")
+    args = parser.parse_args()
+    candidates = args.candidates.split(',') if args.candidates else None
+
+    results = {}
+    for label in args.sizes.split(','):
+        print(f"⏱️  Benchmarking {label} rows...")
+        for metric, value in bench_size(SIZES[label], candidates, args.api_requests).items():
+            results[f'{label}/{metric}'] = value
+
+    if args.api_requests:
+        print("⏱️  Benchmarking quiz API...")
+        try:
+            results['quiz/api_predict_rps'] = quiz_api_rps(args.api_requests)
+        except Exception as e:
+            print(f"⚠️  Skipping quiz API: {str(e)}")
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'machine': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.threshold)
+    for key, base, value, change in regressions:
+        print(f"❌ {key}: {base:.4g} -> {value:.4g} ({change:+.0%} worse)")
+    if not regressions:
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,33 +1,213 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-import pandas as pd
 import numpy as np
-import joblib
 import os
+import threading
+import time
 from datetime import datetime
 import traceback
+from biosecurity_model import BiosecurityMLModel
+from scoring import SCORING_TABLE
+from prediction_cache import PredictionCache
+from schema import ASSESSMENT_SCHEMA
+from model_registry import ModelRegistry
+from drift import DriftMonitor
+from metrics import Metrics
+from analysis import AnalysisPipeline, AnalysisStore
+from fast_json import FastJSONProvider, compact_response
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
+metrics = Metrics('biosecurity')
 
-# Global variables for the model
+# Global variables for the model. Request handlers read `model` once and use
+# that reference throughout, so a hot swap never changes the model under an
+# in-flight request.
 model = None
 model_loaded = False
+model_lock = threading.Lock()
 
-def load_model():
-    """Load the trained biosecurity model"""
-    global model, model_loaded
+registry = ModelRegistry(os.environ.get('MODEL_REGISTRY_DIR', 'model_registry'))
+
+# Seconds between registry checks for a new version (0 disables the watcher)
+MODEL_RELOAD_INTERVAL = float(os.environ.get('MODEL_RELOAD_INTERVAL', 30))
+
+# Before a candidate model is activated it scores MODEL_CANARY_ROWS
+# assessments drawn like the training data. Its mean absolute error against
+# the scoring table must stay within MODEL_CANARY_MAE_FACTOR times the MAE
+# it reached on its holdout split at training time, and below the error of
+# always predicting the canaries' mean score.
+CANARY_ROWS = int(os.environ.get('MODEL_CANARY_ROWS', 500))
+CANARY_MAE_FACTOR = float(os.environ.get('MODEL_CANARY_MAE_FACTOR', 1.25))
+CANARY_SEED = 0
+
+# 'ml' serves the trained model, 'rules' scores straight from the points table
+# the training labels come from. Requests can override it with ?mode=.
+SCORING_MODES = ('ml', 'rules')
+SCORING_MODE = os.environ.get('SCORING_MODE', 'ml')
+if SCORING_MODE not in SCORING_MODES:
+    raise ValueError(f"SCORING_MODE must be one of {list(SCORING_MODES)}, got '{SCORING_MODE}'")
+
+# Fraction of predictions scored both ways to track model drift from the rules
+drift_monitor = DriftMonitor(float(os.environ.get('DRIFT_SAMPLE_RATE', 0.01)))
+
+# 'inline' returns the score with its category scores and recommendations.
+# 'async' returns the score right away and computes the analysis on a
+# background pool, fetched from /predict/analysis/<request_id>; 'stream'
+# sends both as server-sent events. Requests can override it with ?analysis=.
+ANALYSIS_MODES = ('inline', 'async', 'stream')
+ANALYSIS_MODE = os.environ.get('ANALYSIS_MODE', 'inline')
+if ANALYSIS_MODE not in ANALYSIS_MODES:
+    raise ValueError(f"ANALYSIS_MODE must be one of {list(ANALYSIS_MODES)}, got '{ANALYSIS_MODE}'")
+
+# Seconds a streamed response waits for its analysis
+ANALYSIS_TIMEOUT = float(os.environ.get('ANALYSIS_TIMEOUT', 30))
+
+# Async results live in a SQLite file every worker process on the host
+# shares, so any worker can answer /predict/analysis/<request_id>
+analysis_pipeline = AnalysisPipeline(
+    AnalysisStore(os.environ.get('ANALYSIS_STORE', 'analysis_results.sqlite3'),
+                  ttl=float(os.environ.get('ANALYSIS_TTL', 300)),
+                  prune_interval=float(os.environ.get('ANALYSIS_PRUNE_INTERVAL', 60)),
+                  dumps=app.json.dumps),
+    max_workers=int(os.environ.get('ANALYSIS_WORKERS', 4))
+)
+
+def build_canary_inputs():
+    """The sample input plus CANARY_ROWS in-distribution assessments (fixed seed)"""
+    from synthetic_data import generate_records
+    return [SAMPLE_INPUT] + generate_records(CANARY_ROWS, np.random.default_rng(CANARY_SEED))
+
+def holdout_mae(candidate):
+    """MAE the candidate reached on its holdout split at training time, or None"""
+    metrics = (candidate.metadata or {}).get('metrics') or {}
+    return (metrics.get(candidate.best_model_name) or {}).get('MAE')
+
+def validate_candidate(candidate):
+    """Errors from running a candidate model on the canary inputs"""
+    canaries = build_canary_inputs()
     try:
-        if os.path.exists('biosecurity_model.pkl'):
-            model = joblib.load('biosecurity_model.pkl')
-            model_loaded = True
-            print("✅ Biosecurity model loaded successfully")
-        else:
-            print("❌ Model file not found. Please train the model first.")
-            model_loaded = False
+        predicted = np.asarray(candidate.predict_scores(canaries), dtype=np.float64)
     except Exception as e:
-        print(f"❌ Error loading model: {str(e)}")
-        model_loaded = False
+        return [f'canary prediction failed: {str(e)}']
+    if not np.all(np.isfinite(predicted)):
+        return [f'{int(np.sum(~np.isfinite(predicted)))} canary predictions are not finite']
+    
+    expected = np.array([SCORING_TABLE.score_record(canary)[0] for canary in canaries], dtype=np.float64)
+    mae = float(np.mean(np.abs(predicted - expected)))
+    errors = []
+    baseline = float(np.mean(np.abs(expected - expected.mean())))
+    if mae >= baseline:
+        errors.append(f'canary MAE {mae:.2f} is no better than a constant prediction ({baseline:.2f})')
+    reference = holdout_mae(candidate)
+    if reference is not None and mae > CANARY_MAE_FACTOR * reference:
+        errors.append(f'canary MAE {mae:.2f} exceeds {CANARY_MAE_FACTOR} x holdout MAE {reference:.2f}')
+    return errors
+
+def activate_model(candidate):
+    """Atomically make candidate the model used by new requests"""
+    global model, model_loaded
+    with model_lock:
+        model = candidate
+        model_loaded = True
+    prediction_cache.clear()
+    drift_monitor.reset()
+
+def reload_model(version=None):
+    """Load a registry version (default: latest), check it and swap it in.
+
+    Returns (activated, message). The current model keeps serving while the
+    candidate loads and if it fails its canary checks.
+    """
+    version = version or registry.latest()
+    if version is None:
+        return False, 'No model versions in the registry'
+    
+    candidate = registry.load(version, BiosecurityMLModel())
+    errors = validate_candidate(candidate)
+    if errors:
+        return False, f'Version {version} rejected: {errors}'
+    
+    activate_model(candidate)
+    return True, f'Version {version} activated'
+
+# Registry versions that failed to load or failed their canary checks
+rejected_versions = set()
+
+def load_registry_version():
+    """Activate the newest registry version that loads and passes its canaries.
+
+    Rejected versions are logged and skipped. Returns True if one was activated.
+    """
+    for version in reversed(registry.versions()):
+        if version in rejected_versions:
+            continue
+        try:
+            activated, message = reload_model(version)
+        except Exception as e:
+            activated, message = False, f'Version {version} failed to load: {str(e)}'
+        print(f"{'✅' if activated else '❌'} {message}")
+        if activated:
+            return True
+        rejected_versions.add(version)
+    return False
+
+def load_model():
+    """Load the trained biosecurity model.
+
+    Serves the newest usable registry version, falling back to older
+    versions, then to the memory-mapped artifact and the pickle.
+    """
+    if load_registry_version():
+        return
+    if registry.versions():
+        print("⚠️  No registry version passed its checks; falling back to the model files")
+    
+    # The memory-mapped artifact first: workers share its pages
+    for path, load in (('biosecurity_model.bsm', BiosecurityMLModel.load_artifact),
+                       ('biosecurity_model.pkl', BiosecurityMLModel.load_model)):
+        if not os.path.exists(path):
+            continue
+        try:
+            candidate = BiosecurityMLModel()
+            load(candidate, path)
+        except Exception as e:
+            print(f"❌ Error loading {path}: {str(e)}")
+            continue
+        activate_model(candidate)
+        print(f"✅ Biosecurity model loaded from {path}")
+        return
+    print("❌ No usable model found. Please train the model first.")
+
+watcher_pid = None
+
+def watch_registry():
+    """Activate new registry versions as they appear"""
+    while True:
+        time.sleep(MODEL_RELOAD_INTERVAL)
+        try:
+            latest = registry.latest()
+            current = model.version if model is not None else None
+            if latest is None or latest == current or latest in rejected_versions:
+                continue
+            activated, message = reload_model(latest)
+            if not activated:
+                rejected_versions.add(latest)
+            print(f"{'✅' if activated else '❌'} {message}")
+        except Exception as e:
+            print(f"❌ Error reloading model: {str(e)}")
+
+@app.before_request
+def ensure_registry_watcher():
+    """Start one registry watcher per process (threads do not survive fork)"""
+    global watcher_pid
+    if MODEL_RELOAD_INTERVAL <= 0 or watcher_pid == os.getpid():
+        return
+    with model_lock:
+        if watcher_pid != os.getpid():
+            watcher_pid = os.getpid()
+            threading.Thread(target=watch_registry, daemon=True).start()
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -35,15 +215,169 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'model_loaded': model_loaded,
+        'prediction_cache': prediction_cache.stats(),
+        'drift': drift_monitor.stats(),
         'timestamp': datetime.now().isoformat()
     })
 
+def current_model_info():
+    """Labels of the serving model for the /metrics model info gauge"""
+    active = model
+    if active is None:
+        return {'scoring_mode': SCORING_MODE}
+    return {
+        'model_name': active.best_model_name,
+        'model_version': active.version,
+        'scoring_mode': SCORING_MODE
+    }
+
+metrics.instrument(app, current_model_info)
+
+REQUIRED_FIELDS = ASSESSMENT_SCHEMA.fields
+
+SAMPLE_INPUT = {
+    'farm_size_acres': 100,
+    'fencing_quality': 'good',
+    'biosecurity_gates': 'yes',
+    'quarantine_facility': 'yes',
+    'vehicle_wash_station': 'no',
+    'livestock_count': 200,
+    'vaccination_protocol': 'moderate',
+    'disease_monitoring': 'weekly',
+    'isolation_practices': 'good',
+    'disinfection_frequency': 'weekly',
+    'personal_protective_equipment': 'partial',
+    'visitor_control': 'moderate',
+    'feed_storage_security': 'good',
+    'water_source_protection': 'good',
+    'rodent_control': 'good',
+    'insect_control': 'fair',
+    'staff_training': 'quarterly',
+    'protocol_documentation': 'moderate',
+    'emergency_plan': 'yes',
+    'veterinary_contact': 'yes'
+}
+
+# Cache of per-record predictions, keyed on the validated fields. Set
+# PREDICTION_CACHE_SIZE=0 to disable; the bucket settings floor farm size and
+# livestock count so that nearby values share an entry.
+prediction_cache = PredictionCache(
+    REQUIRED_FIELDS,
+    max_size=int(os.environ.get('PREDICTION_CACHE_SIZE', 10000)),
+    ttl=float(os.environ.get('PREDICTION_CACHE_TTL', 3600)) or None,
+    buckets={
+        'farm_size_acres': float(os.environ.get('PREDICTION_CACHE_FARM_SIZE_BUCKET', 0)),
+        'livestock_count': int(os.environ.get('PREDICTION_CACHE_LIVESTOCK_BUCKET', 0))
+    }
+)
+
+def resolve_scoring_mode():
+    """Scoring mode for the current request: ?mode= overrides SCORING_MODE"""
+    mode = request.args.get('mode', SCORING_MODE)
+    if mode not in SCORING_MODES:
+        raise ValueError(f"Invalid scoring mode '{mode}'. Must be one of {list(SCORING_MODES)}")
+    return mode
+
+def resolve_analysis_mode():
+    """Analysis mode for the current request: ?analysis= overrides ANALYSIS_MODE"""
+    analysis = request.args.get('analysis', ANALYSIS_MODE)
+    if analysis not in ANALYSIS_MODES:
+        raise ValueError(f"Invalid analysis mode '{analysis}'. Must be one of {list(ANALYSIS_MODES)}")
+    return analysis
+
+def build_model_info(active, mode):
+    """model_info block of a prediction response"""
+    if mode == 'rules':
+        model_name, model_version = 'Scoring Table', None
+    else:
+        model_name, model_version = active.best_model_name, active.version
+    return {
+        'model_name': model_name,
+        'model_version': model_version,
+        'scoring_mode': mode,
+        'timestamp': datetime.now().isoformat()
+    }
+
+def rules_scores(records):
+    """(score, category scores) from the scoring table for each record"""
+    import pandas as pd
+    frame = SCORING_TABLE.score_frame(pd.DataFrame.from_records(records))
+    return [
+        (int(row['biosecurity_score']),
+         {category: int(row[category]) for category in SCORING_TABLE.reported_categories})
+        for row in frame.to_dict('records')
+    ]
+
+def build_score(predicted_score):
+    """Score and risk level block of a prediction"""
+    risk_level, risk_color = SCORING_TABLE.get_risk_level(predicted_score)
+    return {
+        'biosecurity_score': round(float(predicted_score), 1),
+        'risk_level': risk_level,
+        'risk_color': risk_color,
+        'max_score': 100
+    }
+
+def build_prediction(data, predicted_score, category_scores):
+    """Prediction, category scores and recommendations for one record"""
+    return {
+        'prediction': build_score(predicted_score),
+        'category_scores': category_scores,
+        'recommendations': SCORING_TABLE.get_recommendations(data, predicted_score)
+    }
+
+def analyze_prediction(data, predicted_score, active, mode, cache_key=None, rules=None, route=None):
+    """Category scores, drift sample and recommendations for a scored record.
+
+    Runs inline or on the analysis pool (route then names the request's
+    route for the stage metrics). rules is the scoring table's (score,
+    category scores) when already computed; cache_key caches the result.
+    """
+    if rules is None:
+        with metrics.stage('category_scores', route):
+            rules = SCORING_TABLE.score_record(data)
+    rules_score, category_scores = rules
+    if active is not None and drift_monitor.sampled():
+        # Rules mode runs the model only on sampled requests
+        with metrics.stage('drift', route):
+            model_score = predicted_score if mode == 'ml' else active.predict_score(data)
+            drift_monitor.record(model_score, rules_score)
+    with metrics.stage('recommendations', route):
+        prediction = build_prediction(data, predicted_score, category_scores)
+    if cache_key is not None:
+        prediction_cache.put(cache_key, prediction)
+    return prediction
+
+def stream_analysis(response, request_id, future, route):
+    """Server-sent events: the score response, then the analysis once ready"""
+    with metrics.stage('serialize', route):
+        body = app.json.dumps(response)
+    yield f"event: prediction\ndata: {body}\n\n"
+    try:
+        event = {'status': 'success', 'request_id': request_id,
+                 **future.result(timeout=ANALYSIS_TIMEOUT)}
+    except Exception as e:
+        event = {'status': 'error', 'request_id': request_id,
+                 'error': f'Analysis failed: {str(e)}'}
+    with metrics.stage('serialize', route):
+        body = app.json.dumps(event)
+    yield f"event: analysis\ndata: {body}\n\n"
+
 @app.route('/predict', methods=['POST'])
 def predict_biosecurity_score():
     """Predict biosecurity score based on input data"""
     global model, model_loaded
     
-    if not model_loaded:
+    try:
+        mode = resolve_scoring_mode()
+        analysis = resolve_analysis_mode()
+    except ValueError as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    
+    if mode == 'ml' and not model_loaded:
         return jsonify({
             'error': 'Model not loaded. Please ensure the model is trained and available.',
             'status': 'error'
@@ -51,7 +385,8 @@ def predict_biosecurity_score():
     
     try:
         # Get input data
-        data = request.get_json()
+        with metrics.stage('parse'):
+            data = request.get_json()
         
         if not data:
             return jsonify({
@@ -59,119 +394,80 @@ def predict_biosecurity_score():
                 'status': 'error'
             }), 400
         
-        # Validate required fields
-        required_fields = [
-            'farm_size_acres', 'fencing_quality', 'biosecurity_gates', 
-            'quarantine_facility', 'vehicle_wash_station', 'livestock_count',
-            'vaccination_protocol', 'disease_monitoring', 'isolation_practices',
-            'disinfection_frequency', 'personal_protective_equipment', 'visitor_control',
-            'feed_storage_security', 'water_source_protection', 'rodent_control',
-            'insect_control', 'staff_training', 'protocol_documentation',
-            'emergency_plan', 'veterinary_contact'
-        ]
-        
-        missing_fields = [field for field in required_fields if field not in data]
-        if missing_fields:
-            return jsonify({
-                'error': f'Missing required fields: {missing_fields}',
-                'status': 'error'
-            }), 400
-        
-        # Validate field values
-        validation_errors = []
-        
-        # Numeric validations
-        if not isinstance(data['farm_size_acres'], (int, float)) or data['farm_size_acres'] < 0:
-            validation_errors.append('farm_size_acres must be a positive number')
-        
-        if not isinstance(data['livestock_count'], int) or data['livestock_count'] < 0:
-            validation_errors.append('livestock_count must be a positive integer')
-        
-        # Categorical validations
-        valid_fencing = ['excellent', 'good', 'fair', 'poor']
-        if data['fencing_quality'] not in valid_fencing:
-            validation_errors.append(f'fencing_quality must be one of: {valid_fencing}')
-        
-        valid_yes_no = ['yes', 'no']
-        yes_no_fields = ['biosecurity_gates', 'quarantine_facility', 'vehicle_wash_station', 
-                        'emergency_plan', 'veterinary_contact']
-        for field in yes_no_fields:
-            if data[field] not in valid_yes_no:
-                validation_errors.append(f'{field} must be "yes" or "no"')
-        
-        valid_vaccination = ['strict', 'moderate', 'basic', 'none']
-        if data['vaccination_protocol'] not in valid_vaccination:
-            validation_errors.append(f'vaccination_protocol must be one of: {valid_vaccination}')
-        
-        valid_monitoring = ['daily', 'weekly', 'monthly', 'rarely']
-        if data['disease_monitoring'] not in valid_monitoring:
-            validation_errors.append(f'disease_monitoring must be one of: {valid_monitoring}')
-        
-        valid_practices = ['excellent', 'good', 'fair', 'poor']
-        practices_fields = ['isolation_practices', 'feed_storage_security', 
-                          'water_source_protection', 'rodent_control', 'insect_control']
-        for field in practices_fields:
-            if data[field] not in valid_practices:
-                validation_errors.append(f'{field} must be one of: {valid_practices}')
-        
-        valid_frequency = ['daily', 'weekly', 'monthly', 'rarely']
-        if data['disinfection_frequency'] not in valid_frequency:
-            validation_errors.append(f'disinfection_frequency must be one of: {valid_frequency}')
-        
-        valid_ppe = ['full', 'partial', 'basic', 'none']
-        if data['personal_protective_equipment'] not in valid_ppe:
-            validation_errors.append(f'personal_protective_equipment must be one of: {valid_ppe}')
-        
-        valid_control = ['strict', 'moderate', 'basic', 'none']
-        if data['visitor_control'] not in valid_control:
-            validation_errors.append(f'visitor_control must be one of: {valid_control}')
+        with metrics.stage('validate'):
+            invalid = ASSESSMENT_SCHEMA.validate(data)
+        if invalid:
+            error, details = invalid
+            response = {'error': error, 'status': 'error'}
+            if details is not None:
+                response['details'] = details
+            return jsonify(response), 400
         
-        valid_training = ['monthly', 'quarterly', 'biannual', 'annual']
-        if data['staff_training'] not in valid_training:
-            validation_errors.append(f'staff_training must be one of: {valid_training}')
-        
-        valid_documentation = ['comprehensive', 'moderate', 'basic', 'none']
-        if data['protocol_documentation'] not in valid_documentation:
-            validation_errors.append(f'protocol_documentation must be one of: {valid_documentation}')
-        
-        if validation_errors:
-            return jsonify({
-                'error': 'Validation errors',
-                'details': validation_errors,
-                'status': 'error'
-            }), 400
-        
-        # Make prediction
-        predicted_score = model['best_model'].predict_score(data)
+        active = model
+        prediction = None
+        cache_key = None
+        rules = None
+        if mode == 'rules':
+            # Exact score from the points table
+            with metrics.stage('rules'):
+                rules = SCORING_TABLE.score_record(data)
+            predicted_score = rules[0]
+        else:
+            # Make prediction, reusing a cached one for the same input
+            with metrics.stage('cache'):
+                cache_key = prediction_cache.key(data, namespace=active.version)
+                prediction = prediction_cache.get(cache_key)
+            if prediction is None:
+                with metrics.stage('encode'):
+                    X = active.encode([data])
+                with metrics.stage('predict'):
+                    predicted_score = active.predict_encoded(X)[0]
         
-        # Get risk level and recommendations
-        risk_level, risk_color = model['best_model'].get_risk_level(predicted_score)
-        recommendations = model['best_model'].get_recommendations(data, predicted_score)
+        if analysis == 'inline':
+            if prediction is None:
+                prediction = analyze_prediction(data, predicted_score, active, mode, cache_key, rules)
+            response = {
+                'status': 'success',
+                **prediction,
+                'input_data': data,
+                'model_info': build_model_info(active, mode)
+            }
+            if compact_response():
+                del response['input_data']
+            with metrics.stage('serialize'):
+                return jsonify(response)
         
-        # Calculate category scores
-        category_scores = calculate_category_scores(data)
+        # Respond with the score now; the analysis runs on the background pool
+        if prediction is None:
+            request_id, future = analysis_pipeline.submit(analyze_prediction, data, predicted_score, active,
+                                                          mode, cache_key, rules, metrics.current_route())
+            score = build_score(predicted_score)
+        else:
+            request_id, future = analysis_pipeline.completed(prediction)
+            score = prediction['prediction']
         
-        # Prepare response
         response = {
             'status': 'success',
-            'prediction': {
-                'biosecurity_score': round(predicted_score, 1),
-                'risk_level': risk_level,
-                'risk_color': risk_color,
-                'max_score': 100
+            'prediction': score,
+            'analysis': {
+                'request_id': request_id,
+                'status': 'complete' if future.done() else 'pending',
+                'url': f'/predict/analysis/{request_id}'
             },
-            'category_scores': category_scores,
-            'recommendations': recommendations,
             'input_data': data,
-            'model_info': {
-                'model_name': model['best_model_name'],
-                'timestamp': datetime.now().isoformat()
-            }
+            'model_info': build_model_info(active, mode)
         }
-        
-        return jsonify(response)
+        if compact_response():
+            del response['input_data']
+        if analysis == 'stream':
+            return Response(stream_analysis(response, request_id, future, metrics.current_route()),
+                            mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        with metrics.stage('serialize'):
+            return jsonify(response)
         
     except Exception as e:
+        metrics.error(e)
         print(f"❌ Error in prediction: {str(e)}")
         print(traceback.format_exc())
         return jsonify({
@@ -179,97 +475,175 @@ def predict_biosecurity_score():
             'status': 'error'
         }), 500
 
-def calculate_category_scores(input_data):
-    """Calculate scores for different biosecurity categories"""
-    scores = {}
-    
-    # Farm Infrastructure (25 points)
-    infra_score = 0
-    if input_data['fencing_quality'] == 'excellent': infra_score += 8
-    elif input_data['fencing_quality'] == 'good': infra_score += 6
-    elif input_data['fencing_quality'] == 'fair': infra_score += 4
-    else: infra_score += 1
-    
-    if input_data['biosecurity_gates'] == 'yes': infra_score += 5
-    if input_data['quarantine_facility'] == 'yes': infra_score += 6
-    if input_data['vehicle_wash_station'] == 'yes': infra_score += 6
-    scores['infrastructure'] = min(infra_score, 25)
-    
-    # Livestock Management (25 points)
-    livestock_score = 0
-    if input_data['vaccination_protocol'] == 'strict': livestock_score += 8
-    elif input_data['vaccination_protocol'] == 'moderate': livestock_score += 6
-    elif input_data['vaccination_protocol'] == 'basic': livestock_score += 4
-    else: livestock_score += 1
-    
-    if input_data['disease_monitoring'] == 'daily': livestock_score += 8
-    elif input_data['disease_monitoring'] == 'weekly': livestock_score += 6
-    elif input_data['disease_monitoring'] == 'monthly': livestock_score += 4
-    else: livestock_score += 1
-    
-    if input_data['isolation_practices'] == 'excellent': livestock_score += 9
-    elif input_data['isolation_practices'] == 'good': livestock_score += 7
-    elif input_data['isolation_practices'] == 'fair': livestock_score += 4
-    else: livestock_score += 1
-    scores['livestock_management'] = min(livestock_score, 25)
-    
-    # Hygiene Practices (20 points)
-    hygiene_score = 0
-    if input_data['disinfection_frequency'] == 'daily': hygiene_score += 7
-    elif input_data['disinfection_frequency'] == 'weekly': hygiene_score += 5
-    elif input_data['disinfection_frequency'] == 'monthly': hygiene_score += 3
-    else: hygiene_score += 1
+@app.route('/predict/analysis/<request_id>', methods=['GET'])
+def get_prediction_analysis(request_id):
+    """Category scores and recommendations of an async /predict request"""
+    entry = analysis_pipeline.lookup(request_id)
+    if entry is None:
+        return jsonify({
+            'error': 'Unknown or expired request ID',
+            'status': 'error'
+        }), 404
     
-    if input_data['personal_protective_equipment'] == 'full': hygiene_score += 7
-    elif input_data['personal_protective_equipment'] == 'partial': hygiene_score += 5
-    elif input_data['personal_protective_equipment'] == 'basic': hygiene_score += 3
-    else: hygiene_score += 1
+    status, analysis = entry
+    if status == 'pending':
+        return jsonify({'status': 'pending', 'request_id': request_id}), 202
     
-    if input_data['visitor_control'] == 'strict': hygiene_score += 6
-    elif input_data['visitor_control'] == 'moderate': hygiene_score += 4
-    elif input_data['visitor_control'] == 'basic': hygiene_score += 2
-    else: hygiene_score += 0
-    scores['hygiene_practices'] = min(hygiene_score, 20)
+    if status == 'error':
+        metrics.error(analysis['error_type'])
+        return jsonify({
+            'error': f"Analysis failed: {analysis['error']}",
+            'status': 'error'
+        }), 500
     
-    # Feed and Water (15 points)
-    feed_score = 0
-    if input_data['feed_storage_security'] == 'excellent': feed_score += 8
-    elif input_data['feed_storage_security'] == 'good': feed_score += 6
-    elif input_data['feed_storage_security'] == 'fair': feed_score += 4
-    else: feed_score += 1
+    return jsonify({'status': 'success', 'request_id': request_id, **analysis})
+
+def parse_batch_records():
+    """Read records from a JSON array or NDJSON request body.
+
+    Returns (records, parse_errors) where parse_errors maps the index of an
+    unparseable NDJSON line to its error message.
+    """
+    if request.mimetype == 'application/json':
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            raise ValueError('Expected a JSON array of records')
+        return data, {}
     
-    if input_data['water_source_protection'] == 'excellent': feed_score += 7
-    elif input_data['water_source_protection'] == 'good': feed_score += 5
-    elif input_data['water_source_protection'] == 'fair': feed_score += 3
-    else: feed_score += 1
-    scores['feed_water'] = min(feed_score, 15)
+    records = []
+    parse_errors = {}
+    for line in request.get_data(as_text=True).splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(app.json.loads(line))
+        except ValueError as e:
+            parse_errors[len(records)] = f'Invalid JSON: {str(e)}'
+            records.append(None)
+    return records, parse_errors
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_biosecurity_scores():
+    """Predict biosecurity scores for a batch of records.
+
+    Accepts a JSON array or an NDJSON body. Valid records are scored with a
+    single model call; results come back in input order, with per-record
+    errors for records that fail validation.
+    """
+    global model, model_loaded
     
-    # Pest Control (10 points)
-    pest_score = 0
-    if input_data['rodent_control'] == 'excellent': pest_score += 5
-    elif input_data['rodent_control'] == 'good': pest_score += 4
-    elif input_data['rodent_control'] == 'fair': pest_score += 2
-    else: pest_score += 0
+    try:
+        mode = resolve_scoring_mode()
+    except ValueError as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
     
-    if input_data['insect_control'] == 'excellent': pest_score += 5
-    elif input_data['insect_control'] == 'good': pest_score += 4
-    elif input_data['insect_control'] == 'fair': pest_score += 2
-    else: pest_score += 0
-    scores['pest_control'] = min(pest_score, 10)
+    if mode == 'ml' and not model_loaded:
+        return jsonify({
+            'error': 'Model not loaded. Please ensure the model is trained and available.',
+            'status': 'error'
+        }), 500
     
-    # Training and Documentation (5 points)
-    training_score = 0
-    if input_data['staff_training'] == 'monthly': training_score += 3
-    elif input_data['staff_training'] == 'quarterly': training_score += 2
-    elif input_data['staff_training'] == 'biannual': training_score += 1
-    else: training_score += 0
+    try:
+        with metrics.stage('parse'):
+            records, parse_errors = parse_batch_records()
+    except ValueError as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
     
-    if input_data['protocol_documentation'] == 'comprehensive': training_score += 2
-    elif input_data['protocol_documentation'] == 'moderate': training_score += 1
-    else: training_score += 0
-    scores['training_documentation'] = min(training_score, 5)
+    if not records:
+        return jsonify({
+            'error': 'No input data provided',
+            'status': 'error'
+        }), 400
     
-    return scores
+    try:
+        results = [None] * len(records)
+        valid_indices = []
+        with metrics.stage('validate'):
+            for index, data in enumerate(records):
+                if index in parse_errors:
+                    results[index] = {'index': index, 'status': 'error', 'error': parse_errors[index]}
+                    continue
+                invalid = ASSESSMENT_SCHEMA.validate(data)
+                if invalid:
+                    error, details = invalid
+                    results[index] = {'index': index, 'status': 'error', 'error': error}
+                    if details is not None:
+                        results[index]['details'] = details
+                else:
+                    valid_indices.append(index)
+        
+        active = model
+        if mode == 'rules':
+            valid_records = [records[index] for index in valid_indices]
+            with metrics.stage('rules'):
+                scored = rules_scores(valid_records) if valid_records else []
+            with metrics.stage('recommendations'):
+                for index, data, (rules_score, category_scores) in zip(valid_indices, valid_records, scored):
+                    prediction = build_prediction(data, rules_score, category_scores)
+                    results[index] = {'index': index, 'status': 'success', **prediction}
+            
+            # Run the model on a sample of the batch to measure its drift
+            sampled = [i for i in range(len(valid_records)) if drift_monitor.sampled()]
+            if active is not None and sampled:
+                with metrics.stage('drift'):
+                    predicted_scores = active.predict_scores([valid_records[i] for i in sampled])
+                    for i, predicted_score in zip(sampled, predicted_scores):
+                        drift_monitor.record(predicted_score, scored[i][0])
+        else:
+            # Serve cached predictions, score the rest in one model call
+            uncached = []
+            with metrics.stage('cache'):
+                for index in valid_indices:
+                    cache_key = prediction_cache.key(records[index], namespace=active.version)
+                    prediction = prediction_cache.get(cache_key)
+                    if prediction is None:
+                        uncached.append((index, cache_key))
+                    else:
+                        results[index] = {'index': index, 'status': 'success', **prediction}
+            
+            if uncached:
+                uncached_records = [records[index] for index, _ in uncached]
+                with metrics.stage('encode'):
+                    X = active.encode(uncached_records)
+                with metrics.stage('predict'):
+                    predicted_scores = active.predict_encoded(X)
+                with metrics.stage('category_scores'):
+                    scored = rules_scores(uncached_records)
+                
+                with metrics.stage('recommendations'):
+                    for (index, cache_key), data, predicted_score, (rules_score, category_scores) in zip(
+                            uncached, uncached_records, predicted_scores, scored):
+                        if drift_monitor.sampled():
+                            drift_monitor.record(predicted_score, rules_score)
+                        prediction = build_prediction(data, predicted_score, category_scores)
+                        prediction_cache.put(cache_key, prediction)
+                        results[index] = {'index': index, 'status': 'success', **prediction}
+        
+        response = {
+            'status': 'success',
+            'count': len(records),
+            'succeeded': len(valid_indices),
+            'failed': len(records) - len(valid_indices),
+            'results': results,
+            'model_info': build_model_info(active, mode)
+        }
+        with metrics.stage('serialize'):
+            return jsonify(response)
+        
+    except Exception as e:
+        metrics.error(e)
+        print(f"❌ Error in batch prediction: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': f'Batch prediction failed: {str(e)}',
+            'status': 'error'
+        }), 500
 
 @app.route('/model-info', methods=['GET'])
 def get_model_info():
@@ -282,65 +656,70 @@ def get_model_info():
             'status': 'error'
         }), 500
     
+    active = model
     return jsonify({
         'status': 'success',
-        'model_name': model['best_model_name'],
-        'feature_names': model['feature_names'],
+        'model_name': active.best_model_name,
+        'model_version': active.version,
+        'model_metadata': active.metadata,
+        'scoring_mode': SCORING_MODE,
+        'drift': drift_monitor.stats(),
+        'available_versions': registry.versions(),
+        'feature_names': active.feature_names,
         'model_loaded': model_loaded,
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/model/reload', methods=['POST'])
+def reload_model_endpoint():
+    """Load, check and activate a registry version (default: latest)"""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({
+            'error': 'Expected a JSON object',
+            'status': 'error'
+        }), 400
+    
+    version = data.get('version')
+    if version is not None:
+        # Versions are registry directory numbers; accept 3 or "3"
+        if isinstance(version, bool) or not isinstance(version, (int, str)) or not str(version).isdigit():
+            return jsonify({
+                'error': 'version must be a non-negative integer',
+                'status': 'error'
+            }), 400
+        version = int(version)
+        if version not in registry.versions():
+            return jsonify({
+                'error': f'Version {version} not found',
+                'available_versions': registry.versions(),
+                'status': 'error'
+            }), 404
+    
+    try:
+        activated, message = reload_model(version)
+    except Exception as e:
+        return jsonify({
+            'error': f'Reload failed: {str(e)}',
+            'status': 'error'
+        }), 500
+    
+    return jsonify({
+        'status': 'success' if activated else 'error',
+        'message': message,
+        'model_version': model.version if model is not None else None
+    }), 200 if activated else 409
+
 @app.route('/sample-input', methods=['GET'])
 def get_sample_input():
     """Get a sample input structure for the model"""
-    sample_input = {
-        'farm_size_acres': 100,
-        'fencing_quality': 'good',
-        'biosecurity_gates': 'yes',
-        'quarantine_facility': 'yes',
-        'vehicle_wash_station': 'no',
-        'livestock_count': 200,
-        'vaccination_protocol': 'moderate',
-        'disease_monitoring': 'weekly',
-        'isolation_practices': 'good',
-        'disinfection_frequency': 'weekly',
-        'personal_protective_equipment': 'partial',
-        'visitor_control': 'moderate',
-        'feed_storage_security': 'good',
-        'water_source_protection': 'good',
-        'rodent_control': 'good',
-        'insect_control': 'fair',
-        'staff_training': 'quarterly',
-        'protocol_documentation': 'moderate',
-        'emergency_plan': 'yes',
-        'veterinary_contact': 'yes'
-    }
-    
     return jsonify({
         'status': 'success',
-        'sample_input': sample_input,
+        'sample_input': SAMPLE_INPUT,
         'field_descriptions': {
-            'farm_size_acres': 'Farm size in acres (positive number)',
-            'fencing_quality': 'Quality of farm fencing (excellent/good/fair/poor)',
-            'biosecurity_gates': 'Presence of biosecurity gates (yes/no)',
-            'quarantine_facility': 'Presence of quarantine facility (yes/no)',
-            'vehicle_wash_station': 'Presence of vehicle wash station (yes/no)',
-            'livestock_count': 'Number of livestock (positive integer)',
-            'vaccination_protocol': 'Vaccination protocol level (strict/moderate/basic/none)',
-            'disease_monitoring': 'Disease monitoring frequency (daily/weekly/monthly/rarely)',
-            'isolation_practices': 'Isolation practices quality (excellent/good/fair/poor)',
-            'disinfection_frequency': 'Disinfection frequency (daily/weekly/monthly/rarely)',
-            'personal_protective_equipment': 'PPE level (full/partial/basic/none)',
-            'visitor_control': 'Visitor control level (strict/moderate/basic/none)',
-            'feed_storage_security': 'Feed storage security (excellent/good/fair/poor)',
-            'water_source_protection': 'Water source protection (excellent/good/fair/poor)',
-            'rodent_control': 'Rodent control quality (excellent/good/fair/poor)',
-            'insect_control': 'Insect control quality (excellent/good/fair/poor)',
-            'staff_training': 'Staff training frequency (monthly/quarterly/biannual/annual)',
-            'protocol_documentation': 'Protocol documentation level (comprehensive/moderate/basic/none)',
-            'emergency_plan': 'Presence of emergency plan (yes/no)',
-            'veterinary_contact': 'Veterinary contact availability (yes/no)'
-        }
+            field: spec['description'] for field, spec in ASSESSMENT_SCHEMA.field_spec.items()
+        },
+        'schema': ASSESSMENT_SCHEMA.describe()
     })
 
 if __name__ == '__main__':
@@ -354,11 +733,15 @@ if __name__ == '__main__':
         print("📊 Available endpoints:")
         print("  GET  /health - Health check")
         print("  POST /predict - Predict biosecurity score")
+        print("  GET  /predict/analysis/<request_id> - Analysis of an async prediction")
+        print("  POST /predict/batch - Predict scores for a JSON array or NDJSON batch")
         print("  GET  /model-info - Model information")
+        print("  POST /model/reload - Activate the latest registry version")
         print("  GET  /sample-input - Sample input structure")
+        print("  GET  /metrics - Prometheus metrics")
     else:
         print("⚠️  API starting without loaded model")
         print("   Train the model first using: python biosecurity_model.py")
     
-    # Run the API
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    # Development server only; use `python serve.py biosecurity` in production
+    app.run(host='0.0.0.0', port=5001, debug=os.environ.get('FLASK_DEBUG') == '1')
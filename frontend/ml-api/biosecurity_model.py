@@ -1,18 +1,36 @@
-import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.linear_model import LinearRegression, Ridge
-from sklearn.svm import SVR
-from sklearn.neural_network import MLPRegressor
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-import joblib
 import json
+import sys
 from datetime import datetime
+from functools import partial
+from types import SimpleNamespace
 import warnings
+from scoring import SCORING_TABLE
+import model_artifact
+from features import FeatureAssembler
+from tree_compiler import FOREST_ESTIMATORS, CompiledForest
+from model_registry import ModelRegistry
+
+# Serving only needs NumPy and the artifact reader. pandas, joblib and the
+# sklearn estimators, preprocessing and model-selection modules are imported
+# inside the training and pickle code paths, which keeps worker cold start
+# short.
 warnings.filterwarnings('ignore')
 
+# Models that are trained and served on standardized features
+SCALED_MODELS = ['SVR', 'Neural Network', 'SGD Regression']
+
+# Inputs up to this many rows go through CompiledForest when the sklearn
+# estimator is loaded; its compiled traversal is faster on larger batches
+# (see bench_forest.py)
+COMPILED_MAX_ROWS = 64
+
+def standardize(X, scaler):
+    """X standardized by scaler as float32, fitting the scaler on X if it is not fitted yet"""
+    if not hasattr(scaler, 'mean_'):
+        scaler.fit(X)
+    return scaler.transform(X).astype(np.float32, copy=False)
+
 class BiosecurityMLModel:
     def __init__(self):
         self.models = {}
@@ -21,289 +39,300 @@ class BiosecurityMLModel:
         self.feature_names = []
         self.best_model = None
         self.best_model_name = None
+        # What predictions run through: best_model or its compiled form for
+        # single rows and small batches, batch_predictor for larger batches
+        self.predictor = None
+        self.batch_predictor = None
+        # Registry version and metadata when loaded from a model registry
+        self.version = None
+        self.metadata = None
+        # File the model was loaded from
+        self.source = None
+        
+    def generate_synthetic_data(self, n_samples=1000, seed=42):
+        """Generate synthetic biosecurity assessment data.
+
+        Categorical fields are pandas categoricals; see synthetic_data for
+        sharded, multi-process generation of larger datasets.
+        """
+        from synthetic_data import generate_assessments
         
-    def generate_synthetic_data(self, n_samples=1000):
-        """Generate synthetic biosecurity assessment data"""
-        np.random.seed(42)
-        
-        data = {
-            # Farm Infrastructure
-            'farm_size_acres': np.random.uniform(1, 500, n_samples),
-            'fencing_quality': np.random.choice(['excellent', 'good', 'fair', 'poor'], n_samples),
-            'biosecurity_gates': np.random.choice(['yes', 'no'], n_samples),
-            'quarantine_facility': np.random.choice(['yes', 'no'], n_samples),
-            'vehicle_wash_station': np.random.choice(['yes', 'no'], n_samples),
-            
-            # Livestock Management
-            'livestock_count': np.random.randint(10, 1000, n_samples),
-            'vaccination_protocol': np.random.choice(['strict', 'moderate', 'basic', 'none'], n_samples),
-            'disease_monitoring': np.random.choice(['daily', 'weekly', 'monthly', 'rarely'], n_samples),
-            'isolation_practices': np.random.choice(['excellent', 'good', 'fair', 'poor'], n_samples),
-            
-            # Hygiene Practices
-            'disinfection_frequency': np.random.choice(['daily', 'weekly', 'monthly', 'rarely'], n_samples),
-            'personal_protective_equipment': np.random.choice(['full', 'partial', 'basic', 'none'], n_samples),
-            'visitor_control': np.random.choice(['strict', 'moderate', 'basic', 'none'], n_samples),
-            
-            # Feed and Water
-            'feed_storage_security': np.random.choice(['excellent', 'good', 'fair', 'poor'], n_samples),
-            'water_source_protection': np.random.choice(['excellent', 'good', 'fair', 'poor'], n_samples),
-            
-            # Pest Control
-            'rodent_control': np.random.choice(['excellent', 'good', 'fair', 'poor'], n_samples),
-            'insect_control': np.random.choice(['excellent', 'good', 'fair', 'poor'], n_samples),
-            
-            # Training and Documentation
-            'staff_training': np.random.choice(['monthly', 'quarterly', 'biannual', 'annual'], n_samples),
-            'protocol_documentation': np.random.choice(['comprehensive', 'moderate', 'basic', 'none'], n_samples),
-            
-            # Emergency Response
-            'emergency_plan': np.random.choice(['yes', 'no'], n_samples),
-            'veterinary_contact': np.random.choice(['yes', 'no'], n_samples)
-        }
-        
-        df = pd.DataFrame(data)
-        return df
+        return generate_assessments(n_samples, np.random.default_rng(seed))
     
     def calculate_biosecurity_score(self, row):
         """Calculate biosecurity score based on various factors"""
-        score = 0
-        max_score = 100
-        
-        # Farm Infrastructure (25 points)
-        if row['fencing_quality'] == 'excellent': score += 8
-        elif row['fencing_quality'] == 'good': score += 6
-        elif row['fencing_quality'] == 'fair': score += 4
-        else: score += 1
-        
-        if row['biosecurity_gates'] == 'yes': score += 5
-        if row['quarantine_facility'] == 'yes': score += 6
-        if row['vehicle_wash_station'] == 'yes': score += 6
-        
-        # Livestock Management (25 points)
-        if row['vaccination_protocol'] == 'strict': score += 8
-        elif row['vaccination_protocol'] == 'moderate': score += 6
-        elif row['vaccination_protocol'] == 'basic': score += 4
-        else: score += 1
-        
-        if row['disease_monitoring'] == 'daily': score += 8
-        elif row['disease_monitoring'] == 'weekly': score += 6
-        elif row['disease_monitoring'] == 'monthly': score += 4
-        else: score += 1
-        
-        if row['isolation_practices'] == 'excellent': score += 9
-        elif row['isolation_practices'] == 'good': score += 7
-        elif row['isolation_practices'] == 'fair': score += 4
-        else: score += 1
-        
-        # Hygiene Practices (20 points)
-        if row['disinfection_frequency'] == 'daily': score += 7
-        elif row['disinfection_frequency'] == 'weekly': score += 5
-        elif row['disinfection_frequency'] == 'monthly': score += 3
-        else: score += 1
-        
-        if row['personal_protective_equipment'] == 'full': score += 7
-        elif row['personal_protective_equipment'] == 'partial': score += 5
-        elif row['personal_protective_equipment'] == 'basic': score += 3
-        else: score += 1
-        
-        if row['visitor_control'] == 'strict': score += 6
-        elif row['visitor_control'] == 'moderate': score += 4
-        elif row['visitor_control'] == 'basic': score += 2
-        else: score += 0
-        
-        # Feed and Water (15 points)
-        if row['feed_storage_security'] == 'excellent': score += 8
-        elif row['feed_storage_security'] == 'good': score += 6
-        elif row['feed_storage_security'] == 'fair': score += 4
-        else: score += 1
-        
-        if row['water_source_protection'] == 'excellent': score += 7
-        elif row['water_source_protection'] == 'good': score += 5
-        elif row['water_source_protection'] == 'fair': score += 3
-        else: score += 1
-        
-        # Pest Control (10 points)
-        if row['rodent_control'] == 'excellent': score += 5
-        elif row['rodent_control'] == 'good': score += 4
-        elif row['rodent_control'] == 'fair': score += 2
-        else: score += 0
-        
-        if row['insect_control'] == 'excellent': score += 5
-        elif row['insect_control'] == 'good': score += 4
-        elif row['insect_control'] == 'fair': score += 2
-        else: score += 0
-        
-        # Training and Documentation (5 points)
-        if row['staff_training'] == 'monthly': score += 3
-        elif row['staff_training'] == 'quarterly': score += 2
-        elif row['staff_training'] == 'biannual': score += 1
-        else: score += 0
-        
-        if row['protocol_documentation'] == 'comprehensive': score += 2
-        elif row['protocol_documentation'] == 'moderate': score += 1
-        else: score += 0
-        
-        # Emergency Response (5 points)
-        if row['emergency_plan'] == 'yes': score += 3
-        if row['veterinary_contact'] == 'yes': score += 2
-        
-        return min(score, max_score)
+        return SCORING_TABLE.score_record(row)[0]
+    
+    def calculate_biosecurity_scores(self, df, include_categories=False):
+        """Vectorized calculate_biosecurity_score over a whole DataFrame.
+
+        Returns the score Series, or a DataFrame that also holds the
+        per-category subtotals when include_categories is True.
+        """
+        scores = SCORING_TABLE.score_frame(df)
+        if include_categories:
+            return scores
+        return scores['biosecurity_score']
     
     def prepare_features(self, df):
         """Prepare features for ML models"""
+        from sklearn.preprocessing import LabelEncoder
+        
         # Create a copy to avoid modifying original data
         df_processed = df.copy()
         
         # Encode categorical variables
-        categorical_columns = df_processed.select_dtypes(include=['object']).columns
+        categorical_columns = df_processed.select_dtypes(include=['object', 'category']).columns
         
         for col in categorical_columns:
-            if col not in self.label_encoders:
+            values = df_processed[col]
+            if values.dtype == 'category':
+                # Encode the handful of categories once and gather by code
+                # instead of encoding every row's string
+                if col not in self.label_encoders:
+                    self.label_encoders[col] = LabelEncoder().fit(values.cat.categories)
+                lookup = self.label_encoders[col].transform(values.cat.categories)
+                codes = lookup[values.cat.codes.to_numpy()]
+            elif col not in self.label_encoders:
                 self.label_encoders[col] = LabelEncoder()
-                df_processed[col] = self.label_encoders[col].fit_transform(df_processed[col])
+                codes = self.label_encoders[col].fit_transform(values)
             else:
-                df_processed[col] = self.label_encoders[col].transform(df_processed[col])
+                codes = self.label_encoders[col].transform(values)
+            # Every categorical has at most a handful of levels
+            df_processed[col] = codes.astype(np.uint8)
+        
+        # Numeric features as float32
+        numeric_columns = [col for col in df_processed.columns
+                           if col not in categorical_columns and col != 'biosecurity_score']
+        df_processed[numeric_columns] = df_processed[numeric_columns].astype(np.float32)
         
         # Store feature names
         self.feature_names = [col for col in df_processed.columns if col != 'biosecurity_score']
         
         return df_processed
     
-    def train_models(self, X, y):
-        """Train multiple ML models and select the best one"""
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    def candidate_models(self):
+        """Unfitted candidate estimators, keyed by model name"""
+        from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
+        from sklearn.linear_model import LinearRegression, Ridge
+        from sklearn.svm import SVR
+        from sklearn.neural_network import MLPRegressor
         
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        self.scalers['standard'] = scaler
+        # Label-encoded columns are split natively as categories by histogram boosting
+        categorical_mask = np.array([col in self.label_encoders for col in self.feature_names])
         
-        # Define models
-        self.models = {
+        return {
             'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42),
             'Gradient Boosting': GradientBoostingRegressor(n_estimators=100, random_state=42),
+            'Histogram Gradient Boosting': HistGradientBoostingRegressor(
+                categorical_features=categorical_mask, random_state=42
+            ),
             'Linear Regression': LinearRegression(),
             'Ridge Regression': Ridge(alpha=1.0),
             'SVR': SVR(kernel='rbf', C=100, gamma='scale'),
             'Neural Network': MLPRegressor(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42)
         }
+    
+    def train_models(self, X, y, n_jobs=-1, time_budget=None, cache_dir=None):
+        """Train multiple ML models and select the best one.
+
+        Candidates and their CV folds run across a process pool (n_jobs), and
+        candidates that clearly lose on partial CV scores are dropped early.
+        Every fold fit also scores the held-out test split, and only the
+        winner is refitted, once, on all of X and y. Once time_budget
+        (seconds) is exceeded no further CV fold fits are submitted after the
+        first fold, and cache_dir reuses results from earlier runs on the
+        same data.
+        """
+        from sklearn.model_selection import train_test_split
+        from model_selection import select_model
         
-        # Train and evaluate models
-        best_score = -np.inf
-        results = {}
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
-        for name, model in self.models.items():
-            # Train model
-            if name in ['SVR', 'Neural Network']:
-                model.fit(X_train_scaled, y_train)
-                y_pred = model.predict(X_test_scaled)
-            else:
-                model.fit(X_train, y_train)
-                y_pred = model.predict(X_test)
-            
-            # Evaluate model
-            mse = mean_squared_error(y_test, y_pred)
-            r2 = r2_score(y_test, y_pred)
-            mae = mean_absolute_error(y_test, y_pred)
-            
-            # Cross-validation score
-            if name in ['SVR', 'Neural Network']:
-                cv_scores = cross_val_score(model, X_train_scaled, y_train, cv=5, scoring='r2')
-            else:
-                cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='r2')
-            
-            cv_mean = cv_scores.mean()
-            
-            results[name] = {
-                'MSE': mse,
-                'R2': r2,
-                'MAE': mae,
-                'CV_R2': cv_mean
-            }
-            
-            # Select best model based on cross-validation R2
-            if cv_mean > best_score:
-                best_score = cv_mean
-                self.best_model = model
-                self.best_model_name = name
+        self.models = self.candidate_models()
+        candidates, full_scaler = self.candidate_data(self.models, X_train, X_test, X)
+        
+        # Select best model based on cross-validation R2
+        results, self.best_model_name, self.best_model = select_model(
+            candidates, y_train, y_test, y,
+            n_jobs=n_jobs, time_budget=time_budget, cache_dir=cache_dir
+        )
         
+        # The full-data scaler goes with a refitted scaled winner
+        if self.best_model_name in SCALED_MODELS:
+            if not hasattr(full_scaler, 'mean_'):
+                full_scaler.fit(X)
+            self.scalers['standard'] = full_scaler
+        else:
+            self.scalers.pop('standard', None)
+        
+        self.compile_inference()
         return results
     
+    def candidate_data(self, models, X_train, X_test, X):
+        """(estimator, X_train, X_test, X_full) for each candidate, and the full-data scaler.
+
+        Scaled models share float32 standardized copies of the splits, made
+        only when there is such a candidate; their X_full standardizes all
+        of X only if one of them wins (the full-data scaler is fitted then).
+        The other candidates train on the compact matrices as they are.
+        """
+        from sklearn.preprocessing import StandardScaler
+        
+        full_scaler = StandardScaler()
+        scaled = None
+        candidates = {}
+        for name, model in models.items():
+            if name not in SCALED_MODELS:
+                candidates[name] = (model, X_train, X_test, X)
+                continue
+            if scaled is None:
+                scaler = StandardScaler().fit(X_train)
+                scaled = (standardize(X_train, scaler), standardize(X_test, scaler),
+                          partial(standardize, X, full_scaler))
+            candidates[name] = (model, *scaled)
+        return candidates, full_scaler
+    
+    def train_streaming(self, path, learner='sgd', chunksize=None, epochs=3):
+        """Train an incremental learner on assessments streamed from CSV/Parquet.
+
+        Only one chunk is held in memory at a time, so memory stays flat
+        regardless of file size. learner is 'sgd' (SGDRegressor) or 'mlp'
+        (MLPRegressor), both trained with partial_fit on standardized
+        features. Returns rows, rows/sec and progressive R2 and MAE.
+        """
+        from sklearn.linear_model import SGDRegressor
+        from sklearn.neural_network import MLPRegressor
+        from sklearn.preprocessing import LabelEncoder, StandardScaler
+        from streaming import DEFAULT_CHUNKSIZE, iter_assessment_chunks, iter_encoded_chunks, stream_fit
+        
+        chunksize = chunksize or DEFAULT_CHUNKSIZE
+        learners = {
+            'sgd': ('SGD Regression', lambda: SGDRegressor(random_state=42)),
+            'mlp': ('Neural Network', lambda: MLPRegressor(hidden_layer_sizes=(100, 50), random_state=42)),
+        }
+        if learner not in learners:
+            raise ValueError(f"learner must be one of: {list(learners)}")
+        name, make_model = learners[learner]
+        
+        # Every categorical level is known from the scoring table, so the
+        # encoders can be fitted without seeing the data
+        for field, levels in SCORING_TABLE.levels.items():
+            if field not in self.label_encoders:
+                self.label_encoders[field] = LabelEncoder().fit(levels)
+        
+        header = next(iter_assessment_chunks(path, chunksize=1))
+        self.feature_names = [col for col in header.columns if col != 'biosecurity_score']
+        category_codes = {
+            col: {value: code for code, value in enumerate(encoder.classes_)}
+            for col, encoder in self.label_encoders.items()
+            if col in self.feature_names
+        }
+        
+        model = make_model()
+        scaler = StandardScaler()
+        stats = stream_fit(
+            model, scaler,
+            lambda: iter_encoded_chunks(path, self.feature_names, category_codes, chunksize),
+            epochs=epochs
+        )
+        
+        self.scalers['standard'] = scaler
+        self.best_model = model
+        self.best_model_name = name
+        self.compile_inference()
+        return stats
+    
+    def compile_inference(self):
+        """Precompute the inference path.
+
+        Builds dict-based value->code maps from the label encoders and, for
+        scaled models, the scaler's mean/scale arrays, and wraps them in a
+        FeatureAssembler ordered by feature_names, so predictions need no
+        pandas or sklearn preprocessing per call. Fitted tree ensembles are
+        compiled with CompiledForest; those loaded from an artifact already
+        run on it.
+        """
+        self.category_codes = {
+            col: {value: code for code, value in enumerate(encoder.classes_)}
+            for col, encoder in self.label_encoders.items()
+            if col in self.feature_names
+        }
+        if self.best_model_name in SCALED_MODELS:
+            scaler = self.scalers['standard']
+            self.scale_mean = np.asarray(scaler.mean_, dtype=np.float64)
+            self.scale_scale = np.asarray(scaler.scale_, dtype=np.float64)
+        else:
+            self.scale_mean = None
+            self.scale_scale = None
+        self.assembler = FeatureAssembler(self.feature_names, self.category_codes,
+                                          self.scale_mean, self.scale_scale)
+        
+        # Inputs are always assembled in feature_names order. The fitted
+        # estimator is left as it is (save_model pickles it); sklearn's
+        # warning about ndarray input without feature names is silenced by
+        # the module's warnings filter.
+        fitted_names = getattr(self.best_model, 'feature_names_in_', None)
+        if fitted_names is not None and list(fitted_names) != self.feature_names:
+            raise ValueError("Model was fitted with columns in a different order than feature_names")
+
+        # Forests are flattened into node arrays and traversed for all trees at
+        # once, avoiding sklearn's per-tree dispatch and thread pool per call;
+        # large batches stay on sklearn. Linear models and the MLP reduce to
+        # their coefficient arrays, evaluated with the same NumPy operations
+        # sklearn uses but without its input validation, for every batch size.
+        name = type(self.best_model).__name__
+        if name in FOREST_ESTIMATORS:
+            self.predictor = CompiledForest.from_sklearn(self.best_model)
+            self.batch_predictor = self.best_model
+        else:
+            self.predictor = self.batch_predictor = self.best_model
+            if name in model_artifact.ARRAY_ESTIMATORS:
+                try:
+                    exported = model_artifact.export_estimator(self.best_model)
+                except ValueError:
+                    # e.g. an MLP activation MappedModel does not implement
+                    exported = None
+                if exported is not None:
+                    self.predictor = self.batch_predictor = model_artifact.MappedModel(*exported)
+
     def predict_score(self, input_data):
         """Predict biosecurity score for new data"""
+        return self.predict_encoded(self.encode([input_data]))[0]
+
+    def predict_scores(self, records):
+        """Predict biosecurity scores for a list of input records.
+
+        All records are encoded into one matrix and scored with a single
+        predict call; results are returned in input order.
+        """
+        return self.predict_encoded(self.encode(records))
+
+    def encode(self, records):
+        """Model input matrix for a list of records, in feature_names order.
+
+        A single record is written into the assembler's per-thread row
+        buffer, valid until the next call on the same thread.
+        """
         if self.best_model is None:
             raise ValueError("Model not trained yet. Please train the model first.")
-        
-        # Prepare input data
-        input_df = pd.DataFrame([input_data])
-        
-        # Encode categorical variables
-        for col in input_df.columns:
-            if col in self.label_encoders:
-                input_df[col] = self.label_encoders[col].transform(input_df[col])
-        
-        # Scale features if using scaled models
-        if self.best_model_name in ['SVR', 'Neural Network']:
-            input_scaled = self.scalers['standard'].transform(input_df)
-            prediction = self.best_model.predict(input_scaled)[0]
-        else:
-            prediction = self.best_model.predict(input_df)[0]
-        
-        return max(0, min(100, prediction))  # Ensure score is between 0-100
+        if len(records) == 1:
+            return self.assembler.row(records[0])
+        return self.assembler.matrix(records)
+
+    def predict_encoded(self, X):
+        """Scores (clipped to 0-100) for an encoded model input matrix"""
+        predictor = self.predictor if len(X) <= COMPILED_MAX_ROWS else self.batch_predictor
+        return np.clip(predictor.predict(X), 0, 100)
     
     def get_risk_level(self, score):
         """Get risk level based on biosecurity score"""
-        if score >= 80:
-            return "Low Risk", "green"
-        elif score >= 60:
-            return "Moderate Risk", "yellow"
-        elif score >= 40:
-            return "High Risk", "orange"
-        else:
-            return "Critical Risk", "red"
+        return SCORING_TABLE.get_risk_level(score)
     
     def get_recommendations(self, input_data, score):
         """Get personalized recommendations based on input data and score"""
-        recommendations = []
-        
-        # Infrastructure recommendations
-        if input_data.get('fencing_quality') in ['fair', 'poor']:
-            recommendations.append("Upgrade fencing quality to improve farm security")
-        
-        if input_data.get('biosecurity_gates') == 'no':
-            recommendations.append("Install biosecurity gates to control access")
-        
-        if input_data.get('quarantine_facility') == 'no':
-            recommendations.append("Establish a quarantine facility for new livestock")
-        
-        # Livestock management recommendations
-        if input_data.get('vaccination_protocol') in ['basic', 'none']:
-            recommendations.append("Implement a comprehensive vaccination protocol")
-        
-        if input_data.get('disease_monitoring') in ['monthly', 'rarely']:
-            recommendations.append("Increase disease monitoring frequency to at least weekly")
-        
-        # Hygiene recommendations
-        if input_data.get('disinfection_frequency') in ['monthly', 'rarely']:
-            recommendations.append("Increase disinfection frequency to at least weekly")
-        
-        if input_data.get('personal_protective_equipment') in ['basic', 'none']:
-            recommendations.append("Provide full personal protective equipment for staff")
-        
-        # General recommendations based on score
-        if score < 40:
-            recommendations.append("Immediate action required: Review and implement all biosecurity protocols")
-        elif score < 60:
-            recommendations.append("Significant improvements needed: Focus on high-impact areas first")
-        elif score < 80:
-            recommendations.append("Moderate improvements: Address remaining gaps systematically")
-        else:
-            recommendations.append("Maintain current standards and consider advanced biosecurity measures")
-        
-        return recommendations
+        return SCORING_TABLE.get_recommendations(input_data, score)
     
     def save_model(self, filepath='biosecurity_model.pkl'):
         """Save the trained model and encoders"""
@@ -314,19 +343,59 @@ class BiosecurityMLModel:
             'scalers': self.scalers,
             'feature_names': self.feature_names
         }
+        import joblib
         joblib.dump(model_data, filepath)
         print(f"Model saved to {filepath}")
     
     def load_model(self, filepath='biosecurity_model.pkl'):
         """Load a trained model"""
+        import joblib
         model_data = joblib.load(filepath)
         self.best_model = model_data['best_model']
         self.best_model_name = model_data['best_model_name']
         self.label_encoders = model_data['label_encoders']
         self.scalers = model_data['scalers']
         self.feature_names = model_data['feature_names']
+        self.compile_inference()
+        self.source = filepath
         print(f"Model loaded from {filepath}")
 
+    def export_artifact(self, filepath='biosecurity_model.bsm'):
+        """Save the trained model as a memory-mappable artifact.
+
+        The file holds the model arrays, encoder classes, scaler vectors and
+        feature names behind a JSON manifest (see model_artifact.py).
+        """
+        scaler = self.scalers.get('standard') if self.best_model_name in SCALED_MODELS else None
+        model_artifact.save_artifact(
+            filepath, self.best_model, self.best_model_name, self.feature_names,
+            {col: encoder.classes_ for col, encoder in self.label_encoders.items()},
+            scaler_mean=None if scaler is None else scaler.mean_,
+            scaler_scale=None if scaler is None else scaler.scale_
+        )
+        print(f"Model artifact saved to {filepath}")
+    
+    def load_artifact(self, filepath='biosecurity_model.bsm'):
+        """Load a model artifact by memory-mapping it instead of unpickling"""
+        manifest, self.best_model, arrays = model_artifact.load_artifact(filepath)
+        self.best_model_name = manifest['model_name']
+        self.feature_names = manifest['feature_names']
+        
+        # Only classes_ and mean_/scale_ are needed to compile inference, so
+        # plain namespaces stand in for the sklearn encoders and scaler
+        self.label_encoders = {
+            col: SimpleNamespace(classes_=np.array(classes, dtype=object))
+            for col, classes in manifest['categories'].items()
+        }
+        self.scalers = {}
+        if 'scaler_mean' in arrays:
+            self.scalers['standard'] = SimpleNamespace(mean_=arrays['scaler_mean'],
+                                                       scale_=arrays['scaler_scale'])
+        
+        self.compile_inference()
+        self.source = filepath
+        print(f"Model artifact loaded from {filepath}")
+
 def main():
     """Main function to train and test the model"""
     print("🚀 Initializing Biosecurity ML Model...")
@@ -340,7 +409,7 @@ def main():
     
     # Calculate biosecurity scores
     print("🧮 Calculating biosecurity scores...")
-    df['biosecurity_score'] = df.apply(model.calculate_biosecurity_score, axis=1)
+    df['biosecurity_score'] = model.calculate_biosecurity_scores(df)
     
     # Prepare features
     print("🔧 Preparing features for ML...")
@@ -359,10 +428,13 @@ def main():
     print("\n📈 Model Performance Results:")
     for name, metrics in results.items():
         print(f"\n{name}:")
+        if metrics.get('eliminated'):
+            print(f"  Eliminated after {metrics['folds']} CV folds")
         print(f"  R² Score: {metrics['R2']:.4f}")
         print(f"  Cross-Validation R²: {metrics['CV_R2']:.4f}")
         print(f"  Mean Absolute Error: {metrics['MAE']:.2f}")
         print(f"  Mean Squared Error: {metrics['MSE']:.2f}")
+        print(f"  Fits: {metrics['fits']} ({metrics['wall_time']:.2f}s)")
     
     # Test prediction
     print("\n🧪 Testing model prediction...")
@@ -401,9 +473,45 @@ def main():
     # Save model
     print("\n💾 Saving trained model...")
     model.save_model('biosecurity_model.pkl')
+    try:
+        model.export_artifact('biosecurity_model.bsm')
+    except ValueError as e:
+        print(f"⚠️  Skipping memory-mapped artifact: {str(e)}")
+    version = ModelRegistry().register(model, results)
+    print(f"📦 Registered as version {version} in the model registry")
     
     print("\n✅ Model training completed successfully!")
     return model
 
+def main_streaming(path, learner='sgd'):
+    """Train an incremental model on a CSV/Parquet file that may not fit in memory"""
+    print(f"🌊 Streaming training from {path}...")
+    
+    model = BiosecurityMLModel()
+    stats = model.train_streaming(path, learner=learner)
+    
+    print(f"\n🏆 Model: {model.best_model_name}")
+    print(f"  Rows: {stats['rows']} x {stats['epochs']} epochs")
+    print(f"  Throughput: {stats['rows_per_sec']:.0f} rows/sec")
+    print(f"  Progressive R²: {stats['progressive_R2']:.4f}")
+    print(f"  Progressive MAE: {stats['progressive_MAE']:.4f}")
+    
+    print("\n💾 Saving trained model...")
+    model.save_model('biosecurity_model.pkl')
+    try:
+        model.export_artifact('biosecurity_model.bsm')
+    except ValueError as e:
+        print(f"⚠️  Skipping memory-mapped artifact: {str(e)}")
+    # Progressive validation scores each chunk before learning from it, so
+    # its MAE stands in for the holdout MAE the registry canaries check
+    metrics = {model.best_model_name: {'R2': stats['progressive_R2'], 'MAE': stats['progressive_MAE']}}
+    version = ModelRegistry().register(model, metrics)
+    print(f"📦 Registered as version {version} in the model registry")
+    return model
+
 if __name__ == "__main__":
-    main()
+    # python biosecurity_model.py --stream assessments.csv [sgd|mlp]
+    if len(sys.argv) > 2 and sys.argv[1] == '--stream':
+        main_streaming(*sys.argv[2:4])
+    else:
+        main()
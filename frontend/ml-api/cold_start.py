@@ -0,0 +1,102 @@
+"""Measure serving cold start: import + model load + first prediction.
+
+    python cold_start.py            # fails if the service adds more than 100 ms
+    python cold_start.py 500        # fails if the total exceeds 500 ms
+
+The model is loaded exactly as the API loads it at startup (newest registry
+version, then the model files), so this measures whatever would be served.
+The budget assumes the memory-mapped artifact: the run also fails when the
+served model came from a pickle or sklearn was imported on the way.
+
+Importing Flask and NumPy is most of the total, and that part varies with
+the host far more than the rest. By default the budget therefore covers
+what the service adds on top of it: its own modules, the model load and the
+first prediction. Each run starts RUNS fresh interpreters that only import
+flask and numpy, interleaved with RUNS that measure the service, and
+compares medians.
+"""
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Milliseconds the service may add to the Flask + NumPy import baseline
+COLD_START_BUDGET_MS = 100
+RUNS = 5
+
+BASELINE_CODE = ('import time; start = time.perf_counter(); import flask, numpy; '
+                 'print((time.perf_counter() - start) * 1000)')
+MEASURE_CODE = 'import json, cold_start; print(json.dumps(cold_start.measure()))'
+
+
+def measure():
+    """Timings of this process's cold start; call it before anything else imports the API"""
+    start = time.perf_counter()
+    import biosecurity_api
+    imported = time.perf_counter()
+    biosecurity_api.load_model()
+    loaded = time.perf_counter()
+    if not biosecurity_api.model_loaded:
+        raise SystemExit("❌ No model to load. Train one first: python biosecurity_model.py")
+    biosecurity_api.model.predict_score(biosecurity_api.SAMPLE_INPUT)
+    predicted = time.perf_counter()
+    model = biosecurity_api.model
+    return {
+        'model_name': model.best_model_name,
+        'version': model.version,
+        'source': model.source,
+        'import_ms': (imported - start) * 1000,
+        'load_ms': (loaded - imported) * 1000,
+        'first_prediction_ms': (predicted - loaded) * 1000,
+        'total_ms': (predicted - start) * 1000,
+        'heavy_modules': sorted(name for name in ('pandas', 'sklearn', 'joblib', 'scipy')
+                                if name in sys.modules),
+    }
+
+
+def fresh_output(code):
+    """Last line printed by code run in a new interpreter"""
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(result.stdout + result.stderr)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def measure_fresh(runs=RUNS):
+    """Median baseline and measure() timings over fresh interpreters"""
+    baselines, runs_timings = [], []
+    for _ in range(runs):
+        baselines.append(float(fresh_output(BASELINE_CODE)))
+        runs_timings.append(json.loads(fresh_output(MEASURE_CODE)))
+    timings = dict(runs_timings[0])
+    for key in ('import_ms', 'load_ms', 'first_prediction_ms', 'total_ms'):
+        timings[key] = statistics.median(run[key] for run in runs_timings)
+    timings['baseline_ms'] = statistics.median(baselines)
+    timings['added_ms'] = statistics.median(run['total_ms'] - baseline
+                                            for run, baseline in zip(runs_timings, baselines))
+    return timings
+
+
+if __name__ == '__main__':
+    timings = measure_fresh()
+    version = '' if timings['version'] is None else f" (registry version {timings['version']})"
+    print(f"Model:            {timings['model_name']} from {timings['source']}{version}")
+    print(f"Import:           {timings['import_ms']:.1f} ms")
+    print(f"Model load:       {timings['load_ms']:.1f} ms")
+    print(f"First prediction: {timings['first_prediction_ms']:.1f} ms")
+    print(f"Total:            {timings['total_ms']:.1f} ms (median of {RUNS} fresh processes)")
+    print(f"Flask + NumPy:    {timings['baseline_ms']:.1f} ms")
+    if len(sys.argv) > 1:
+        budget = float(sys.argv[1])
+        print(f"Budget:           total within {budget:.0f} ms")
+        passed = timings['total_ms'] <= budget
+    else:
+        print(f"Service adds:     {timings['added_ms']:.1f} ms (budget {COLD_START_BUDGET_MS} ms)")
+        passed = timings['added_ms'] <= COLD_START_BUDGET_MS
+    if timings['heavy_modules']:
+        print(f"Heavy modules loaded: {', '.join(timings['heavy_modules'])}")
+    if not timings['source'].endswith('.bsm') or 'sklearn' in timings['heavy_modules']:
+        print("❌ Not served from the memory-mapped artifact; export it with model.export_artifact()")
+        passed = False
+    sys.exit(0 if passed else 1)
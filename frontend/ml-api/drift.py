@@ -0,0 +1,50 @@
+import math
+import random
+import threading
+
+
+class DriftMonitor:
+    """Running deviation of model scores from the scoring table.
+
+    Training labels come from the scoring table, so on any input the model's
+    score should sit close to the rules score. Only a sample_rate fraction of
+    predictions is compared; deviation is model score minus rules score.
+    """
+
+    def __init__(self, sample_rate=0.01):
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self.reset()
+
+    def sampled(self):
+        """Whether the current prediction should be compared"""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(self, model_score, rules_score):
+        deviation = float(model_score) - float(rules_score)
+        with self._lock:
+            self.count += 1
+            self._sum += deviation
+            self._sum_abs += abs(deviation)
+            self._sum_squares += deviation * deviation
+            self.max_abs_deviation = max(self.max_abs_deviation, abs(deviation))
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self._sum = 0.0
+            self._sum_abs = 0.0
+            self._sum_squares = 0.0
+            self.max_abs_deviation = 0.0
+
+    def stats(self):
+        with self._lock:
+            count = self.count
+            return {
+                'sample_rate': self.sample_rate,
+                'samples': count,
+                'mean_deviation': self._sum / count if count else None,
+                'mean_abs_deviation': self._sum_abs / count if count else None,
+                'rmse': math.sqrt(self._sum_squares / count) if count else None,
+                'max_abs_deviation': self.max_abs_deviation if count else None
+            }
@@ -0,0 +1,97 @@
+"""JSON encoding for both APIs.
+
+    app.json = FastJSONProvider(app)
+
+jsonify() and request.get_json() then go through orjson when it is
+installed (pip install orjson), else the standard library json. Both encode
+NumPy scalars and arrays directly, so handlers need not convert them.
+"""
+import importlib.util
+import json
+import os
+import numpy as np
+from flask import request
+from flask.json.provider import JSONProvider, _default
+
+# orjson itself is imported by the first request that needs it
+ORJSON_INSTALLED = importlib.util.find_spec('orjson') is not None
+
+# Default for requests without ?compact=: compact responses leave out the
+# echoed input data and are never pretty-printed
+COMPACT_RESPONSES = os.environ.get('COMPACT_RESPONSES', '0').lower() in ('1', 'true', 'yes')
+
+# JSON_ENCODER=json forces the standard library encoder
+JSON_ENCODER = os.environ.get('JSON_ENCODER', 'orjson' if ORJSON_INSTALLED else 'json')
+if JSON_ENCODER not in ('orjson', 'json'):
+    raise ValueError(f"JSON_ENCODER must be 'orjson' or 'json', got '{JSON_ENCODER}'")
+if JSON_ENCODER == 'orjson' and not ORJSON_INSTALLED:
+    raise ImportError("JSON_ENCODER=orjson requires orjson: pip install orjson")
+
+
+def _orjson():
+    """(orjson, options every call uses), imported on first use"""
+    import orjson
+    return orjson, orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def compact_response():
+    """Whether the current request asked for a compact response (?compact=1)"""
+    value = request.args.get('compact')
+    if value is None:
+        return COMPACT_RESPONSES
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def default(o):
+    """Encode what json cannot: NumPy values, then Flask's defaults (dates, UUIDs, ...)"""
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    return _default(o)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, falling back to json.
+
+    Keys keep their insertion order. Responses are pretty-printed in debug
+    mode unless the request is compact; dumps() is always compact, so its
+    output fits on one line (e.g. in a server-sent event).
+    """
+
+    def __init__(self, app, encoder=JSON_ENCODER):
+        super().__init__(app)
+        self.encoder = encoder
+        self._orjson = None
+
+    def dumps(self, obj, **kwargs):
+        if self.encoder == 'orjson':
+            orjson, options = self._orjson or self._load_orjson()
+            return orjson.dumps(obj, default=default, option=options).decode()
+        kwargs.setdefault('default', default)
+        kwargs.setdefault('separators', (',', ':'))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.encoder == 'orjson':
+            orjson, _ = self._orjson or self._load_orjson()
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def _load_orjson(self):
+        self._orjson = _orjson()
+        return self._orjson
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self._app.debug and not compact_response()
+        if self.encoder == 'orjson':
+            orjson, options = self._orjson or self._load_orjson()
+            option = options | orjson.OPT_APPEND_NEWLINE
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            body = orjson.dumps(obj, default=default, option=option)
+        else:
+            body = json.dumps(obj, default=default, indent=2 if pretty else None,
+                              separators=(', ', ': ') if pretty else (',', ':')) + '\n'
+        return self._app.response_class(body, mimetype='application/json')
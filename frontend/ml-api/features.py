@@ -0,0 +1,64 @@
+import threading
+import numpy as np
+
+
+class FeatureAssembler:
+    """Builds model input rows in training column order.
+
+    Request fields are written straight into a preallocated float32 row (the
+    dtype the training matrix uses), one buffer per thread, so no arrays are
+    allocated per call and the column order never depends on the client's
+    JSON key order. An optional folded scaler writes into a second
+    per-thread float64 buffer.
+    """
+
+    def __init__(self, feature_names, category_codes, scale_mean=None, scale_scale=None):
+        self.feature_names = list(feature_names)
+        self.fields = [(name, category_codes.get(name)) for name in self.feature_names]
+        self.scale_mean = scale_mean
+        self.scale_scale = scale_scale
+        self._local = threading.local()
+
+    def _buffers(self):
+        local = self._local
+        row = getattr(local, 'row', None)
+        if row is None:
+            n_features = len(self.feature_names)
+            row = local.row = np.empty((1, n_features), dtype=np.float32)
+            local.scaled = np.empty((1, n_features), dtype=np.float64)
+        return row, local.scaled
+
+    def row(self, record):
+        """(1, n_features) model input for one record, valid until the next call on this thread"""
+        row, scaled = self._buffers()
+        values = row[0]
+        for i, (name, codes) in enumerate(self.fields):
+            value = record[name]
+            if codes is None:
+                values[i] = value
+            else:
+                try:
+                    values[i] = codes[value]
+                except KeyError:
+                    raise ValueError(f"y contains previously unseen labels: {value!r}")
+        if self.scale_mean is None:
+            return row
+        np.subtract(row, self.scale_mean, out=scaled)
+        np.divide(scaled, self.scale_scale, out=scaled)
+        return scaled
+
+    def matrix(self, records):
+        """(n_records, n_features) model input for a batch of records"""
+        X = np.empty((len(records), len(self.feature_names)), dtype=np.float32)
+        for i, (name, codes) in enumerate(self.fields):
+            column = [record[name] for record in records]
+            if codes is None:
+                X[:, i] = column
+            else:
+                try:
+                    X[:, i] = [codes[value] for value in column]
+                except KeyError as e:
+                    raise ValueError(f"y contains previously unseen labels: {e.args[0]!r}")
+        if self.scale_mean is None:
+            return X
+        return (X - self.scale_mean) / self.scale_scale
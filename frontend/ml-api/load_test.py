@@ -0,0 +1,68 @@
+import json
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Sample payloads matching test_api.py
+SAMPLES = {
+    'biosecurity': ('http://127.0.0.1:5001/predict', {
+        'farm_size_acres': 100, 'fencing_quality': 'good', 'biosecurity_gates': 'yes',
+        'quarantine_facility': 'yes', 'vehicle_wash_station': 'no', 'livestock_count': 200,
+        'vaccination_protocol': 'moderate', 'disease_monitoring': 'weekly',
+        'isolation_practices': 'good', 'disinfection_frequency': 'weekly',
+        'personal_protective_equipment': 'partial', 'visitor_control': 'moderate',
+        'feed_storage_security': 'good', 'water_source_protection': 'good',
+        'rodent_control': 'good', 'insect_control': 'fair', 'staff_training': 'quarterly',
+        'protocol_documentation': 'moderate', 'emergency_plan': 'yes', 'veterinary_contact': 'yes'
+    }),
+    'quiz': ('http://127.0.0.1:8000/predict', {
+        'q1': 15, 'q2': 18, 'q3': 12, 'q4': 16, 'q5': 14, 'q6': 10, 'q7': 8, 'q8': 6,
+        'q9': 12, 'q10': 14, 'q11': 16, 'q12': 18, 'q13': 17, 'q14': 19, 'q15': 15
+    }),
+}
+
+
+def load_test(url, payload, requests=2000, concurrency=32):
+    """POST payload to url from concurrent clients and report throughput"""
+    body = json.dumps(payload).encode()
+
+    def post(_):
+        start = time.perf_counter()
+        req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req) as response:
+                response.read()
+                ok = response.status == 200
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(post, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, latency in outcomes)
+    return {
+        'requests': requests,
+        'errors': sum(1 for ok, _ in outcomes if not ok),
+        'requests_per_sec': requests / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+if __name__ == '__main__':
+    # python load_test.py biosecurity [requests] [concurrency] [url]
+    name = sys.argv[1] if len(sys.argv) > 1 else 'biosecurity'
+    url, payload = SAMPLES[name]
+    n_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    url = sys.argv[4] if len(sys.argv) > 4 else url
+
+    print(f"🔥 {n_requests} requests to {url} with {concurrency} concurrent clients...")
+    stats = load_test(url, payload, n_requests, concurrency)
+    print(f"Throughput: {stats['requests_per_sec']:.0f} req/s")
+    print(f"Latency p50: {stats['p50_ms']:.1f} ms, p99: {stats['p99_ms']:.1f} ms")
+    print(f"Errors: {stats['errors']}/{stats['requests']}")
@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from flask import Response, g, request
+
+# Histogram bucket bounds in seconds, 1-2.5-5 steps per decade from 100
+# microseconds (a cached prediction) to 30 seconds (a stalled request)
+LATENCY_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+
+def multiprocess_mode():
+    """Whether values are aggregated across processes (PROMETHEUS_MULTIPROC_DIR is set)"""
+    return 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+
+
+class _StageTimer:
+    __slots__ = ('metrics', 'stage', 'route', 'start')
+
+    def __init__(self, metrics, stage, route):
+        self.metrics = metrics
+        self.stage = stage
+        self.route = route
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe_stage(self.stage, time.perf_counter() - self.start, self.route)
+        return False
+
+
+class _InfoCollector:
+    """Info gauges read from the serving process at scrape time"""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def collect(self):
+        from prometheus_client.core import GaugeMetricFamily
+        app_name = self.metrics.app_name
+        info = self.metrics.model_info() if self.metrics.model_info else None
+        names = sorted(info) if info else []
+        family = GaugeMetricFamily('ml_api_model_info', 'Model currently serving predictions',
+                                   labels=['app'] + names)
+        if info:
+            family.add_metric([app_name] + [str(info[name]) for name in names], 1)
+        yield family
+
+        # Set by fast_json.FastJSONProvider
+        app = self.metrics.app
+        encoder = getattr(app.json, 'encoder', None) if app is not None else None
+        family = GaugeMetricFamily('ml_api_json_encoder_info', 'JSON library encoding responses',
+                                   labels=['app', 'encoder'])
+        if encoder:
+            family.add_metric([app_name, encoder], 1)
+        yield family
+
+
+class Metrics:
+    """Request metrics for a Flask app in Prometheus text format.
+
+    instrument() counts requests by route and status, errors by type, tracks
+    in-flight requests and request latency, and serves everything at
+    /metrics. Handlers time their own stages with `with metrics.stage(name):`.
+    Each instance has its own registry, so several apps can share a process.
+    prometheus_client is imported, and the registry and collectors created,
+    when the first request arrives rather than when the app is imported.
+
+    Under a pre-fork server every worker counts separately, so serve.py sets
+    PROMETHEUS_MULTIPROC_DIR before the app is imported: each process writes
+    its values to files there, and /metrics, on whichever worker answers, adds
+    up all of them, including those of workers that have exited.
+    """
+
+    def __init__(self, app_name):
+        self.app_name = app_name
+        self.model_info = None
+        self.app = None
+        self.registry = None
+        self._lock = threading.Lock()
+        self._info = _InfoCollector(self)
+
+    def _create_collectors(self):
+        from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+        with self._lock:
+            if self.registry is not None:
+                return
+            registry = CollectorRegistry()
+            self.requests = Counter('ml_api_requests_total', 'Requests handled, by route and status',
+                                    ['app', 'route', 'status'], registry=registry)
+            self.errors = Counter('ml_api_errors_total', 'Error responses, by route and error type',
+                                  ['app', 'route', 'type'], registry=registry)
+            # livesum: the requests in flight in the workers that are alive
+            self.in_flight = Gauge('ml_api_in_flight_requests', 'Requests currently being handled',
+                                   ['app'], registry=registry,
+                                   multiprocess_mode='livesum').labels(self.app_name)
+            self.request_latency = Histogram('ml_api_request_duration_seconds', 'Request latency, by route',
+                                             ['app', 'route'], buckets=LATENCY_BUCKETS,
+                                             registry=registry)
+            self.stage_latency = Histogram('ml_api_stage_duration_seconds',
+                                           'Latency of each request stage, by route',
+                                           ['app', 'route', 'stage'], buckets=LATENCY_BUCKETS,
+                                           registry=registry)
+            registry.register(self._info)
+            # Set last: other threads check it before using the collectors
+            self.registry = registry
+
+    def instrument(self, app, model_info=None):
+        """Install the request hooks and the /metrics route on app.
+
+        model_info returns the labels of the model currently serving (e.g.
+        {'model_name': ..., 'model_version': ...}), or None.
+        """
+        self.model_info = model_info
+        self.app = app
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/metrics', 'metrics', self.render_response, methods=['GET'])
+        return app
+
+    def stage(self, name, route=None):
+        """Context manager timing one stage of the current request.
+
+        Work running outside the request (e.g. in a background thread) passes
+        the request's route, from current_route().
+        """
+        return _StageTimer(self, name, route)
+
+    def error(self, exc):
+        """Record the exception (or exception type name) behind the current request's error response"""
+        g.metrics_error_type = exc if isinstance(exc, str) else type(exc).__name__
+
+    def observe_stage(self, stage, seconds, route=None):
+        if self.registry is None:
+            self._create_collectors()
+        self.stage_latency.labels(self.app_name, route or self.current_route(), stage).observe(seconds)
+
+    def current_route(self):
+        rule = request.url_rule
+        return rule.rule if rule is not None else 'unmatched'
+
+    def _before_request(self):
+        if self.registry is None:
+            self._create_collectors()
+        g.metrics_start = time.perf_counter()
+        g.metrics_counted = True
+        self.in_flight.inc()
+
+    def _after_request(self, response):
+        start = g.get('metrics_start')
+        if start is None:
+            return response
+        route = self.current_route()
+        self.request_latency.labels(self.app_name, route).observe(time.perf_counter() - start)
+        self.requests.labels(self.app_name, route, response.status_code).inc()
+        if response.status_code >= 400:
+            error_type = g.get('metrics_error_type') or f'http_{response.status_code}'
+            self.errors.labels(self.app_name, route, error_type).inc()
+        return response
+
+    def _teardown_request(self, exc):
+        if g.pop('metrics_counted', False):
+            self.in_flight.dec()
+
+    def render(self):
+        from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+        if self.registry is None:
+            self._create_collectors()
+        if not multiprocess_mode():
+            return generate_latest(self.registry).decode()
+        # Every process's values from PROMETHEUS_MULTIPROC_DIR, plus the
+        # info gauges of this one
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(self._info)
+        return generate_latest(registry).decode()
+
+    def render_response(self):
+        from prometheus_client import CONTENT_TYPE_LATEST
+        return Response(self.render(), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,166 @@
+import json
+import struct
+import numpy as np
+from tree_compiler import FOREST_ESTIMATORS, CompiledForest, flatten_forest
+
+# File layout: MAGIC, manifest length (uint64 little-endian), JSON manifest,
+# then every array at an ALIGN-byte boundary. Array offsets in the manifest
+# are relative to the first aligned byte after the manifest.
+MAGIC = b'BSMODEL1'
+# 2: forests stored as tree_compiler's interleaved children arrays
+# 3: categorical splits (tree_bitset, tree_categories) for histogram boosting
+# 4: the direction missing values take at each node (tree_missing_left)
+FORMAT_VERSION = 4
+# Older versions lack the newer optional arrays
+READABLE_VERSIONS = (2, 3, 4)
+ALIGN = 64
+
+
+# Estimators MappedModel evaluates from their coefficient arrays alone
+LINEAR_ESTIMATORS = ['LinearRegression', 'Ridge', 'SGDRegressor']
+ARRAY_ESTIMATORS = LINEAR_ESTIMATORS + ['MLPRegressor']
+
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def export_estimator(estimator):
+    """(kind, params, arrays) describing a fitted estimator"""
+    name = type(estimator).__name__
+    if name in FOREST_ESTIMATORS:
+        params, arrays = flatten_forest(estimator)
+        return 'forest', params, arrays
+    if name in LINEAR_ESTIMATORS:
+        return 'linear', {'intercept': float(np.ravel(estimator.intercept_)[0])}, {
+            'coef': np.asarray(estimator.coef_).ravel()
+        }
+    if name == 'MLPRegressor':
+        if estimator.activation != 'relu':
+            raise ValueError(f"Unsupported MLP activation: {estimator.activation}")
+        arrays = {}
+        for i, (weights, bias) in enumerate(zip(estimator.coefs_, estimator.intercepts_)):
+            arrays[f'mlp_weights_{i}'] = np.asarray(weights)
+            arrays[f'mlp_bias_{i}'] = np.asarray(bias)
+        return 'mlp', {'n_layers': len(estimator.coefs_)}, arrays
+    if name == 'SVR' and estimator.kernel == 'rbf':
+        return 'svr_rbf', {'gamma': float(estimator._gamma),
+                           'intercept': float(estimator.intercept_[0])}, {
+            'support_vectors': np.asarray(estimator.support_vectors_, dtype=np.float64),
+            'dual_coef': np.asarray(estimator.dual_coef_[0], dtype=np.float64),
+        }
+    raise ValueError(f"{name} cannot be stored as a memory-mapped artifact")
+
+
+class MappedModel:
+    """Regressor evaluated directly from (memory-mapped) arrays"""
+
+    def __init__(self, kind, params, arrays):
+        self.kind = kind
+        self.params = params
+        self.arrays = arrays
+        # Forests are evaluated by tree_compiler straight from the mapped arrays
+        self.forest = CompiledForest(params, arrays) if kind == 'forest' else None
+
+    def predict(self, X):
+        if self.forest is not None:
+            return self.forest.predict(X)
+        # Linear and MLP arrays keep the dtype they were fitted in, and inputs
+        # keep theirs, so results round exactly as the estimator's predict
+        X = np.asarray(X)
+        if X.dtype.kind != 'f':
+            X = X.astype(np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return getattr(self, f'_predict_{self.kind}')(X)
+
+    def _predict_linear(self, X):
+        return X @ self.arrays['coef'] + self.params['intercept']
+
+    def _predict_mlp(self, X):
+        activations = X
+        last = self.params['n_layers'] - 1
+        for i in range(self.params['n_layers']):
+            activations = activations @ self.arrays[f'mlp_weights_{i}'] + self.arrays[f'mlp_bias_{i}']
+            if i < last:
+                np.maximum(activations, 0, out=activations)
+        return activations.ravel()
+
+    def _predict_svr_rbf(self, X):
+        X = X.astype(np.float64, copy=False)
+        sv = self.arrays['support_vectors']
+        sq_dist = ((X * X).sum(axis=1)[:, None] - 2 * X @ sv.T + (sv * sv).sum(axis=1)[None, :])
+        kernel = np.exp(-self.params['gamma'] * np.maximum(sq_dist, 0))
+        return kernel @ self.arrays['dual_coef'] + self.params['intercept']
+
+
+def save_artifact(filepath, estimator, model_name, feature_names, categories,
+                  scaler_mean=None, scaler_scale=None):
+    """Write an estimator and its preprocessing into one mappable file.
+
+    categories maps each label-encoded field to its classes in code order.
+    """
+    kind, params, arrays = export_estimator(estimator)
+    if scaler_mean is not None:
+        arrays['scaler_mean'] = np.asarray(scaler_mean, dtype=np.float64)
+        arrays['scaler_scale'] = np.asarray(scaler_scale, dtype=np.float64)
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        offset = _align(offset + array.nbytes)
+
+    manifest = json.dumps({
+        'format_version': FORMAT_VERSION,
+        'model_name': model_name,
+        'kind': kind,
+        'params': params,
+        'feature_names': list(feature_names),
+        'categories': {field: [str(value) for value in values]
+                       for field, values in categories.items()},
+        'arrays': layout,
+    }).encode()
+
+    header_size = len(MAGIC) + 8 + len(manifest)
+    data_start = _align(header_size)
+    with open(filepath, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(manifest)))
+        f.write(manifest)
+        f.write(b'\0' * (data_start - header_size))
+        position = 0
+        for name, array in arrays.items():
+            f.write(b'\0' * (layout[name]['offset'] - position))
+            f.write(array.tobytes())
+            position = layout[name]['offset'] + array.nbytes
+
+
+def read_manifest(filepath):
+    with open(filepath, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filepath} is not a biosecurity model artifact")
+        (length,) = struct.unpack('<Q', f.read(8))
+        manifest = json.loads(f.read(length))
+    if manifest['format_version'] not in READABLE_VERSIONS:
+        raise ValueError(f"Unsupported artifact format version: {manifest['format_version']}")
+    return manifest, _align(len(MAGIC) + 8 + length)
+
+
+def load_artifact(filepath):
+    """Map an artifact read-only; returns (manifest, MappedModel, arrays).
+
+    Arrays are views into the mapping, so processes loading the same file
+    share its pages through the OS page cache instead of holding copies.
+    """
+    manifest, data_start = read_manifest(filepath)
+    mapping = np.memmap(filepath, dtype=np.uint8, mode='r')
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        arrays[name] = np.frombuffer(mapping, dtype=dtype, count=count,
+                                     offset=data_start + spec['offset']).reshape(spec['shape'])
+    return manifest, MappedModel(manifest['kind'], manifest['params'], arrays), arrays
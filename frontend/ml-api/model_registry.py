@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+import numpy as np
+
+DEFAULT_REGISTRY_DIR = 'model_registry'
+
+
+def _json_safe(value):
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class ModelRegistry:
+    """Versioned trained models on disk.
+
+    Each version lives in <root>/v<N>/ with the model pickle, the
+    memory-mapped artifact when the model supports one, and metadata.json
+    (model name, creation time, training metrics). Versions are written to a
+    temporary directory and renamed into place, so readers never see a
+    partial version.
+    """
+
+    def __init__(self, root=DEFAULT_REGISTRY_DIR):
+        self.root = root
+
+    def versions(self):
+        """Registered version numbers, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(int(name[1:]) for name in os.listdir(self.root)
+                      if name.startswith('v') and name[1:].isdigit())
+
+    def latest(self):
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def path(self, version):
+        return os.path.join(self.root, f'v{version}')
+
+    def metadata(self, version):
+        with open(os.path.join(self.path(version), 'metadata.json')) as f:
+            return json.load(f)
+
+    def register(self, model, metrics=None):
+        """Store a trained BiosecurityMLModel as the next version"""
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.root)
+        try:
+            files = ['biosecurity_model.pkl']
+            model.save_model(os.path.join(staging, 'biosecurity_model.pkl'))
+            try:
+                model.export_artifact(os.path.join(staging, 'biosecurity_model.bsm'))
+                files.append('biosecurity_model.bsm')
+            except ValueError:
+                pass
+
+            while True:
+                version = (self.latest() or 0) + 1
+                metadata = {
+                    'version': version,
+                    'model_name': model.best_model_name,
+                    'created_at': datetime.now().isoformat(),
+                    'feature_names': model.feature_names,
+                    'metrics': _json_safe(metrics or {}),
+                    'files': files
+                }
+                with open(os.path.join(staging, 'metadata.json'), 'w') as f:
+                    json.dump(metadata, f, indent=2)
+                try:
+                    os.rename(staging, self.path(version))
+                    return version
+                except OSError:
+                    # Another trainer took this version number; try the next one
+                    if not os.path.exists(self.path(version)):
+                        raise
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def load(self, version, model):
+        """Load a version into model, preferring the memory-mapped artifact.
+
+        Falls back to the pickle when the artifact is missing or was written
+        in an older format.
+        """
+        path = self.path(version)
+        artifact = os.path.join(path, 'biosecurity_model.bsm')
+        try:
+            model.load_artifact(artifact)
+        except (OSError, ValueError):
+            model.load_model(os.path.join(path, 'biosecurity_model.pkl'))
+        model.version = version
+        model.metadata = self.metadata(version)
+        return model
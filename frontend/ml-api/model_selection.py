@@ -0,0 +1,208 @@
+import os
+import time
+import numpy as np
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import KFold
+from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+
+CV_FOLDS = 5
+
+# A candidate whose partial CV R² trails the leader by more than this margin
+# after a rung is dropped from the remaining folds.
+ELIMINATION_MARGIN = 0.05
+
+
+def cv_rungs(cv):
+    """Cumulative fold counts after which candidates are compared"""
+    return sorted({1, (cv + 1) // 2, cv})
+
+
+def data_fingerprint(*arrays):
+    """Content hash of the training/test data"""
+    return joblib.hash(arrays)
+
+
+def _take(data, indices):
+    return data.iloc[indices] if hasattr(data, 'iloc') else data[indices]
+
+
+def _fit_fold(estimator, X, y, train_idx, val_idx, X_test):
+    """Fit a fresh clone on one CV fold.
+
+    Returns the validation R², the clone's predictions for the held-out test
+    split and the task's wall time.
+    """
+    start = time.perf_counter()
+    estimator = clone(estimator)
+    estimator.fit(_take(X, train_idx), _take(y, train_idx))
+    val_score = r2_score(_take(y, val_idx), estimator.predict(_take(X, val_idx)))
+    test_pred = estimator.predict(X_test)
+    return val_score, test_pred, time.perf_counter() - start
+
+
+def _test_metrics(y_test, fold_predictions):
+    """Test metrics of the fold models' averaged predictions"""
+    y_pred = np.mean(fold_predictions, axis=0)
+    return {
+        'MSE': mean_squared_error(y_test, y_pred),
+        'R2': r2_score(y_test, y_pred),
+        'MAE': mean_absolute_error(y_test, y_pred)
+    }
+
+
+class CandidateCache:
+    """Candidate metrics and refitted winners on disk, keyed by parameters and data"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def key(self, name, estimator, fingerprint, cv):
+        return joblib.hash((name, estimator.get_params(deep=True), fingerprint, cv))
+
+    def load(self, key):
+        path = os.path.join(self.cache_dir, f'{key}.pkl')
+        if not os.path.exists(path):
+            return None
+        return joblib.load(path)
+
+    def save(self, key, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        joblib.dump(entry, os.path.join(self.cache_dir, f'{key}.pkl'))
+
+
+def select_model(candidates, y_train, y_test, y_full, n_jobs=-1, time_budget=None,
+                 cache_dir=None, cv=CV_FOLDS, elimination_margin=ELIMINATION_MARGIN):
+    """Pick the candidate with the best cross-validated R² and refit it.
+
+    candidates maps a name to (estimator, X_train, X_test, X_full); X_full
+    may be a callable that builds the full matrix, called only for the
+    winner (and fingerprinted as the callable and its arguments). CV folds
+    run in rungs across a process pool; each fold fit yields both its
+    validation score and its predictions on the test split, so CV R² and
+    test metrics come from the same fits. After each rung, candidates that
+    clearly trail the leader are eliminated. Once time_budget seconds have
+    passed no further fold fit is submitted; the first rung always runs in
+    full so that every candidate has a score, and fits already running are
+    finished. Only the winner is then refitted, once, on the full data.
+    With cache_dir, fully evaluated candidates and refitted winners are
+    reused on reruns over the same data, and candidates that stopped early
+    (eliminated or out of time) keep their fold results, so a rerun only
+    fits the folds they are still missing.
+
+    Returns (results, best_name, best_estimator); each result reports the
+    candidate's fit count and wall time.
+    """
+    start = time.perf_counter()
+    cache = CandidateCache(cache_dir) if cache_dir else None
+
+    def over_budget():
+        return time_budget is not None and time.perf_counter() - start > time_budget
+
+    results = {}
+    cache_keys = {}
+    fingerprints = {}
+    partial = {}
+    for name, (estimator, X_train, X_test, X_full) in candidates.items():
+        if cache is None:
+            continue
+        data_key = (id(X_train), id(X_test), id(X_full))
+        if data_key not in fingerprints:
+            fingerprints[data_key] = data_fingerprint(X_train, y_train, X_test, y_test,
+                                                      X_full, y_full)
+        cache_keys[name] = cache.key(name, estimator, fingerprints[data_key], cv)
+        entry = cache.load(cache_keys[name])
+        if entry is not None:
+            results[name] = dict(entry['metrics'], fits=0, wall_time=0.0, cached=True)
+            continue
+        # The first folds of a candidate that stopped early on an earlier run
+        entry = cache.load(f'{cache_keys[name]}-partial')
+        if entry is not None:
+            partial[name] = entry
+
+    pending = [name for name in candidates if name not in results]
+    fold_scores = {name: list(partial.get(name, {}).get('fold_scores', [])) for name in pending}
+    fold_predictions = {name: list(partial.get(name, {}).get('fold_predictions', []))
+                        for name in pending}
+    cached_folds = {name: len(fold_scores[name]) for name in pending}
+    wall_times = {name: 0.0 for name in pending}
+    splits = list(KFold(n_splits=cv).split(np.arange(len(y_train))))
+    eliminated = set()
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+        folds_done = 0
+        for rung in cv_rungs(cv):
+            if not pending or (folds_done and over_budget()):
+                break
+
+            tasks = []
+
+            def submissions():
+                # The pool pulls tasks as workers free up, so checking here
+                # stops a rung as soon as the budget is spent. Folds go out
+                # in order, keeping the candidates' fold counts level.
+                for fold in range(folds_done, rung):
+                    for name in pending:
+                        if fold < cached_folds[name]:
+                            continue
+                        if folds_done and over_budget():
+                            return
+                        tasks.append((name, fold))
+                        yield delayed(_fit_fold)(candidates[name][0], candidates[name][1], y_train,
+                                                 *splits[fold], candidates[name][2])
+
+            outputs = parallel(submissions())
+            for (name, fold), (score, test_pred, wall_time) in zip(tasks, outputs):
+                fold_scores[name].append(score)
+                fold_predictions[name].append(test_pred)
+                wall_times[name] += wall_time
+            folds_done = rung
+
+            # Drop candidates whose partial CV R² clearly trails the leader
+            leader = max([np.mean(fold_scores[name]) for name in pending] +
+                         [result['CV_R2'] for result in results.values()])
+            for name in list(pending):
+                if np.mean(fold_scores[name]) < leader - elimination_margin:
+                    pending.remove(name)
+                    eliminated.add(name)
+
+    for name in fold_scores:
+        metrics = _test_metrics(y_test, fold_predictions[name])
+        metrics['CV_R2'] = np.mean(fold_scores[name])
+        metrics['folds'] = len(fold_scores[name])
+        if cache is not None and name not in eliminated and metrics['folds'] == cv:
+            cache.save(cache_keys[name], {'metrics': dict(metrics)})
+        elif cache is not None and metrics['folds'] > cached_folds[name]:
+            cache.save(f'{cache_keys[name]}-partial', {'fold_scores': fold_scores[name],
+                                                       'fold_predictions': fold_predictions[name]})
+        metrics['fits'] = len(fold_scores[name]) - cached_folds[name]
+        metrics['wall_time'] = wall_times[name]
+        if name in eliminated:
+            metrics['eliminated'] = True
+        results[name] = metrics
+
+    best_name = max((name for name in candidates if name not in eliminated),
+                    key=lambda name: results[name]['CV_R2'])
+
+    # Refit the winner once on the full data
+    estimator, _, _, X_full = candidates[best_name]
+    refit_key = None
+    best_estimator = None
+    if cache is not None:
+        refit_key = f'{cache_keys[best_name]}-refit'
+        entry = cache.load(refit_key)
+        if entry is not None:
+            best_estimator = entry['estimator']
+    if best_estimator is None:
+        refit_start = time.perf_counter()
+        if callable(X_full):
+            X_full = X_full()
+        best_estimator = clone(estimator).fit(X_full, y_full)
+        results[best_name]['fits'] += 1
+        results[best_name]['wall_time'] += time.perf_counter() - refit_start
+        if refit_key is not None:
+            cache.save(refit_key, {'estimator': best_estimator})
+
+    ordered = {name: results[name] for name in candidates}
+    return ordered, best_name, best_estimator
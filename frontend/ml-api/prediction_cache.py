@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with an optional TTL for per-record predictions.
+
+    Keys are built from a fixed field order so that equal inputs map to the
+    same entry regardless of JSON key order. Numeric fields listed in
+    buckets are floored to multiples of their bucket size first, so nearby
+    farm sizes or herd counts share an entry.
+    """
+
+    def __init__(self, fields, max_size=10000, ttl=None, buckets=None):
+        self.fields = list(fields)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.buckets = dict(buckets or {})
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, record, namespace=None):
+        """Canonical key of a validated record.
+
+        namespace (e.g. the model version) keeps entries from different
+        models apart.
+        """
+        values = [namespace]
+        for field in self.fields:
+            value = record[field]
+            bucket = self.buckets.get(field)
+            if bucket:
+                value = (value // bucket) * bucket
+            values.append(value)
+        return tuple(values)
+
+    def get(self, key):
+        """Cached value for key, or None"""
+        if not self.max_size:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if not self.max_size:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,279 @@
+"""Quiz risk model: training command and compiled inference for app.py.
+
+    python quiz_model.py              # build the model, label encoder and scaler
+    python quiz_model.py --regenerate # also regenerate biometric_quiz_data.csv
+
+Each run writes its three artifacts to a new directory under quiz_artifacts/
+and then publishes them together by replacing quiz_artifacts/current.json,
+which names the run and the SHA-256 of each file. app.py only loads the set
+current.json names.
+"""
+import hashlib
+import io
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+import numpy as np
+
+ARTIFACT_DIR = 'quiz_artifacts'
+MANIFEST_NAME = 'current.json'
+MODEL_FILE = 'biometric_model.pkl'
+ENCODER_FILE = 'label_encoder.pkl'
+SCALER_FILE = 'scaler.pkl'
+DATA_PATH = 'biometric_quiz_data.csv'
+
+QUESTIONS = [f'q{i}' for i in range(1, 16)]
+
+# Quiz categories, three consecutive questions each
+CATEGORIES = ['Hygiene', 'Access Control', 'Quarantine', 'Pest Control', 'Feed & Water']
+
+# Inclusive range of each category's answers around a farm's base level
+CATEGORY_OFFSETS = [(-3, 3), (-4, 2), (-5, 1), (-3, 3), (-2, 4)]
+
+
+class CompiledLogistic:
+    """LogisticRegression with its StandardScaler folded into the weights.
+
+    Scaling then the linear model, ((x - mean) / scale) @ coef.T + intercept,
+    equals x @ (coef / scale).T + (intercept - coef @ (mean / scale)), so a
+    prediction is one matmul plus softmax (or normalized sigmoids for
+    one-vs-rest models) with no sklearn input validation.
+    """
+
+    def __init__(self, weights, intercept, classes, ovr=False):
+        self.weights = weights
+        self.intercept = intercept
+        self.classes_ = classes
+        self.ovr = ovr
+        # Row-major Python copies for the pure-Python single-row path
+        self._weight_rows = weights.tolist()
+        self._intercept_list = intercept.tolist()
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None):
+        """Fold a fitted StandardScaler (optional) into a fitted LogisticRegression"""
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        intercept = np.asarray(model.intercept_, dtype=np.float64)
+        if scaler is not None:
+            n_features = coef.shape[1]
+            mean = np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros(n_features)
+            scale = np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones(n_features)
+            coef = coef / scale
+            intercept = intercept - coef @ mean
+
+        # Mirrors LogisticRegression.predict_proba: binary and liblinear or
+        # multi_class='ovr' models use sigmoids, the rest softmax
+        multi_class = getattr(model, 'multi_class', 'auto')
+        ovr = multi_class == 'ovr' or (
+            multi_class in ('auto', 'deprecated')
+            and (len(model.classes_) <= 2 or model.solver == 'liblinear')
+        )
+        return cls(coef, intercept, np.asarray(model.classes_), ovr)
+
+    def decision_function(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.weights.T + self.intercept
+
+    def predict_proba(self, X):
+        """(N, n_classes) class probabilities"""
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) == 1:
+            return np.array([self.predict_proba_one(X[0].tolist())])
+
+        decision = self.decision_function(X)
+        if self.ovr:
+            probs = 1.0 / (1.0 + np.exp(-decision))
+            if probs.shape[1] == 1:
+                return np.hstack([1.0 - probs, probs])
+            return probs / probs.sum(axis=1, keepdims=True)
+        if decision.shape[1] == 1:
+            decision = np.hstack([-decision, decision])
+        decision -= decision.max(axis=1, keepdims=True)
+        np.exp(decision, out=decision)
+        decision /= decision.sum(axis=1, keepdims=True)
+        return decision
+
+    def predict_proba_one(self, values):
+        """Class probabilities for one row given as a list, in pure Python"""
+        decision = [
+            sum(w * x for w, x in zip(weights, values)) + b
+            for weights, b in zip(self._weight_rows, self._intercept_list)
+        ]
+        if self.ovr:
+            probs = [1.0 / (1.0 + math.exp(-d)) for d in decision]
+            if len(probs) == 1:
+                return [1.0 - probs[0], probs[0]]
+        else:
+            if len(decision) == 1:
+                decision = [-decision[0], decision[0]]
+            top = max(decision)
+            probs = [math.exp(d - top) for d in decision]
+        total = sum(probs)
+        return [p / total for p in probs]
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def risk_levels(biometric_scores):
+    """High / Medium / Low for an array of biometric scores"""
+    return np.where(biometric_scores < 40, 'High', np.where(biometric_scores < 70, 'Medium', 'Low'))
+
+
+def generate_quiz_data(n_rows=500, seed=42):
+    """Synthetic quiz submissions with correlated answers per farm"""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    base = rng.integers(5, 19, size=(n_rows, 1))
+    low = np.repeat([offset[0] for offset in CATEGORY_OFFSETS], 3)
+    high = np.repeat([offset[1] for offset in CATEGORY_OFFSETS], 3)
+    answers = np.clip(base + rng.integers(low, high + 1, size=(n_rows, len(QUESTIONS))), 0, 20)
+    biometric_scores = ((answers.sum(axis=1) / 300) * 100).astype(int)
+
+    df = pd.DataFrame(answers, columns=QUESTIONS)
+    df['biometric_score'] = biometric_scores
+    df['risk'] = risk_levels(biometric_scores)
+    return df
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def publish_artifacts(artifacts, artifact_dir=ARTIFACT_DIR, metrics=None):
+    """Write {file name: object} as a new run and make it the current one.
+
+    The run is dumped into a temporary directory that is renamed into place
+    once complete, then current.json is replaced in one rename, so readers
+    see either the old set or the new one, never a mix. The previous run is
+    kept for workers that read the old manifest a moment ago; older runs are
+    removed. Returns the run's directory name.
+    """
+    import joblib
+
+    os.makedirs(artifact_dir, exist_ok=True)
+    run = f"run-{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.urandom(3).hex()}"
+    staging = tempfile.mkdtemp(prefix=f'.{run}.', dir=artifact_dir)
+    try:
+        files = {}
+        for name, obj in artifacts.items():
+            buffer = io.BytesIO()
+            joblib.dump(obj, buffer)
+            with open(os.path.join(staging, name), 'wb') as f:
+                f.write(buffer.getvalue())
+            files[name] = _sha256(buffer.getvalue())
+        os.replace(staging, os.path.join(artifact_dir, run))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    manifest_path = os.path.join(artifact_dir, MANIFEST_NAME)
+    previous = read_manifest(artifact_dir)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{MANIFEST_NAME}.', dir=artifact_dir)
+    with os.fdopen(fd, 'w') as f:
+        json.dump({'run': run, 'created_at': datetime.now().isoformat(), 'files': files,
+                   'metrics': metrics or {}}, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    keep = {run, previous['run'] if previous else None}
+    for entry in os.listdir(artifact_dir):
+        if entry.startswith('run-') and entry not in keep:
+            shutil.rmtree(os.path.join(artifact_dir, entry), ignore_errors=True)
+    return run
+
+
+def read_manifest(artifact_dir=ARTIFACT_DIR):
+    """The current run's manifest, or None if nothing has been published"""
+    try:
+        with open(os.path.join(artifact_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def train(data_path=DATA_PATH, regenerate=False, artifact_dir=ARTIFACT_DIR):
+    """Train the quiz model and publish its three artifacts as a new run.
+
+    Nothing changes for readers until all three are written, so a failed run
+    leaves the previous artifacts in service.
+    """
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+
+    if regenerate or not os.path.exists(data_path):
+        tmp_path = data_path + '.tmp'
+        generate_quiz_data().to_csv(tmp_path, index=False)
+        os.replace(tmp_path, data_path)
+        print('✅ Enhanced dummy dataset created with biometric scores!')
+    df = pd.read_csv(data_path)
+
+    # Prepare features and target
+    X = df[QUESTIONS].to_numpy(dtype=np.float64)
+    y = df['risk'].to_numpy()
+    le = LabelEncoder().fit(y)
+
+    # Split data for training
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Scale features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    # Train logistic regression
+    model = LogisticRegression(max_iter=1000, random_state=42, C=1.0)
+    model.fit(X_train_scaled, y_train)
+
+    # Evaluate model
+    accuracy = accuracy_score(y_test, model.predict(X_test_scaled))
+    print(f'✅ Model trained with accuracy: {accuracy:.2f}')
+
+    run = publish_artifacts({MODEL_FILE: model, ENCODER_FILE: le, SCALER_FILE: scaler},
+                            artifact_dir, metrics={'accuracy': accuracy})
+    print(f'✅ Model, encoder, and scaler saved as {os.path.join(artifact_dir, run)}!')
+    return accuracy
+
+
+def load_artifacts(artifact_dir=ARTIFACT_DIR):
+    """Load the current run's artifacts; returns (model, label encoder, scaler).
+
+    Raises RuntimeError if nothing has been published, or if a file is
+    missing or differs from the one the manifest names (for instance a
+    scaler copied in from another run), so serving fails at startup instead
+    of training or mixing runs.
+    """
+    import joblib
+
+    manifest = read_manifest(artifact_dir)
+    if manifest is None:
+        raise RuntimeError(f'No quiz model artifacts in {artifact_dir}/. Build them with: python quiz_model.py')
+
+    loaded = {}
+    for name in (MODEL_FILE, ENCODER_FILE, SCALER_FILE):
+        path = os.path.join(artifact_dir, manifest['run'], name)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise RuntimeError(f'Missing quiz model artifact {path}. Rebuild them with: python quiz_model.py')
+        if _sha256(data) != manifest['files'].get(name):
+            raise RuntimeError(f'{path} is not the file published with run {manifest["run"]}. '
+                               'Rebuild the artifacts with: python quiz_model.py')
+        # Load the bytes that were checked, not the file again
+        loaded[name] = joblib.load(io.BytesIO(data))
+
+    model, le, scaler = loaded[MODEL_FILE], loaded[ENCODER_FILE], loaded[SCALER_FILE]
+    if list(le.classes_) != list(model.classes_) or len(scaler.scale_) != model.coef_.shape[1]:
+        raise RuntimeError('Quiz model artifacts do not match. Rebuild them with: python quiz_model.py')
+    return model, le, scaler
+
+
+if __name__ == '__main__':
+    train(regenerate='--regenerate' in sys.argv[1:])
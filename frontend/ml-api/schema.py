@@ -0,0 +1,143 @@
+import json
+import sys
+from scoring import SCORING_TABLE
+
+# Every assessment field, in request order. Categorical fields take their
+# allowed values from the scoring table so the two cannot drift apart.
+FIELD_SPEC = {
+    'farm_size_acres': {'type': 'number', 'minimum': 0,
+                        'description': 'Farm size in acres (positive number)'},
+    'fencing_quality': {'enum': SCORING_TABLE.levels['fencing_quality'],
+                        'description': 'Quality of farm fencing (excellent/good/fair/poor)'},
+    'biosecurity_gates': {'enum': SCORING_TABLE.levels['biosecurity_gates'],
+                          'description': 'Presence of biosecurity gates (yes/no)'},
+    'quarantine_facility': {'enum': SCORING_TABLE.levels['quarantine_facility'],
+                            'description': 'Presence of quarantine facility (yes/no)'},
+    'vehicle_wash_station': {'enum': SCORING_TABLE.levels['vehicle_wash_station'],
+                             'description': 'Presence of vehicle wash station (yes/no)'},
+    'livestock_count': {'type': 'integer', 'minimum': 0,
+                        'description': 'Number of livestock (positive integer)'},
+    'vaccination_protocol': {'enum': SCORING_TABLE.levels['vaccination_protocol'],
+                             'description': 'Vaccination protocol level (strict/moderate/basic/none)'},
+    'disease_monitoring': {'enum': SCORING_TABLE.levels['disease_monitoring'],
+                           'description': 'Disease monitoring frequency (daily/weekly/monthly/rarely)'},
+    'isolation_practices': {'enum': SCORING_TABLE.levels['isolation_practices'],
+                            'description': 'Isolation practices quality (excellent/good/fair/poor)'},
+    'disinfection_frequency': {'enum': SCORING_TABLE.levels['disinfection_frequency'],
+                               'description': 'Disinfection frequency (daily/weekly/monthly/rarely)'},
+    'personal_protective_equipment': {'enum': SCORING_TABLE.levels['personal_protective_equipment'],
+                                      'description': 'PPE level (full/partial/basic/none)'},
+    'visitor_control': {'enum': SCORING_TABLE.levels['visitor_control'],
+                        'description': 'Visitor control level (strict/moderate/basic/none)'},
+    'feed_storage_security': {'enum': SCORING_TABLE.levels['feed_storage_security'],
+                              'description': 'Feed storage security (excellent/good/fair/poor)'},
+    'water_source_protection': {'enum': SCORING_TABLE.levels['water_source_protection'],
+                                'description': 'Water source protection (excellent/good/fair/poor)'},
+    'rodent_control': {'enum': SCORING_TABLE.levels['rodent_control'],
+                       'description': 'Rodent control quality (excellent/good/fair/poor)'},
+    'insect_control': {'enum': SCORING_TABLE.levels['insect_control'],
+                       'description': 'Insect control quality (excellent/good/fair/poor)'},
+    'staff_training': {'enum': SCORING_TABLE.levels['staff_training'],
+                       'description': 'Staff training frequency (monthly/quarterly/biannual/annual)'},
+    'protocol_documentation': {'enum': SCORING_TABLE.levels['protocol_documentation'],
+                               'description': 'Protocol documentation level (comprehensive/moderate/basic/none)'},
+    'emergency_plan': {'enum': SCORING_TABLE.levels['emergency_plan'],
+                       'description': 'Presence of emergency plan (yes/no)'},
+    'veterinary_contact': {'enum': SCORING_TABLE.levels['veterinary_contact'],
+                           'description': 'Veterinary contact availability (yes/no)'},
+}
+
+NUMERIC_TYPES = {
+    'number': ((int, float), 'a positive number'),
+    'integer': (int, 'a positive integer'),
+}
+
+
+class AssessmentSchema:
+    """Field spec compiled once into per-field checks and error messages"""
+
+    def __init__(self, field_spec=FIELD_SPEC):
+        self.field_spec = field_spec
+        self.fields = list(field_spec)
+
+        # (field, allowed values or None, numeric types, minimum, error message)
+        self.checks = []
+        for field, spec in field_spec.items():
+            if 'enum' in spec:
+                values = list(spec['enum'])
+                if values == ['yes', 'no']:
+                    message = f'{field} must be "yes" or "no"'
+                else:
+                    message = f'{field} must be one of: {values}'
+                self.checks.append((field, frozenset(values), None, None, message))
+            else:
+                types, label = NUMERIC_TYPES[spec['type']]
+                self.checks.append((field, None, types, spec.get('minimum'),
+                                    f'{field} must be {label}'))
+
+    def validate(self, record):
+        """Validate one assessment record in a single pass over the fields.
+
+        Returns None for a valid record, otherwise (error message, details).
+        """
+        if not isinstance(record, dict):
+            return 'Each record must be a JSON object', None
+
+        missing_fields = []
+        validation_errors = []
+        for field, allowed, types, minimum, message in self.checks:
+            if field not in record:
+                missing_fields.append(field)
+                continue
+            value = record[field]
+            if allowed is not None:
+                try:
+                    valid = value in allowed
+                except TypeError:
+                    valid = False
+            else:
+                valid = isinstance(value, types) and (minimum is None or value >= minimum)
+            if not valid:
+                validation_errors.append(message)
+
+        if missing_fields:
+            return f'Missing required fields: {missing_fields}', None
+        if validation_errors:
+            return 'Validation errors', validation_errors
+        return None
+
+    def describe(self):
+        """JSON-serializable field spec for clients to prevalidate against"""
+        return {'required': self.fields, 'fields': self.field_spec}
+
+
+ASSESSMENT_SCHEMA = AssessmentSchema()
+
+
+def main(path):
+    """Validate a JSON array or NDJSON file of assessments"""
+    with open(path) as f:
+        text = f.read()
+    try:
+        records = json.loads(text)
+        if not isinstance(records, list):
+            records = [records]
+    except ValueError:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    invalid = 0
+    for index, record in enumerate(records):
+        result = ASSESSMENT_SCHEMA.validate(record)
+        if result:
+            invalid += 1
+            error, details = result
+            print(f"❌ Record {index}: {error}")
+            for detail in details or []:
+                print(f"   - {detail}")
+    print(f"✅ {len(records) - invalid}/{len(records)} records valid")
+    return invalid == 0
+
+
+if __name__ == '__main__':
+    # python schema.py assessments.json
+    sys.exit(0 if main(sys.argv[1]) else 1)
@@ -0,0 +1,210 @@
+import numpy as np
+
+MAX_SCORE = 100
+
+# Points awarded per field, grouped by category. Any value that is not listed
+# falls back to 'default', mirroring the trailing else-branch of the original
+# if/elif rules. Listed values scoring below 'recommend_below' trigger the
+# field's 'recommendation'.
+SCORING_RULES = [
+    # Farm Infrastructure (25 points)
+    {'category': 'infrastructure', 'field': 'fencing_quality',
+     'points': {'excellent': 8, 'good': 6, 'fair': 4, 'poor': 1}, 'default': 1,
+     'recommend_below': 6,
+     'recommendation': "Upgrade fencing quality to improve farm security"},
+    {'category': 'infrastructure', 'field': 'biosecurity_gates',
+     'points': {'yes': 5, 'no': 0}, 'default': 0,
+     'recommend_below': 5,
+     'recommendation': "Install biosecurity gates to control access"},
+    {'category': 'infrastructure', 'field': 'quarantine_facility',
+     'points': {'yes': 6, 'no': 0}, 'default': 0,
+     'recommend_below': 6,
+     'recommendation': "Establish a quarantine facility for new livestock"},
+    {'category': 'infrastructure', 'field': 'vehicle_wash_station',
+     'points': {'yes': 6, 'no': 0}, 'default': 0},
+
+    # Livestock Management (25 points)
+    {'category': 'livestock_management', 'field': 'vaccination_protocol',
+     'points': {'strict': 8, 'moderate': 6, 'basic': 4, 'none': 1}, 'default': 1,
+     'recommend_below': 6,
+     'recommendation': "Implement a comprehensive vaccination protocol"},
+    {'category': 'livestock_management', 'field': 'disease_monitoring',
+     'points': {'daily': 8, 'weekly': 6, 'monthly': 4, 'rarely': 1}, 'default': 1,
+     'recommend_below': 6,
+     'recommendation': "Increase disease monitoring frequency to at least weekly"},
+    {'category': 'livestock_management', 'field': 'isolation_practices',
+     'points': {'excellent': 9, 'good': 7, 'fair': 4, 'poor': 1}, 'default': 1},
+
+    # Hygiene Practices (20 points)
+    {'category': 'hygiene_practices', 'field': 'disinfection_frequency',
+     'points': {'daily': 7, 'weekly': 5, 'monthly': 3, 'rarely': 1}, 'default': 1,
+     'recommend_below': 5,
+     'recommendation': "Increase disinfection frequency to at least weekly"},
+    {'category': 'hygiene_practices', 'field': 'personal_protective_equipment',
+     'points': {'full': 7, 'partial': 5, 'basic': 3, 'none': 1}, 'default': 1,
+     'recommend_below': 5,
+     'recommendation': "Provide full personal protective equipment for staff"},
+    {'category': 'hygiene_practices', 'field': 'visitor_control',
+     'points': {'strict': 6, 'moderate': 4, 'basic': 2, 'none': 0}, 'default': 0},
+
+    # Feed and Water (15 points)
+    {'category': 'feed_water', 'field': 'feed_storage_security',
+     'points': {'excellent': 8, 'good': 6, 'fair': 4, 'poor': 1}, 'default': 1},
+    {'category': 'feed_water', 'field': 'water_source_protection',
+     'points': {'excellent': 7, 'good': 5, 'fair': 3, 'poor': 1}, 'default': 1},
+
+    # Pest Control (10 points)
+    {'category': 'pest_control', 'field': 'rodent_control',
+     'points': {'excellent': 5, 'good': 4, 'fair': 2, 'poor': 0}, 'default': 0},
+    {'category': 'pest_control', 'field': 'insect_control',
+     'points': {'excellent': 5, 'good': 4, 'fair': 2, 'poor': 0}, 'default': 0},
+
+    # Training and Documentation (5 points)
+    {'category': 'training_documentation', 'field': 'staff_training',
+     'points': {'monthly': 3, 'quarterly': 2, 'biannual': 1, 'annual': 0}, 'default': 0},
+    {'category': 'training_documentation', 'field': 'protocol_documentation',
+     'points': {'comprehensive': 2, 'moderate': 1, 'basic': 0, 'none': 0}, 'default': 0},
+
+    # Emergency Response (5 points)
+    {'category': 'emergency_response', 'field': 'emergency_plan',
+     'points': {'yes': 3, 'no': 0}, 'default': 0},
+    {'category': 'emergency_response', 'field': 'veterinary_contact',
+     'points': {'yes': 2, 'no': 0}, 'default': 0},
+]
+
+CATEGORY_MAX_SCORES = {
+    'infrastructure': 25,
+    'livestock_management': 25,
+    'hygiene_practices': 20,
+    'feed_water': 15,
+    'pest_control': 10,
+    'training_documentation': 5,
+    'emergency_response': 5,
+}
+
+# Categories of the API's category_scores breakdown. Emergency response
+# points count towards the total, but the original API never reported them
+# as a category, so the response keeps its original keys.
+REPORTED_CATEGORIES = [category for category in CATEGORY_MAX_SCORES if category != 'emergency_response']
+
+# Risk bands, highest first: (minimum score, risk level, color, recommendation)
+RISK_LEVELS = [
+    (80, "Low Risk", "green",
+     "Maintain current standards and consider advanced biosecurity measures"),
+    (60, "Moderate Risk", "yellow",
+     "Moderate improvements: Address remaining gaps systematically"),
+    (40, "High Risk", "orange",
+     "Significant improvements needed: Focus on high-impact areas first"),
+    (None, "Critical Risk", "red",
+     "Immediate action required: Review and implement all biosecurity protocols"),
+]
+
+
+class ScoringTable:
+    """Points table compiled into per-field lookup arrays"""
+
+    def __init__(self, rules=SCORING_RULES, category_max_scores=CATEGORY_MAX_SCORES,
+                 max_score=MAX_SCORE, risk_levels=RISK_LEVELS, reported_categories=REPORTED_CATEGORIES):
+        self.rules = rules
+        self.category_max_scores = category_max_scores
+        self.max_score = max_score
+        self.risk_levels = risk_levels
+        self.categories = list(category_max_scores)
+        self.reported_categories = list(reported_categories)
+        self.fields = [rule['field'] for rule in rules]
+        self.levels = {rule['field']: list(rule['points']) for rule in rules}
+
+        # One array per field: points for each level code, with the default
+        # stored last so that the -1 code of unknown values gathers it.
+        self.points = {
+            rule['field']: np.array(list(rule['points'].values()) + [rule['default']],
+                                    dtype=np.int64)
+            for rule in rules
+        }
+        self.fields_by_category = {category: [] for category in self.categories}
+        for rule in rules:
+            self.fields_by_category[rule['category']].append(rule['field'])
+
+        # Flat (field, category, value->points, default) tuples for scoring a
+        # single record in one pass over the fields.
+        self.record_rules = [
+            (rule['field'], rule['category'], dict(rule['points']), rule['default'])
+            for rule in rules
+        ]
+
+        # Values that trigger each field recommendation, derived from the
+        # points thresholds.
+        self.recommendation_rules = [
+            (rule['field'],
+             frozenset(value for value, points in rule['points'].items()
+                       if points < rule['recommend_below']),
+             rule['recommendation'])
+            for rule in rules if 'recommendation' in rule
+        ]
+
+    def encode(self, values, field):
+        """Map a column of raw values to level codes (-1 for unknown values)"""
+        import pandas as pd
+        return pd.Categorical(values, categories=self.levels[field]).codes
+
+    def score_record(self, record):
+        """Score a single assessment.
+
+        Returns (total score, capped scores of the reported categories) from
+        the same lookup pass, so the total and the breakdown always agree.
+        """
+        raw_scores = dict.fromkeys(self.categories, 0)
+        for field, category, points, default in self.record_rules:
+            raw_scores[category] += points.get(record[field], default)
+
+        total = min(sum(raw_scores.values()), self.max_score)
+        category_scores = {
+            category: min(raw_scores[category], self.category_max_scores[category])
+            for category in self.reported_categories
+        }
+        return total, category_scores
+
+    def get_risk_level(self, score):
+        """Get (risk level, color) for a score"""
+        band = self._risk_band(score)
+        return band[1], band[2]
+
+    def get_recommendations(self, input_data, score):
+        """Field recommendations followed by the recommendation for the score's risk band"""
+        recommendations = [
+            message for field, values, message in self.recommendation_rules
+            if input_data.get(field) in values
+        ]
+        recommendations.append(self._risk_band(score)[3])
+        return recommendations
+
+    def _risk_band(self, score):
+        for band in self.risk_levels:
+            if band[0] is None or score >= band[0]:
+                return band
+        return self.risk_levels[-1]
+
+    def score_frame(self, df):
+        """Score every row of a DataFrame at once.
+
+        Returns a DataFrame with one capped subtotal column per category plus
+        'biosecurity_score', aligned to df.index.
+        """
+        import pandas as pd
+
+        n_rows = len(df)
+        total = np.zeros(n_rows, dtype=np.int64)
+        subtotals = {}
+
+        for category in self.categories:
+            category_score = np.zeros(n_rows, dtype=np.int64)
+            for field in self.fields_by_category[category]:
+                category_score += self.points[field][self.encode(df[field], field)]
+            total += category_score
+            subtotals[category] = np.minimum(category_score, self.category_max_scores[category])
+
+        subtotals['biosecurity_score'] = np.minimum(total, self.max_score)
+        return pd.DataFrame(subtotals, index=df.index)
+
+
+SCORING_TABLE = ScoringTable()
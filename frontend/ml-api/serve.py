@@ -0,0 +1,149 @@
+"""Production server for the ML APIs.
+
+    python serve.py biosecurity --workers 4 --threads 8
+    python serve.py quiz --port 8000
+    python serve.py biosecurity --asgi --threads 16
+
+The default mode is a pre-fork gunicorn server. The app and its model are
+loaded once in the master before workers are forked, so workers share the
+model pages copy-on-write. --asgi runs a single uvicorn process instead, with
+each request handed to a thread pool so the event loop never blocks on
+inference.
+
+Metrics: every pre-fork worker counts its own requests, and a scrape of
+/metrics reaches just one of them. Before the app is imported, pre-fork mode
+points prometheus_client at a multiprocess directory: PROMETHEUS_MULTIPROC_DIR
+if set (its old files are removed, since the directory must start empty), else
+a temporary one removed on exit. Workers write their values there, any worker
+answering /metrics reports the sum over all of them, and the in-flight gauge
+drops workers as gunicorn reaps them. Use a directory on local disk (ideally
+tmpfs) that no other server writes to.
+"""
+import argparse
+import atexit
+import glob
+import importlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+# name -> (module, default port)
+APPS = {
+    'biosecurity': ('biosecurity_api', 5001),
+    'quiz': ('app', 8000),
+}
+
+
+def load_app(name):
+    """Import an API module and load its model"""
+    module_name, _ = APPS[name]
+    module = importlib.import_module(module_name)
+    if hasattr(module, 'load_model'):
+        module.load_model()
+    return module.app
+
+
+def prepare_multiprocess_metrics():
+    """Give prometheus_client an empty PROMETHEUS_MULTIPROC_DIR; call before importing the app"""
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for stale in glob.glob(os.path.join(path, '*.db')):
+            os.remove(stale)
+    else:
+        path = tempfile.mkdtemp(prefix='ml-api-metrics-')
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = path
+        master_pid = os.getpid()
+
+        def remove():
+            # Workers run atexit hooks too; only the master removes the directory
+            if os.getpid() == master_pid:
+                shutil.rmtree(path, ignore_errors=True)
+        atexit.register(remove)
+    return path
+
+
+def mark_worker_dead(server, worker):
+    """gunicorn child_exit hook: stop counting the worker's live gauges"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def serve_prefork(app, host, port, workers, threads, timeout, graceful_timeout):
+    """Serve a loaded WSGI app with gunicorn workers forked after loading.
+
+    Call prepare_multiprocess_metrics() before loading the app.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit("Pre-fork serving requires gunicorn (Linux/macOS): pip install gunicorn")
+
+    class PreforkServer(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    PreforkServer(app, {
+        'bind': f'{host}:{port}',
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,
+        'timeout': timeout,
+        'graceful_timeout': graceful_timeout,
+        'child_exit': mark_worker_dead,
+    }).run()
+
+
+def serve_asgi(name, host, port, threads, graceful_timeout):
+    """Serve an app from one asyncio process, running requests on a thread pool"""
+    # asgiref sizes its executor from ASGI_THREADS when it is first used
+    os.environ.setdefault('ASGI_THREADS', str(threads))
+    try:
+        import uvicorn
+        from asgiref.wsgi import WsgiToAsgi
+    except ImportError:
+        raise SystemExit("ASGI serving requires uvicorn and asgiref: pip install uvicorn asgiref")
+
+    uvicorn.run(WsgiToAsgi(load_app(name)), host=host, port=port,
+                timeout_graceful_shutdown=graceful_timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an ML API in production mode")
+    parser.add_argument('app', choices=sorted(APPS))
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help="worker processes (pre-fork mode)")
+    parser.add_argument('--threads', type=int, default=4,
+                        help="threads per worker, or thread pool size with --asgi")
+    parser.add_argument('--timeout', type=int, default=30,
+                        help="seconds before a silent worker is restarted")
+    parser.add_argument('--graceful-timeout', type=int, default=30,
+                        help="seconds to finish in-flight requests on shutdown")
+    parser.add_argument('--asgi', action='store_true',
+                        help="single asyncio process with inference offloaded to threads")
+    args = parser.parse_args()
+    port = args.port or APPS[args.app][1]
+
+    if args.asgi:
+        serve_asgi(args.app, args.host, port, args.threads, args.graceful_timeout)
+    else:
+        prepare_multiprocess_metrics()
+        serve_prefork(load_app(args.app), args.host, port, args.workers, args.threads,
+                      args.timeout, args.graceful_timeout)
+
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,12 @@ Write-Host "🔧 Activating virtual environment..." -ForegroundColor Yellow
 Write-Host "📚 Installing dependencies..." -ForegroundColor Yellow
 pip install -r requirements.txt
 
+# Build the quiz model artifacts; the API only loads them
+if (-not (Test-Path "quiz_artifacts/current.json")) {
+    Write-Host "🤖 Training quiz model..." -ForegroundColor Yellow
+    python quiz_model.py
+}
+
 # Start the API
 Write-Host "🌐 Starting ML API on http://127.0.0.1:8000" -ForegroundColor Green
 Write-Host "Press Ctrl+C to stop the server" -ForegroundColor Yellow
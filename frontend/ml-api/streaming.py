@@ -0,0 +1,95 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from scoring import SCORING_TABLE
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def iter_assessment_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrame chunks of assessments from a CSV or Parquet file.
+
+    A directory is read as its CSV/Parquet shards in name order, e.g. the
+    output of synthetic_data.py.
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if os.path.splitext(name)[1].lower() in ('.csv', '.parquet', '.pq'):
+                yield from iter_assessment_chunks(os.path.join(path, name), chunksize)
+        return
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet files requires pyarrow: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def iter_encoded_chunks(path, feature_names, category_codes, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield (X, y) float arrays for each chunk, encoded with fitted category codes.
+
+    Chunks without a 'biosecurity_score' column are labelled with the
+    scoring table. Unknown categorical values raise ValueError.
+    """
+    for chunk in iter_assessment_chunks(path, chunksize):
+        if 'biosecurity_score' in chunk.columns:
+            y = chunk['biosecurity_score'].to_numpy(dtype=np.float64)
+        else:
+            y = SCORING_TABLE.score_frame(chunk)['biosecurity_score'].to_numpy(dtype=np.float64)
+
+        X = np.empty((len(chunk), len(feature_names)), dtype=np.float64)
+        for i, name in enumerate(feature_names):
+            codes = category_codes.get(name)
+            if codes is None:
+                X[:, i] = chunk[name].to_numpy(dtype=np.float64)
+                continue
+            encoded = chunk[name].map(codes)
+            if encoded.isna().any():
+                unknown = chunk[name][encoded.isna()].unique().tolist()
+                raise ValueError(f"y contains previously unseen labels: {unknown}")
+            X[:, i] = encoded.to_numpy(dtype=np.float64)
+        yield X, y
+
+
+def stream_fit(model, scaler, chunks, epochs=3):
+    """Fit scaler and model with partial_fit over a re-iterable chunk source.
+
+    chunks is a callable returning a fresh (X, y) iterator. The first pass
+    only collects scaler statistics; the last training epoch also scores
+    every chunk before learning from it (progressive validation).
+
+    Returns a dict with rows, epochs, rows_per_sec and progressive R2 and
+    MAE.
+    """
+    for X, _ in chunks():
+        scaler.partial_fit(X)
+
+    rows = 0
+    start = time.perf_counter()
+    n = sum_y = sum_y2 = sse = sae = 0.0
+    for epoch in range(epochs):
+        for X, y in chunks():
+            X_scaled = scaler.transform(X)
+            if epoch == epochs - 1 and rows:
+                residual = y - model.predict(X_scaled)
+                sse += residual @ residual
+                sae += np.abs(residual).sum()
+                n += len(y)
+                sum_y += y.sum()
+                sum_y2 += y @ y
+            model.partial_fit(X_scaled, y)
+            rows += len(y)
+    elapsed = time.perf_counter() - start
+
+    total_ss = sum_y2 - sum_y * sum_y / n if n else 0.0
+    return {
+        'rows': rows // epochs,
+        'epochs': epochs,
+        'rows_per_sec': rows / elapsed if elapsed else float('inf'),
+        'progressive_R2': 1 - sse / total_ss if total_ss else float('nan'),
+        'progressive_MAE': sae / n if n else float('nan')
+    }
@@ -0,0 +1,139 @@
+"""Synthetic biosecurity assessments, generated in independent shards.
+
+    python synthetic_data.py data/ 100000000                  # 10^8 rows as Parquet shards
+    python synthetic_data.py data/ 1000000 --format csv --shard-rows 250000
+
+Every shard draws from its own numpy Generator, seeded from
+SeedSequence(seed).spawn(), so a shard's rows depend only on the seed and
+its index: any number of processes produces the same files.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from schema import ASSESSMENT_SCHEMA
+from scoring import SCORING_TABLE
+
+DEFAULT_SEED = 42
+DEFAULT_SHARD_ROWS = 1_000_000
+FORMATS = ('parquet', 'csv')
+
+# Numeric fields: rng, n -> values. Categorical fields are drawn uniformly
+# from their schema levels.
+NUMERIC_GENERATORS = {
+    'farm_size_acres': lambda rng, n: rng.uniform(1, 500, n),
+    'livestock_count': lambda rng, n: rng.integers(10, 1000, n, dtype=np.int32),
+}
+
+
+def generate_assessments(n_rows, rng, labels=False):
+    """DataFrame of n_rows random assessments in request field order.
+
+    Categorical fields come out as pandas categoricals backed by small
+    integer codes, never as Python strings. labels adds the
+    'biosecurity_score' column from the scoring table.
+    """
+    import pandas as pd
+
+    columns = {}
+    for field, spec in ASSESSMENT_SCHEMA.field_spec.items():
+        if 'enum' in spec:
+            levels = spec['enum']
+            codes = rng.integers(0, len(levels), n_rows, dtype=np.int8)
+            columns[field] = pd.Categorical.from_codes(codes, categories=levels)
+        else:
+            columns[field] = NUMERIC_GENERATORS[field](rng, n_rows)
+    df = pd.DataFrame(columns)
+    if labels:
+        df['biosecurity_score'] = SCORING_TABLE.score_frame(df)['biosecurity_score'].astype(np.uint8)
+    return df
+
+
+def generate_records(n_rows, rng):
+    """n_rows random assessments as request dicts, drawn like generate_assessments.
+
+    Needs no pandas, so the API can build in-distribution canary inputs
+    without importing it.
+    """
+    columns = {}
+    for field, spec in ASSESSMENT_SCHEMA.field_spec.items():
+        if 'enum' in spec:
+            levels = spec['enum']
+            columns[field] = [levels[code] for code in rng.integers(0, len(levels), n_rows)]
+        else:
+            columns[field] = NUMERIC_GENERATORS[field](rng, n_rows).tolist()
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def shard_sizes(n_rows, shard_rows=DEFAULT_SHARD_ROWS):
+    """Row counts of the shards covering n_rows"""
+    full, rest = divmod(n_rows, shard_rows)
+    return [shard_rows] * full + ([rest] if rest else [])
+
+
+def shard_path(directory, index, file_format):
+    return os.path.join(directory, f'part-{index:05d}.{file_format}')
+
+
+def write_shard(directory, index, n_rows, seed_sequence, file_format='parquet', labels=True):
+    """Generate and write one shard; returns its path"""
+    df = generate_assessments(n_rows, np.random.default_rng(seed_sequence), labels=labels)
+    path = shard_path(directory, index, file_format)
+    tmp_path = path + '.tmp'
+    if file_format == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_shards(directory, n_rows, shard_rows=DEFAULT_SHARD_ROWS, file_format='parquet',
+                 seed=DEFAULT_SEED, processes=None, labels=True):
+    """Write n_rows assessments to directory as shards, in parallel.
+
+    Shards are written to a temporary name and renamed, so a finished file
+    is always complete. Returns the shard paths in order.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"file_format must be one of {list(FORMATS)}")
+    if file_format == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Writing Parquet files requires pyarrow: pip install pyarrow")
+
+    os.makedirs(directory, exist_ok=True)
+    sizes = shard_sizes(n_rows, shard_rows)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(write_shard, directory, index, size, seed_sequence, file_format, labels)
+            for index, (size, seed_sequence) in enumerate(zip(sizes, seeds))
+        ]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic assessments as sharded files")
+    parser.add_argument('directory')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('--format', choices=FORMATS, default='parquet')
+    parser.add_argument('--shard-rows', type=int, default=DEFAULT_SHARD_ROWS)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--processes', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--no-labels', action='store_true',
+                        help="omit the biosecurity_score column")
+    args = parser.parse_args()
+
+    print(f"📊 Writing {args.rows} assessments to {args.directory}...")
+    start = time.perf_counter()
+    paths = write_shards(args.directory, args.rows, args.shard_rows, args.format,
+                         args.seed, args.processes, not args.no_labels)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {len(paths)} shards in {elapsed:.1f}s ({args.rows / elapsed:.0f} rows/sec)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import os
+import sys
+
+import pytest
+
+# The API modules live one directory up and read their configuration from the
+# environment at import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('MODEL_RELOAD_INTERVAL', '0')
+
+
+@pytest.fixture(scope='session')
+def training_data():
+    """(model, X, y): 800 synthetic assessments prepared the way main() prepares them"""
+    from biosecurity_model import BiosecurityMLModel
+    model = BiosecurityMLModel()
+    df = model.generate_synthetic_data(n_samples=800)
+    df['biosecurity_score'] = model.calculate_biosecurity_scores(df)
+    processed = model.prepare_features(df)
+    return model, processed.drop(columns='biosecurity_score'), processed['biosecurity_score']
+
+
+@pytest.fixture(scope='session')
+def trained_model(training_data):
+    """A small Random Forest standing in for a trained model"""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+    model, X, y = training_data
+    model.scalers['standard'] = StandardScaler().fit(X)
+    model.best_model = RandomForestRegressor(n_estimators=20, random_state=0).fit(X, y)
+    model.best_model_name = 'Random Forest'
+    model.compile_inference()
+    return model
+
+
+@pytest.fixture(scope='session')
+def fit_candidate(training_data):
+    """fit_candidate(name, estimator): a BiosecurityMLModel serving estimator fitted on training_data"""
+    from sklearn.preprocessing import StandardScaler
+    from biosecurity_model import SCALED_MODELS, BiosecurityMLModel
+    base, X, y = training_data
+
+    def fit(name, estimator):
+        model = BiosecurityMLModel()
+        model.label_encoders = base.label_encoders
+        model.feature_names = list(X.columns)
+        scaler = StandardScaler().fit(X)
+        model.scalers = {'standard': scaler}
+        model.best_model = estimator.fit(scaler.transform(X) if name in SCALED_MODELS else X, y)
+        model.best_model_name = name
+        model.compile_inference()
+        return model
+    return fit
+
+
+@pytest.fixture(scope='session')
+def api(tmp_path_factory, trained_model):
+    """biosecurity_api serving trained_model, with its registry and analysis store in a temp dir"""
+    root = tmp_path_factory.mktemp('api')
+    os.environ['MODEL_REGISTRY_DIR'] = str(root / 'model_registry')
+    os.environ['ANALYSIS_STORE'] = str(root / 'analysis_results.sqlite3')
+    import biosecurity_api
+    biosecurity_api.activate_model(trained_model)
+    return biosecurity_api
+
+
+@pytest.fixture
+def client(api):
+    return api.app.test_client()
+
+
+@pytest.fixture(scope='session')
+def quiz_api(tmp_path_factory):
+    """app (the quiz API) serving a model trained into a temp dir"""
+    import quiz_model
+    cwd = os.getcwd()
+    # Training and app.py both use paths relative to the working directory
+    os.chdir(tmp_path_factory.mktemp('quiz'))
+    try:
+        quiz_model.train()
+        import app
+    finally:
+        os.chdir(cwd)
+    return app
+
+
+@pytest.fixture
+def quiz_client(quiz_api):
+    return quiz_api.app.test_client()
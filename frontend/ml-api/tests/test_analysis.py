@@ -0,0 +1,131 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import analysis
+from analysis import AnalysisPipeline, AnalysisStore
+from synthetic_data import generate_records
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake wall clock for the analysis module; advance it with clock.now += seconds"""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(analysis, 'time', SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def wait_until_stored(pipeline, request_id):
+    deadline = time.monotonic() + 10
+    while request_id in pipeline._unstored:
+        assert time.monotonic() < deadline, 'analysis was never stored'
+        time.sleep(0.001)
+
+
+def test_results_expire_after_ttl(tmp_path, clock):
+    store = AnalysisStore(str(tmp_path / 'results.sqlite3'), ttl=60)
+    store.add('a', 'complete', {'score': 1})
+
+    clock.now += 59.9
+    assert store.get('a') == ('complete', {'score': 1})
+    clock.now += 0.1
+    assert store.get('a') is None
+
+
+def test_prune_runs_on_its_interval(tmp_path, clock):
+    store = AnalysisStore(str(tmp_path / 'results.sqlite3'), ttl=100, max_results=3, prune_interval=60)
+    count = lambda: store._connection().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+    for i in range(5):
+        store.add(str(i), 'complete')
+    # The first write pruned an empty table; the rest wait for the interval
+    assert count() == 5
+
+    clock.now += 60
+    store.add('5', 'complete')
+    assert count() == 3
+    assert [store.get(str(i)) is not None for i in range(6)] == [False] * 3 + [True] * 3
+
+    clock.now += 100
+    store.prune()
+    assert count() == 0
+
+
+def test_expires_at_is_indexed(tmp_path):
+    store = AnalysisStore(str(tmp_path / 'results.sqlite3'))
+    plan = store._connection().execute('EXPLAIN QUERY PLAN DELETE FROM results WHERE expires_at <= 0').fetchall()
+    assert 'results_expires_at' in str(plan)
+
+
+def test_pipeline_stores_results_off_the_request_thread(tmp_path):
+    pipeline = AnalysisPipeline(AnalysisStore(str(tmp_path / 'results.sqlite3')), max_workers=1)
+    calls = []
+    pipeline.store.add = lambda *args: calls.append(args)
+    started = SimpleNamespace(release=False)
+
+    def job():
+        while not started.release:
+            time.sleep(0.001)
+        return {'score': 1}
+
+    request_id, future = pipeline.submit(job)
+    assert pipeline.lookup(request_id) == ('pending', None)
+    assert calls == []
+
+    started.release = True
+    assert future.result(timeout=10) == {'score': 1}
+    wait_until_stored(pipeline, request_id)
+    assert calls == [(request_id, 'complete', {'score': 1})]
+
+
+def test_pipeline_results_and_errors_can_be_looked_up(tmp_path):
+    pipeline = AnalysisPipeline(AnalysisStore(str(tmp_path / 'results.sqlite3')))
+    done, _ = pipeline.completed({'score': 2})
+    # Served from the process's own futures until the pool has stored it
+    assert pipeline.lookup(done) == ('complete', {'score': 2})
+
+    def fail():
+        raise KeyError('fencing_quality')
+
+    failed, _ = pipeline.submit(fail)
+    for request_id in (done, failed):
+        wait_until_stored(pipeline, request_id)
+    assert pipeline.lookup(done) == ('complete', {'score': 2})
+    assert pipeline.lookup(failed) == ('error', {'error': "'fencing_quality'", 'error_type': 'KeyError'})
+    assert pipeline.lookup('unknown') is None
+
+
+def test_async_predict_serves_the_analysis(api, client):
+    api.prediction_cache.clear()
+    record = generate_records(1, np.random.default_rng(11))[0]
+
+    body = client.post('/predict?analysis=async', json=record).get_json()
+    request_id = body['analysis']['request_id']
+    wait_until_stored(api.analysis_pipeline, request_id)
+    fetched = client.get(f'/predict/analysis/{request_id}').get_json()
+
+    inline = client.post('/predict?analysis=inline', json=record).get_json()
+    assert body['prediction'] == inline['prediction']
+    assert fetched['category_scores'] == inline['category_scores']
+    assert fetched['recommendations'] == inline['recommendations']
+    assert client.get('/predict/analysis/unknown').status_code == 404
+
+
+def test_async_predict_is_no_slower_than_inline(api, client):
+    """The request path of an async /predict must not cost more than computing the analysis inline"""
+    api.prediction_cache.clear()
+    records = generate_records(400, np.random.default_rng(12))
+    timings = {'inline': [], 'async': []}
+    # Interleaved so drift in machine load hits both modes alike; the pool
+    # finishes each job before the next request so only the request path
+    # is timed
+    for i, record in enumerate(records):
+        mode = ('inline', 'async')[i % 2]
+        start = time.perf_counter()
+        body = client.post(f'/predict?analysis={mode}', json=record).get_json()
+        timings[mode].append(time.perf_counter() - start)
+        if mode == 'async':
+            wait_until_stored(api.analysis_pipeline, body['analysis']['request_id'])
+
+    assert np.median(timings['async']) <= 1.15 * np.median(timings['inline'])
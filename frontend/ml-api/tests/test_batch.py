@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pytest
+
+from biosecurity_model import COMPILED_MAX_ROWS
+from synthetic_data import generate_records
+
+PREDICTION_FIELDS = ('prediction', 'category_scores', 'recommendations')
+
+
+def single_predictions(client, records, query=''):
+    predictions = []
+    for record in records:
+        body = client.post(f'/predict{query}', json=record).get_json()
+        assert body['status'] == 'success'
+        predictions.append({field: body[field] for field in PREDICTION_FIELDS})
+    return predictions
+
+
+def batch_predictions(body):
+    assert body['status'] == 'success'
+    assert [result['index'] for result in body['results']] == list(range(body['count']))
+    return [{field: result[field] for field in PREDICTION_FIELDS} for result in body['results']]
+
+
+# Small batches go through the compiled forest, larger ones through sklearn
+@pytest.mark.parametrize('n_records', [1, COMPILED_MAX_ROWS, COMPILED_MAX_ROWS + 36])
+def test_batch_matches_per_record_predict(api, client, n_records):
+    records = generate_records(n_records, np.random.default_rng(n_records))
+
+    api.prediction_cache.clear()
+    batch = client.post('/predict/batch', json=records).get_json()
+    api.prediction_cache.clear()
+    single = single_predictions(client, records)
+
+    assert (batch['count'], batch['succeeded'], batch['failed']) == (n_records, n_records, 0)
+    assert batch_predictions(batch) == single
+
+
+def test_ndjson_batch_matches_json_array(api, client):
+    records = generate_records(20, np.random.default_rng(7))
+    ndjson = '\n'.join(json.dumps(record) for record in records) + '\n'
+
+    api.prediction_cache.clear()
+    from_array = client.post('/predict/batch', json=records).get_json()
+    api.prediction_cache.clear()
+    from_ndjson = client.post('/predict/batch', data=ndjson,
+                              content_type='application/x-ndjson').get_json()
+
+    assert batch_predictions(from_ndjson) == batch_predictions(from_array)
+
+
+def test_batch_mixes_cached_and_uncached_records(api, client):
+    records = generate_records(30, np.random.default_rng(8))
+    api.prediction_cache.clear()
+    single = single_predictions(client, records[::2])
+
+    batch = client.post('/predict/batch', json=records).get_json()
+
+    assert batch_predictions(batch)[::2] == single
+    assert batch_predictions(batch)[1::2] == single_predictions(client, records[1::2])
+
+
+def test_rules_mode_batch_matches_per_record_predict(client):
+    records = generate_records(40, np.random.default_rng(9))
+
+    batch = client.post('/predict/batch?mode=rules', json=records).get_json()
+
+    assert batch_predictions(batch) == single_predictions(client, records, query='?mode=rules')
+
+
+def test_ndjson_parse_errors_are_reported_in_place(client):
+    record = generate_records(1, np.random.default_rng(10))[0]
+    ndjson = f'{json.dumps(record)}\n{{not json\n{json.dumps(record)}\n'
+
+    body = client.post('/predict/batch', data=ndjson, content_type='application/x-ndjson').get_json()
+
+    assert (body['count'], body['succeeded'], body['failed']) == (3, 2, 1)
+    assert body['results'][1]['status'] == 'error'
+    assert body['results'][1]['error'].startswith('Invalid JSON')
+    single = single_predictions(client, [record])[0]
+    for index in (0, 2):
+        assert {field: body['results'][index][field] for field in PREDICTION_FIELDS} == single
+
+
+@pytest.mark.parametrize('body', ['[{"farm_size": ', '{}', ''])
+def test_malformed_json_array_is_a_json_error(client, body):
+    response = client.post('/predict/batch', data=body, content_type='application/json')
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Expected a JSON array of records', 'status': 'error'}
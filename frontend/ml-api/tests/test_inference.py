@@ -0,0 +1,75 @@
+import time
+
+import joblib
+import numpy as np
+import pytest
+
+from biosecurity_model import COMPILED_MAX_ROWS
+from synthetic_data import generate_records
+
+
+def estimator(name):
+    from sklearn.linear_model import LinearRegression, Ridge, SGDRegressor
+    from sklearn.neural_network import MLPRegressor
+    return {
+        'Linear Regression': LinearRegression(),
+        'Ridge Regression': Ridge(alpha=1.0),
+        'SGD Regression': SGDRegressor(random_state=0),
+        'Neural Network': MLPRegressor(hidden_layer_sizes=(32, 16), max_iter=200, random_state=0),
+    }[name]
+
+
+def latencies(fn, arg, repeat=2000):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings)
+
+
+@pytest.mark.filterwarnings('ignore::sklearn.exceptions.ConvergenceWarning')
+@pytest.mark.parametrize('name', ['Linear Regression', 'Ridge Regression', 'SGD Regression', 'Neural Network'])
+def test_coefficient_models_match_sklearn_exactly(fit_candidate, name):
+    model = fit_candidate(name, estimator(name))
+    records = generate_records(COMPILED_MAX_ROWS * 3, np.random.default_rng(1))
+
+    assert type(model.predictor).__name__ == 'MappedModel'
+    for batch in (records[:1], records[:COMPILED_MAX_ROWS], records):
+        X = model.encode(batch)
+        expected = np.clip(model.best_model.predict(X), 0, 100)
+        np.testing.assert_array_equal(model.predict_encoded(X), expected)
+    for record in records[:20]:
+        assert model.predict_score(record) == np.clip(model.best_model.predict(model.encode([record])), 0, 100)[0]
+
+
+def test_compiling_leaves_the_fitted_estimator_alone(fit_candidate, tmp_path):
+    model = fit_candidate('Ridge Regression', estimator('Ridge Regression'))
+
+    assert list(model.best_model.feature_names_in_) == model.feature_names
+    model.save_model(str(tmp_path / 'model.pkl'))
+    saved = joblib.load(tmp_path / 'model.pkl')['best_model']
+    assert list(saved.feature_names_in_) == model.feature_names
+
+
+def test_compiling_rejects_columns_out_of_order(fit_candidate):
+    model = fit_candidate('Ridge Regression', estimator('Ridge Regression'))
+    model.feature_names = model.feature_names[::-1]
+    with pytest.raises(ValueError, match='different order'):
+        model.compile_inference()
+
+
+def test_single_row_latency(fit_candidate):
+    """predict_score on one record stays in the tens of microseconds; the coefficient predictor beats sklearn's predict"""
+    model = fit_candidate('Ridge Regression', estimator('Ridge Regression'))
+    record = generate_records(1, np.random.default_rng(2))[0]
+    X = model.encode([record]).copy()
+    latencies(model.predict_score, record, repeat=200)
+
+    compiled = latencies(model.predict_score, record)
+    mapped = latencies(model.predictor.predict, X)
+    sklearn = latencies(model.best_model.predict, X)
+
+    assert np.median(compiled) < 50e-6
+    assert np.percentile(compiled, 99) < 200e-6
+    assert np.median(mapped) < np.median(sklearn) / 4
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from metrics import LATENCY_BUCKETS
+from synthetic_data import generate_records
+
+
+def scrape(client):
+    """{(sample name, sorted label items): value} of a /metrics scrape"""
+    from prometheus_client.parser import text_string_to_metric_families
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    return {(sample.name, tuple(sorted(sample.labels.items()))): sample.value
+            for family in text_string_to_metric_families(response.get_data(as_text=True))
+            for sample in family.samples}
+
+
+def value(samples, name, **labels):
+    return samples.get((name, tuple(sorted(labels.items()))), 0.0)
+
+
+def test_predictions_are_counted_and_timed(client):
+    record = generate_records(1, np.random.default_rng(40))[0]
+    before = scrape(client)
+
+    assert client.post('/predict', json=record).status_code == 200
+    assert client.post('/predict', json={}).status_code == 400
+
+    after = scrape(client)
+    for status in ('200', '400'):
+        assert value(after, 'ml_api_requests_total', app='biosecurity', route='/predict', status=status) == \
+            value(before, 'ml_api_requests_total', app='biosecurity', route='/predict', status=status) + 1
+    assert value(after, 'ml_api_request_duration_seconds_count', app='biosecurity', route='/predict') == \
+        value(before, 'ml_api_request_duration_seconds_count', app='biosecurity', route='/predict') + 2
+    assert value(after, 'ml_api_stage_duration_seconds_count', app='biosecurity', route='/predict',
+                 stage='parse') == \
+        value(before, 'ml_api_stage_duration_seconds_count', app='biosecurity', route='/predict', stage='parse') + 2
+    # Validation errors raise no exception, so they are counted by status
+    assert value(after, 'ml_api_errors_total', app='biosecurity', route='/predict', type='http_400') == \
+        value(before, 'ml_api_errors_total', app='biosecurity', route='/predict', type='http_400') + 1
+
+
+def test_histograms_use_the_latency_buckets(client):
+    client.post('/predict', json=generate_records(1, np.random.default_rng(41))[0])
+
+    samples = scrape(client)
+
+    bounds = sorted(float(dict(labels)['le']) for name, labels in samples
+                    if name == 'ml_api_request_duration_seconds_bucket' and dict(labels)['route'] == '/predict')
+    assert bounds == LATENCY_BUCKETS + [float('inf')]
+    assert 15 <= len(LATENCY_BUCKETS) <= 20
+
+
+def test_model_info_names_the_serving_model(api, client):
+    samples = scrape(client)
+
+    info = [dict(labels) for name, labels in samples if name == 'ml_api_model_info']
+    assert len(info) == 1
+    assert info[0]['app'] == 'biosecurity'
+    assert info[0]['model_name'] == api.model.best_model_name
+
+
+@pytest.mark.filterwarnings('ignore:X does not have valid feature names')
+def test_quiz_api_serves_its_own_metrics(quiz_client):
+    samples = scrape(quiz_client)
+
+    assert [dict(labels)['app'] for name, labels in samples if name == 'ml_api_model_info'] == ['quiz']
+    assert not any(dict(labels).get('app') == 'biosecurity' for _, labels in samples)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+import model_artifact
+from biosecurity_model import BiosecurityMLModel
+from synthetic_data import generate_records
+
+
+def estimators(model):
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import SGDRegressor
+    from sklearn.neural_network import MLPRegressor
+
+    candidates = model.candidate_models()
+    # Smaller versions of the slow candidates keep the suite quick
+    candidates['Random Forest'] = RandomForestRegressor(n_estimators=10, random_state=0)
+    candidates['Neural Network'] = MLPRegressor(hidden_layer_sizes=(32, 16), max_iter=200, random_state=0)
+    candidates['SGD Regression'] = SGDRegressor(random_state=0)
+    return candidates
+
+
+def exported(model, path):
+    model.export_artifact(str(path))
+    loaded = BiosecurityMLModel()
+    loaded.load_artifact(str(path))
+    return loaded
+
+
+NAMES = ['Random Forest', 'Gradient Boosting', 'Histogram Gradient Boosting', 'Linear Regression',
+         'Ridge Regression', 'SVR', 'Neural Network', 'SGD Regression']
+
+
+@pytest.mark.filterwarnings('ignore::sklearn.exceptions.ConvergenceWarning')
+@pytest.mark.parametrize('name', NAMES)
+def test_artifact_predictions_match_sklearn(training_data, fit_candidate, tmp_path, name):
+    model = fit_candidate(name, estimators(training_data[0])[name])
+    loaded = exported(model, tmp_path / 'model.bsm')
+    records = generate_records(300, np.random.default_rng(0))
+
+    assert loaded.best_model_name == name
+    assert loaded.source == str(tmp_path / 'model.bsm')
+    X = loaded.encode(records)
+    assert np.array_equal(X, model.encode(records))
+    # Raw model outputs, before scores are clipped to 0-100
+    np.testing.assert_allclose(loaded.best_model.predict(X), model.best_model.predict(X), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(loaded.predict_scores(records), model.predict_scores(records),
+                               rtol=0, atol=1e-4)
+    for record in records[:20]:
+        assert loaded.predict_score(record) == pytest.approx(model.predict_score(record), abs=1e-4)
+
+
+def test_histogram_boosting_keeps_categorical_splits(training_data, fit_candidate, tmp_path):
+    name = 'Histogram Gradient Boosting'
+    model = fit_candidate(name, estimators(training_data[0])[name])
+    exported(model, tmp_path / 'model.bsm')
+
+    _, _, arrays = model_artifact.load_artifact(str(tmp_path / 'model.bsm'))
+    assert (arrays['tree_bitset'] >= 0).any()
+    assert len(arrays['tree_missing_left']) == len(arrays['tree_value'])
+
+
+def test_artifact_arrays_are_read_only_views(training_data, fit_candidate, tmp_path):
+    model = fit_candidate('Random Forest', estimators(training_data[0])['Random Forest'])
+    exported(model, tmp_path / 'model.bsm')
+
+    _, _, arrays = model_artifact.load_artifact(str(tmp_path / 'model.bsm'))
+    for array in arrays.values():
+        assert not array.flags.writeable
+        while array.base is not None and not isinstance(array, np.memmap):
+            array = array.base
+        assert isinstance(array, np.memmap)
+
+
+def test_unsupported_estimators_cannot_be_exported(fit_candidate, tmp_path):
+    from sklearn.neighbors import KNeighborsRegressor
+    model = fit_candidate('Nearest Neighbors', KNeighborsRegressor())
+    with pytest.raises(ValueError, match='cannot be stored'):
+        model.export_artifact(str(tmp_path / 'model.bsm'))
+
+
+def test_rejects_files_that_are_not_artifacts(tmp_path):
+    path = tmp_path / 'model.bsm'
+    path.write_bytes(b'not an artifact')
+    with pytest.raises(ValueError, match='not a biosecurity model artifact'):
+        BiosecurityMLModel().load_artifact(str(path))
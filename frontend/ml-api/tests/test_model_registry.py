@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pytest
+
+from biosecurity_model import BiosecurityMLModel
+from model_registry import ModelRegistry
+from synthetic_data import generate_records
+
+# Holdout metrics no model can reach, so the canary check rejects the version
+UNREACHABLE_METRICS = {'Random Forest': {'MAE': 0.01}}
+
+
+@pytest.fixture
+def registry(api, trained_model, tmp_path, monkeypatch):
+    """An empty registry behind the API; trained_model is served again afterwards"""
+    registry = ModelRegistry(str(tmp_path / 'model_registry'))
+    monkeypatch.setattr(api, 'registry', registry)
+    monkeypatch.setattr(api, 'rejected_versions', set())
+    yield registry
+    api.activate_model(trained_model)
+
+
+def reload(client, version=None):
+    response = client.post('/model/reload', json={} if version is None else {'version': version})
+    return response.status_code, response.get_json()
+
+
+def test_register_stores_numbered_versions_with_metadata(trained_model, tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+
+    assert registry.versions() == [] and registry.latest() is None
+    assert registry.register(trained_model, {'Random Forest': {'MAE': np.float64(2.5)}}) == 1
+    assert registry.register(trained_model) == 2
+
+    assert registry.versions() == [1, 2] and registry.latest() == 2
+    assert sorted(os.listdir(tmp_path)) == ['v1', 'v2']
+    metadata = registry.metadata(1)
+    assert metadata['version'] == 1
+    assert metadata['model_name'] == 'Random Forest'
+    assert metadata['metrics'] == {'Random Forest': {'MAE': 2.5}}
+    assert metadata['feature_names'] == trained_model.feature_names
+    assert metadata['files'] == ['biosecurity_model.pkl', 'biosecurity_model.bsm']
+
+
+def test_load_serves_the_registered_model_from_its_artifact(trained_model, tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    version = registry.register(trained_model)
+    records = generate_records(50, np.random.default_rng(20))
+
+    loaded = registry.load(version, BiosecurityMLModel())
+
+    assert loaded.version == version
+    assert loaded.metadata == registry.metadata(version)
+    assert loaded.source.endswith(os.path.join(f'v{version}', 'biosecurity_model.bsm'))
+    np.testing.assert_allclose(loaded.predict_scores(records), trained_model.predict_scores(records),
+                               rtol=0, atol=1e-9)
+
+
+def test_reload_activates_the_latest_version(client, registry, trained_model):
+    registry.register(trained_model)
+    version = registry.register(trained_model)
+
+    status, body = reload(client)
+
+    assert status == 200
+    assert body == {'status': 'success', 'message': f'Version {version} activated', 'model_version': version}
+    assert client.get('/model-info').get_json()['model_version'] == version
+
+
+def test_reload_rejects_a_version_that_fails_its_canaries(client, registry, trained_model):
+    good = registry.register(trained_model)
+    assert reload(client, good)[0] == 200
+    bad = registry.register(trained_model, UNREACHABLE_METRICS)
+
+    status, body = reload(client, bad)
+
+    assert status == 409
+    assert body['status'] == 'error'
+    assert body['message'].startswith(f'Version {bad} rejected: ')
+    assert 'exceeds' in body['message']
+    # The previous version keeps serving
+    assert body['model_version'] == good
+    assert client.get('/model-info').get_json()['model_version'] == good
+
+
+def test_reload_rolls_back_to_an_earlier_version(client, registry, trained_model):
+    first = registry.register(trained_model)
+    second = registry.register(trained_model)
+    assert reload(client, second) == (200, {'status': 'success', 'message': f'Version {second} activated',
+                                            'model_version': second})
+
+    status, body = reload(client, str(first))
+
+    assert status == 200
+    assert body['model_version'] == first
+    assert client.get('/model-info').get_json()['model_version'] == first
+
+
+def test_startup_falls_back_past_rejected_versions(api, registry, trained_model):
+    good = registry.register(trained_model)
+    bad = registry.register(trained_model, UNREACHABLE_METRICS)
+
+    assert api.load_registry_version()
+
+    assert api.model.version == good
+    assert api.rejected_versions == {bad}
+
+
+def test_reload_of_an_unknown_version_is_404(client, registry, trained_model):
+    registry.register(trained_model)
+
+    status, body = reload(client, 7)
+
+    assert status == 404
+    assert body == {'error': 'Version 7 not found', 'available_versions': [1], 'status': 'error'}
+
+
+@pytest.mark.parametrize('version', ['latest', -1, 1.5, True, [1]])
+def test_reload_rejects_malformed_versions(client, registry, trained_model, version):
+    registry.register(trained_model)
+
+    status, body = reload(client, version)
+
+    assert status == 400
+    assert body == {'error': 'version must be a non-negative integer', 'status': 'error'}
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from model_selection import CV_FOLDS, select_model
+
+
+@pytest.fixture(scope='module')
+def data():
+    """(X_train, X_test, X_full, y_train, y_test, y_full) of a noisy linear target"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(250, 4))
+    y = X @ np.array([3.0, -2.0, 1.0, 0.5]) + rng.normal(scale=0.5, size=250)
+    return X[:200], X[200:], X, y[:200], y[200:], y
+
+
+def candidates(data, **estimators):
+    X_train, X_test, X_full = data[:3]
+    return {name: (estimator, X_train, X_test, X_full) for name, estimator in estimators.items()}
+
+
+def ranked_candidates(data):
+    """The best candidate, one trailing it within the margin and a constant trailing it far beyond"""
+    from sklearn.dummy import DummyRegressor
+    from sklearn.linear_model import LinearRegression, Ridge
+    return candidates(data, linear=LinearRegression(), ridge=Ridge(alpha=20.0), constant=DummyRegressor())
+
+
+def select(data, models, **kwargs):
+    return select_model(models, *data[3:], n_jobs=1, **kwargs)
+
+
+def test_trailing_candidates_are_eliminated_after_the_first_rung(data):
+    results, best_name, _ = select(data, ranked_candidates(data))
+
+    assert best_name == 'linear'
+    assert results['constant']['eliminated']
+    assert (results['constant']['folds'], results['constant']['fits']) == (1, 1)
+    assert results['ridge']['folds'] == CV_FOLDS and 'eliminated' not in results['ridge']
+
+
+def test_elimination_margin_keeps_candidates_within_it(data):
+    results, _, _ = select(data, ranked_candidates(data), elimination_margin=float('inf'))
+
+    assert [results[name]['folds'] for name in results] == [CV_FOLDS] * 3
+    assert not any(result.get('eliminated') for result in results.values())
+
+
+def test_time_budget_stops_after_the_first_rung(data):
+    results, best_name, best_estimator = select(data, ranked_candidates(data), time_budget=0)
+
+    # Every candidate still gets its first fold, so each has a score
+    assert [results[name]['folds'] for name in results] == [1, 1, 1]
+    assert best_name == 'linear'
+    assert results['linear']['fits'] == 2 and results['ridge']['fits'] == 1
+    assert best_estimator.n_features_in_ == 4
+
+
+def test_cache_reuses_partial_and_complete_results(data, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+
+    first, _, _ = select(data, ranked_candidates(data), time_budget=0, cache_dir=cache_dir)
+    second, _, _ = select(data, ranked_candidates(data), cache_dir=cache_dir)
+    third, best_name, best_estimator = select(data, ranked_candidates(data), cache_dir=cache_dir)
+
+    # The second run fits only the folds the first one did not reach; the
+    # winner's refit is already cached
+    assert {name: result['fits'] for name, result in first.items()} == {'linear': 2, 'ridge': 1, 'constant': 1}
+    assert {name: result['fits'] for name, result in second.items()} == {'linear': CV_FOLDS - 1,
+                                                                         'ridge': CV_FOLDS - 1, 'constant': 0}
+    assert second['ridge']['folds'] == CV_FOLDS
+    assert second['constant']['eliminated']
+    # The third fits nothing: metrics and the refitted winner come from the cache
+    assert {name: result['fits'] for name, result in third.items()} == {'linear': 0, 'ridge': 0, 'constant': 0}
+    assert third['linear']['cached'] and third['ridge']['cached']
+    assert best_name == 'linear'
+    assert third['linear']['CV_R2'] == pytest.approx(second['linear']['CV_R2'])
+    np.testing.assert_allclose(best_estimator.coef_, fitted_on_full_data(data).coef_)
+
+
+def fitted_on_full_data(data):
+    from sklearn.linear_model import LinearRegression
+    return LinearRegression().fit(data[2], data[5])
+
+
+def recording(base):
+    """Subclass of an estimator class that records the row count of every fit"""
+    class Recording(base):
+        fitted_rows = []
+
+        def fit(self, X, y, *args, **kwargs):
+            type(self).fitted_rows.append(len(X))
+            return super().fit(X, y, *args, **kwargs)
+    return Recording
+
+
+def test_only_the_winner_is_refitted_once_on_the_full_data(data):
+    from sklearn.dummy import DummyRegressor
+    from sklearn.linear_model import LinearRegression, Ridge
+    estimators = {'linear': recording(LinearRegression)(), 'ridge': recording(Ridge)(alpha=20.0),
+                  'constant': recording(DummyRegressor)()}
+    full_matrix_calls = []
+
+    def full_matrix():
+        full_matrix_calls.append(True)
+        return data[2]
+    models = {name: (estimator, data[0], data[1], full_matrix) for name, estimator in estimators.items()}
+
+    results, best_name, best_estimator = select(data, models)
+
+    fold_rows = len(data[0]) - len(data[0]) // CV_FOLDS
+    assert best_name == 'linear'
+    assert type(estimators['linear']).fitted_rows == [fold_rows] * CV_FOLDS + [len(data[2])]
+    assert type(estimators['ridge']).fitted_rows == [fold_rows] * CV_FOLDS
+    assert type(estimators['constant']).fitted_rows == [fold_rows]
+    assert [results[name]['fits'] for name in results] == [CV_FOLDS + 1, CV_FOLDS, 1]
+    # The full matrix is built once, for the winner only
+    assert len(full_matrix_calls) == 1
+    np.testing.assert_allclose(best_estimator.coef_, fitted_on_full_data(data).coef_)
@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import prediction_cache
+from prediction_cache import PredictionCache
+from synthetic_data import generate_records
+
+FIELDS = ['farm_size_acres', 'livestock_count', 'fencing_quality']
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock for the cache module; advance it with clock.now += seconds"""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(prediction_cache, 'time', SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_key_ignores_field_order_and_extra_fields():
+    cache = PredictionCache(FIELDS)
+    a = {'farm_size_acres': 10.5, 'livestock_count': 3, 'fencing_quality': 'good'}
+    b = {'fencing_quality': 'good', 'extra': 1, 'livestock_count': 3, 'farm_size_acres': 10.5}
+    assert cache.key(a) == cache.key(b)
+    assert cache.key(a, namespace=1) != cache.key(a, namespace=2)
+
+
+def test_buckets_share_entries_between_nearby_values():
+    cache = PredictionCache(FIELDS, buckets={'farm_size_acres': 50, 'livestock_count': 0})
+    record = {'farm_size_acres': 120.0, 'livestock_count': 3, 'fencing_quality': 'good'}
+    assert cache.key(record) == cache.key(dict(record, farm_size_acres=149.9))
+    assert cache.key(record) != cache.key(dict(record, farm_size_acres=150.0))
+    assert cache.key(record) != cache.key(dict(record, livestock_count=4))
+
+
+def test_hit_after_put_and_miss_otherwise():
+    cache = PredictionCache(FIELDS)
+    cache.put(('a',), {'score': 1})
+    assert cache.get(('a',)) == {'score': 1}
+    assert cache.get(('b',)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.stats()['hit_rate'] == 0.5
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(FIELDS, ttl=60)
+    cache.put(('a',), 'value')
+
+    clock.now += 59.9
+    assert cache.get(('a',)) == 'value'
+
+    clock.now += 0.1
+    assert cache.get(('a',)) is None
+    assert cache.expirations == 1
+    assert cache.stats()['size'] == 0
+
+
+def test_put_refreshes_ttl(clock):
+    cache = PredictionCache(FIELDS, ttl=60)
+    cache.put(('a',), 'old')
+    clock.now += 50
+    cache.put(('a',), 'new')
+    clock.now += 50
+    assert cache.get(('a',)) == 'new'
+
+
+def test_entries_without_ttl_never_expire(clock):
+    cache = PredictionCache(FIELDS, ttl=None)
+    cache.put(('a',), 'value')
+    clock.now += 10 ** 9
+    assert cache.get(('a',)) == 'value'
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(FIELDS, max_size=2)
+    cache.put(('a',), 1)
+    cache.put(('b',), 2)
+    cache.get(('a',))
+    cache.put(('c',), 3)
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) == 1 and cache.get(('c',)) == 3
+    assert cache.evictions == 1
+
+
+def test_size_zero_disables_the_cache():
+    cache = PredictionCache(FIELDS, max_size=0)
+    cache.put(('a',), 1)
+    assert cache.get(('a',)) is None
+    assert cache.stats()['size'] == 0
+
+
+def test_predict_serves_repeated_records_from_the_cache(api, client):
+    api.prediction_cache.clear()
+    record = generate_records(1, np.random.default_rng(5))[0]
+    hits = api.prediction_cache.hits
+
+    first = client.post('/predict', json=record).get_json()
+    # Same record with its fields in another order
+    second = client.post('/predict', json=dict(reversed(list(record.items())))).get_json()
+
+    assert api.prediction_cache.hits == hits + 1
+    assert second['prediction'] == first['prediction']
+    assert second['recommendations'] == first['recommendations']
+
+
+def test_activating_a_model_clears_the_cache(api, client, trained_model):
+    client.post('/predict', json=generate_records(1, np.random.default_rng(6))[0])
+    assert api.prediction_cache.stats()['size'] > 0
+    api.activate_model(trained_model)
+    assert api.prediction_cache.stats()['size'] == 0
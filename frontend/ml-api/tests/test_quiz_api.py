@@ -0,0 +1,56 @@
+import pytest
+
+from quiz_model import QUESTIONS
+
+ANSWERS = {question: answer for question, answer in zip(QUESTIONS, [15, 18, 12, 16, 14, 10, 8, 6, 12, 14,
+                                                                      16, 18, 17, 19, 15])}
+
+
+def test_predict_scores_a_submission(quiz_client):
+    body = quiz_client.post('/predict', json=ANSWERS).get_json()
+
+    assert body['biometric_score'] == int(sum(ANSWERS.values()) / 300 * 100)
+    assert body['prediction'].startswith('Biosecurity Risk: ')
+
+
+@pytest.mark.parametrize('answer', ['5', None, [5], {'value': 5}])
+def test_predict_rejects_answers_that_are_not_numbers(quiz_client, answer):
+    response = quiz_client.post('/predict', json=dict(ANSWERS, q3=answer))
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Answers must be numbers: ['q3']"
+
+
+def test_batch_matches_per_submission_predict(quiz_client):
+    submissions = [ANSWERS, dict(ANSWERS, q1=0, q2=0, q3=0), {'q1': 20}]
+
+    body = quiz_client.post('/predict/batch', json=submissions).get_json()
+
+    assert (body['count'], body['succeeded'], body['failed']) == (3, 3, 0)
+    for index, submission in enumerate(submissions):
+        result = dict(body['results'][index])
+        single = quiz_client.post('/predict', json=submission).get_json()
+        assert (result.pop('index'), result.pop('status')) == (index, 'success')
+        # One matmul over the batch may round differently from one over a row
+        assert result.pop('confidence') == pytest.approx(single.pop('confidence'), abs=1e-12)
+        assert result == single
+
+
+def test_batch_reports_bad_answers_in_place(quiz_client):
+    submissions = [ANSWERS, dict(ANSWERS, q1='5', q15='high'), 'not a submission', dict(ANSWERS, q2=True)]
+
+    body = quiz_client.post('/predict/batch', json=submissions).get_json()
+
+    assert (body['count'], body['succeeded'], body['failed']) == (4, 2, 2)
+    assert body['results'][1] == {'index': 1, 'status': 'error',
+                                  'error': "Answers must be numbers: ['q1', 'q15']"}
+    assert body['results'][2] == {'index': 2, 'status': 'error', 'error': 'Expected an object of quiz answers'}
+    assert [result['status'] for result in body['results']] == ['success', 'error', 'error', 'success']
+
+
+@pytest.mark.parametrize('body', [[], {'q1': 5}, 'submissions'])
+def test_batch_rejects_bodies_that_are_not_arrays(quiz_client, body):
+    response = quiz_client.post('/predict/batch', json=body)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Expected a non-empty JSON array of quiz submissions'}
@@ -0,0 +1,130 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import quiz_model
+from quiz_model import QUESTIONS, CompiledLogistic, generate_quiz_data
+
+
+@pytest.fixture(scope='module')
+def quiz_data():
+    df = generate_quiz_data(n_rows=400, seed=3)
+    return df[QUESTIONS].to_numpy(dtype=np.float64), df['risk'].to_numpy()
+
+
+def fit(X, y, scaler=None, **params):
+    from sklearn.linear_model import LogisticRegression
+    model = LogisticRegression(max_iter=1000, random_state=0, **params)
+    model.fit(X if scaler is None else scaler.fit_transform(X), y)
+    return model
+
+
+# Softmax for the default multinomial model, sigmoids for the rest
+@pytest.mark.parametrize('params', [{}, {'solver': 'liblinear'}, {'multi_class': 'ovr'}],
+                         ids=['multinomial', 'liblinear', 'ovr'])
+@pytest.mark.parametrize('binary', [False, True], ids=['three-class', 'binary'])
+def test_matches_scaled_sklearn_predictions(quiz_data, params, binary):
+    from sklearn.preprocessing import StandardScaler
+    X, y = quiz_data
+    if binary:
+        y = np.where(y == 'High', 'High', 'Not high')
+    scaler = StandardScaler()
+    model = fit(X, y, scaler, **params)
+    compiled = CompiledLogistic.from_sklearn(model, scaler)
+    X_scaled = scaler.transform(X)
+
+    assert list(compiled.classes_) == list(model.classes_)
+    np.testing.assert_allclose(compiled.decision_function(X).ravel(),
+                               model.decision_function(X_scaled).ravel(), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X_scaled), rtol=0, atol=1e-12)
+    assert np.array_equal(compiled.predict(X), model.predict(X_scaled))
+
+
+def test_single_rows_match_the_batch_path(quiz_data):
+    from sklearn.preprocessing import StandardScaler
+    X, y = quiz_data
+    scaler = StandardScaler()
+    compiled = CompiledLogistic.from_sklearn(fit(X, y, scaler), scaler)
+    batch = compiled.predict_proba(X[:25])
+
+    for row, expected in zip(X[:25], batch):
+        np.testing.assert_allclose(compiled.predict_proba([row])[0], expected, rtol=0, atol=1e-12)
+        assert compiled.predict([row])[0] == compiled.classes_[np.argmax(expected)]
+
+
+@pytest.mark.parametrize('scaler_params', [{'with_mean': False}, {'with_std': False}])
+def test_partial_scalers_are_folded(quiz_data, scaler_params):
+    from sklearn.preprocessing import StandardScaler
+    X, y = quiz_data
+    scaler = StandardScaler(**scaler_params)
+    model = fit(X, y, scaler)
+    compiled = CompiledLogistic.from_sklearn(model, scaler)
+
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(scaler.transform(X)),
+                               rtol=0, atol=1e-12)
+
+
+def test_without_a_scaler(quiz_data):
+    X, y = quiz_data
+    model = fit(X, y)
+    compiled = CompiledLogistic.from_sklearn(model)
+
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(compiled.predict_proba(X[:1]), model.predict_proba(X[:1]), rtol=0, atol=1e-12)
+
+
+def fitted_artifacts(seed):
+    """(model, label encoder, scaler) trained on quiz data drawn with seed"""
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+    df = generate_quiz_data(n_rows=300, seed=seed)
+    X, y = df[QUESTIONS].to_numpy(dtype=np.float64), df['risk'].to_numpy()
+    scaler = StandardScaler()
+    return fit(X, y, scaler), LabelEncoder().fit(y), scaler
+
+
+def publish(artifact_dir, seed):
+    model, le, scaler = fitted_artifacts(seed)
+    return quiz_model.publish_artifacts({quiz_model.MODEL_FILE: model, quiz_model.ENCODER_FILE: le,
+                                         quiz_model.SCALER_FILE: scaler}, str(artifact_dir))
+
+
+def test_published_run_loads_as_one_set(tmp_path):
+    run = publish(tmp_path, seed=1)
+    model, le, scaler = quiz_model.load_artifacts(str(tmp_path))
+    expected = fitted_artifacts(seed=1)
+
+    assert quiz_model.read_manifest(str(tmp_path))['run'] == run
+    np.testing.assert_array_equal(model.coef_, expected[0].coef_)
+    np.testing.assert_array_equal(scaler.mean_, expected[2].mean_)
+
+
+def test_publishing_keeps_the_previous_run_for_readers_of_the_old_manifest(tmp_path):
+    first = publish(tmp_path, seed=1)
+    second = publish(tmp_path, seed=2)
+    assert sorted(entry for entry in os.listdir(tmp_path) if entry.startswith('run-')) == sorted([first, second])
+
+    third = publish(tmp_path, seed=3)
+    assert sorted(entry for entry in os.listdir(tmp_path) if entry.startswith('run-')) == sorted([second, third])
+    assert quiz_model.read_manifest(str(tmp_path))['run'] == third
+
+
+def test_files_from_another_run_are_rejected(tmp_path):
+    old = publish(tmp_path, seed=1)
+    new = publish(tmp_path, seed=2)
+    # Same shapes and classes as the new model: only the manifest tells them apart
+    shutil.copy(tmp_path / old / quiz_model.SCALER_FILE, tmp_path / new / quiz_model.SCALER_FILE)
+
+    with pytest.raises(RuntimeError, match='not the file published'):
+        quiz_model.load_artifacts(str(tmp_path))
+
+
+def test_missing_artifacts_fail_fast(tmp_path):
+    with pytest.raises(RuntimeError, match='No quiz model artifacts'):
+        quiz_model.load_artifacts(str(tmp_path))
+
+    run = publish(tmp_path, seed=1)
+    os.remove(tmp_path / run / quiz_model.ENCODER_FILE)
+    with pytest.raises(RuntimeError, match='Missing quiz model artifact'):
+        quiz_model.load_artifacts(str(tmp_path))
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from schema import ASSESSMENT_SCHEMA
+from synthetic_data import generate_records
+
+
+@pytest.fixture
+def record():
+    return generate_records(1, np.random.default_rng(0))[0]
+
+
+def test_generated_records_are_valid():
+    for record in generate_records(200, np.random.default_rng(1)):
+        assert ASSESSMENT_SCHEMA.validate(record) is None
+
+
+@pytest.mark.parametrize('record', [[], 'farm', 42, None])
+def test_rejects_non_objects(record):
+    assert ASSESSMENT_SCHEMA.validate(record) == ('Each record must be a JSON object', None)
+
+
+def test_rejects_missing_fields_in_field_order(record):
+    del record['veterinary_contact']
+    del record['farm_size_acres']
+    record['fencing_quality'] = 'invalid'
+
+    # Missing fields are reported before (and instead of) invalid values
+    assert ASSESSMENT_SCHEMA.validate(record) == (
+        "Missing required fields: ['farm_size_acres', 'veterinary_contact']", None)
+
+
+@pytest.mark.parametrize('value', ['maybe', 'YES', '', None, 1, True])
+def test_rejects_yes_no_values(record, value):
+    record['biosecurity_gates'] = value
+    assert ASSESSMENT_SCHEMA.validate(record) == (
+        'Validation errors', ['biosecurity_gates must be "yes" or "no"'])
+
+
+@pytest.mark.parametrize('value', ['perfect', 'Excellent', None, 3, ['good'], {'good': 1}])
+def test_rejects_enum_values(record, value):
+    record['fencing_quality'] = value
+    assert ASSESSMENT_SCHEMA.validate(record) == (
+        'Validation errors', ["fencing_quality must be one of: ['excellent', 'good', 'fair', 'poor']"])
+
+
+@pytest.mark.parametrize('value', [-1, -0.5, '100', None, [100]])
+def test_rejects_farm_size(record, value):
+    record['farm_size_acres'] = value
+    assert ASSESSMENT_SCHEMA.validate(record) == (
+        'Validation errors', ['farm_size_acres must be a positive number'])
+
+
+@pytest.mark.parametrize('value', [-1, 10.5, 10.0, '10', None])
+def test_rejects_livestock_count(record, value):
+    record['livestock_count'] = value
+    assert ASSESSMENT_SCHEMA.validate(record) == (
+        'Validation errors', ['livestock_count must be a positive integer'])
+
+
+@pytest.mark.parametrize('field, value', [('farm_size_acres', 0), ('farm_size_acres', 12),
+                                          ('livestock_count', 0)])
+def test_accepts_numeric_bounds(record, field, value):
+    record[field] = value
+    assert ASSESSMENT_SCHEMA.validate(record) is None
+
+
+def test_reports_every_invalid_field_in_field_order(record):
+    record['veterinary_contact'] = 'no way'
+    record['livestock_count'] = -3
+    record['farm_size_acres'] = 'big'
+
+    assert ASSESSMENT_SCHEMA.validate(record) == ('Validation errors', [
+        'farm_size_acres must be a positive number',
+        'livestock_count must be a positive integer',
+        'veterinary_contact must be "yes" or "no"',
+    ])
+
+
+def test_predict_returns_validation_details(client, record):
+    record['staff_training'] = 'never'
+    response = client.post('/predict', json=record)
+
+    assert response.status_code == 400
+    assert response.get_json() == {
+        'error': 'Validation errors',
+        'status': 'error',
+        'details': ["staff_training must be one of: ['monthly', 'quarterly', 'biannual', 'annual']"],
+    }
+
+
+def test_batch_rejects_invalid_records_individually(client, record):
+    invalid = dict(record, emergency_plan='sometimes')
+    response = client.post('/predict/batch', json=[record, invalid, 'not a record'])
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert (body['succeeded'], body['failed']) == (1, 2)
+    assert body['results'][0]['status'] == 'success'
+    assert body['results'][1] == {'index': 1, 'status': 'error', 'error': 'Validation errors',
+                                  'details': ['emergency_plan must be "yes" or "no"']}
+    assert body['results'][2] == {'index': 2, 'status': 'error',
+                                  'error': 'Each record must be a JSON object'}
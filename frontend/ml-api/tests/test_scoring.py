@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+
+from biosecurity_model import BiosecurityMLModel
+from scoring import SCORING_TABLE
+
+
+def legacy_score(row):
+    """calculate_biosecurity_score as it was before the points table, verbatim"""
+    score = 0
+    max_score = 100
+
+    # Farm Infrastructure (25 points)
+    if row['fencing_quality'] == 'excellent': score += 8
+    elif row['fencing_quality'] == 'good': score += 6
+    elif row['fencing_quality'] == 'fair': score += 4
+    else: score += 1
+
+    if row['biosecurity_gates'] == 'yes': score += 5
+    if row['quarantine_facility'] == 'yes': score += 6
+    if row['vehicle_wash_station'] == 'yes': score += 6
+
+    # Livestock Management (25 points)
+    if row['vaccination_protocol'] == 'strict': score += 8
+    elif row['vaccination_protocol'] == 'moderate': score += 6
+    elif row['vaccination_protocol'] == 'basic': score += 4
+    else: score += 1
+
+    if row['disease_monitoring'] == 'daily': score += 8
+    elif row['disease_monitoring'] == 'weekly': score += 6
+    elif row['disease_monitoring'] == 'monthly': score += 4
+    else: score += 1
+
+    if row['isolation_practices'] == 'excellent': score += 9
+    elif row['isolation_practices'] == 'good': score += 7
+    elif row['isolation_practices'] == 'fair': score += 4
+    else: score += 1
+
+    # Hygiene Practices (20 points)
+    if row['disinfection_frequency'] == 'daily': score += 7
+    elif row['disinfection_frequency'] == 'weekly': score += 5
+    elif row['disinfection_frequency'] == 'monthly': score += 3
+    else: score += 1
+
+    if row['personal_protective_equipment'] == 'full': score += 7
+    elif row['personal_protective_equipment'] == 'partial': score += 5
+    elif row['personal_protective_equipment'] == 'basic': score += 3
+    else: score += 1
+
+    if row['visitor_control'] == 'strict': score += 6
+    elif row['visitor_control'] == 'moderate': score += 4
+    elif row['visitor_control'] == 'basic': score += 2
+    else: score += 0
+
+    # Feed and Water (15 points)
+    if row['feed_storage_security'] == 'excellent': score += 8
+    elif row['feed_storage_security'] == 'good': score += 6
+    elif row['feed_storage_security'] == 'fair': score += 4
+    else: score += 1
+
+    if row['water_source_protection'] == 'excellent': score += 7
+    elif row['water_source_protection'] == 'good': score += 5
+    elif row['water_source_protection'] == 'fair': score += 3
+    else: score += 1
+
+    # Pest Control (10 points)
+    if row['rodent_control'] == 'excellent': score += 5
+    elif row['rodent_control'] == 'good': score += 4
+    elif row['rodent_control'] == 'fair': score += 2
+    else: score += 0
+
+    if row['insect_control'] == 'excellent': score += 5
+    elif row['insect_control'] == 'good': score += 4
+    elif row['insect_control'] == 'fair': score += 2
+    else: score += 0
+
+    # Training and Documentation (5 points)
+    if row['staff_training'] == 'monthly': score += 3
+    elif row['staff_training'] == 'quarterly': score += 2
+    elif row['staff_training'] == 'biannual': score += 1
+    else: score += 0
+
+    if row['protocol_documentation'] == 'comprehensive': score += 2
+    elif row['protocol_documentation'] == 'moderate': score += 1
+    else: score += 0
+
+    # Emergency Response (5 points)
+    if row['emergency_plan'] == 'yes': score += 3
+    if row['veterinary_contact'] == 'yes': score += 2
+
+    return min(score, max_score)
+
+
+def assessments(n_rows, seed=0):
+    return BiosecurityMLModel().generate_synthetic_data(n_samples=n_rows, seed=seed)
+
+
+def with_unknown_values(df, seed=0):
+    """Copy of df where about a fifth of every scored field holds values outside the table"""
+    rng = np.random.default_rng(seed)
+    df = df.astype({field: object for field in SCORING_TABLE.levels})
+    for field in SCORING_TABLE.levels:
+        unknown = rng.random(len(df)) < 0.2
+        df.loc[unknown, field] = rng.choice(['unknown', '', 'YES', None], unknown.sum())
+    return df
+
+
+@pytest.mark.parametrize('unknown', [False, True])
+def test_score_frame_matches_legacy_rules(unknown):
+    df = assessments(2000)
+    if unknown:
+        df = with_unknown_values(df)
+    expected = np.array([legacy_score(row) for _, row in df.iterrows()])
+
+    scores = BiosecurityMLModel().calculate_biosecurity_scores(df)
+
+    assert scores.index.equals(df.index)
+    assert np.array_equal(scores.to_numpy(), expected)
+
+
+@pytest.mark.parametrize('unknown', [False, True])
+def test_score_record_matches_legacy_rules(unknown):
+    df = assessments(500, seed=1)
+    if unknown:
+        df = with_unknown_values(df, seed=1)
+    for record in df.to_dict('records'):
+        assert SCORING_TABLE.score_record(record)[0] == legacy_score(record)
+
+
+def test_every_level_of_every_field_matches_legacy_rules():
+    base = assessments(1).iloc[0].to_dict()
+    for field, levels in SCORING_TABLE.levels.items():
+        for value in list(levels) + ['not-a-level']:
+            record = dict(base, **{field: value})
+            assert SCORING_TABLE.score_record(record)[0] == legacy_score(record), (field, value)
+
+
+def test_category_subtotals_agree_between_frame_and_record():
+    df = with_unknown_values(assessments(300, seed=2), seed=2)
+    frame = SCORING_TABLE.score_frame(df)
+    for (_, row), record in zip(frame.iterrows(), df.to_dict('records')):
+        total, category_scores = SCORING_TABLE.score_record(record)
+        assert row['biosecurity_score'] == total
+        assert {category: row[category] for category in category_scores} == category_scores
+
+
+def test_category_scores_keep_the_legacy_categories():
+    df = assessments(100, seed=3)
+    frame = SCORING_TABLE.score_frame(df)
+    for (_, row), record in zip(frame.iterrows(), df.to_dict('records')):
+        total, category_scores = SCORING_TABLE.score_record(record)
+        assert list(category_scores) == ['infrastructure', 'livestock_management', 'hygiene_practices',
+                                         'feed_water', 'pest_control', 'training_documentation']
+        # Emergency response points still count towards the total
+        assert sum(category_scores.values()) + row['emergency_response'] == total
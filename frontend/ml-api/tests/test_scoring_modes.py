@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from scoring import SCORING_TABLE
+from synthetic_data import generate_records
+
+
+@pytest.fixture
+def drift(api, monkeypatch):
+    """The API's drift monitor comparing every prediction, starting empty"""
+    monkeypatch.setattr(api.drift_monitor, 'sample_rate', 1.0)
+    api.drift_monitor.reset()
+    api.prediction_cache.clear()
+    yield api.drift_monitor
+    api.drift_monitor.reset()
+
+
+def expected_drift(model_scores, rules_scores):
+    deviation = np.asarray(model_scores, dtype=np.float64) - np.asarray(rules_scores, dtype=np.float64)
+    return {
+        'sample_rate': 1.0,
+        'samples': len(deviation),
+        'mean_deviation': pytest.approx(deviation.mean()),
+        'mean_abs_deviation': pytest.approx(np.abs(deviation).mean()),
+        'rmse': pytest.approx(np.sqrt((deviation ** 2).mean())),
+        'max_abs_deviation': pytest.approx(np.abs(deviation).max()),
+    }
+
+
+def test_rules_mode_matches_score_record(client):
+    for record in generate_records(25, np.random.default_rng(30)):
+        total, category_scores = SCORING_TABLE.score_record(record)
+
+        body = client.post('/predict?mode=rules', json=record).get_json()
+
+        risk_level, risk_color = SCORING_TABLE.get_risk_level(total)
+        assert body['prediction'] == {'biosecurity_score': round(float(total), 1), 'risk_level': risk_level,
+                                      'risk_color': risk_color, 'max_score': 100}
+        assert body['category_scores'] == category_scores
+        assert body['recommendations'] == SCORING_TABLE.get_recommendations(record, total)
+        assert {key: body['model_info'][key] for key in ('model_name', 'model_version', 'scoring_mode')} == \
+            {'model_name': 'Scoring Table', 'model_version': None, 'scoring_mode': 'rules'}
+
+
+def test_ml_predictions_update_drift_statistics(api, client, drift):
+    records = generate_records(12, np.random.default_rng(31))
+
+    for record in records[:8]:
+        assert client.post('/predict', json=record).status_code == 200
+    assert client.post('/predict/batch', json=records[8:]).status_code == 200
+
+    rules = [SCORING_TABLE.score_record(record)[0] for record in records]
+    assert drift.stats() == expected_drift(api.model.predict_scores(records), rules)
+    assert client.get('/health').get_json()['drift'] == drift.stats()
+    assert client.get('/model-info').get_json()['drift'] == drift.stats()
+
+
+def test_rules_mode_runs_the_model_on_sampled_predictions(api, client, drift):
+    records = generate_records(10, np.random.default_rng(32))
+
+    for record in records[:4]:
+        assert client.post('/predict?mode=rules', json=record).status_code == 200
+    assert client.post('/predict/batch?mode=rules', json=records[4:]).status_code == 200
+
+    rules = [SCORING_TABLE.score_record(record)[0] for record in records]
+    assert drift.stats() == expected_drift(api.model.predict_scores(records), rules)
+
+
+def test_unsampled_predictions_leave_drift_empty(client, drift, monkeypatch):
+    monkeypatch.setattr(drift, 'sample_rate', 0.0)
+
+    client.post('/predict', json=generate_records(1, np.random.default_rng(33))[0])
+
+    assert drift.stats() == {'sample_rate': 0.0, 'samples': 0, 'mean_deviation': None,
+                             'mean_abs_deviation': None, 'rmse': None, 'max_abs_deviation': None}
+
+
+def test_activating_a_model_resets_drift(api, client, drift):
+    client.post('/predict', json=generate_records(1, np.random.default_rng(34))[0])
+    assert drift.stats()['samples'] == 1
+
+    api.activate_model(api.model)
+
+    assert drift.stats()['samples'] == 0
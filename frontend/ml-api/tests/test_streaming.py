@@ -0,0 +1,114 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from biosecurity_model import BiosecurityMLModel
+from scoring import SCORING_TABLE
+from streaming import iter_assessment_chunks, iter_encoded_chunks, stream_fit
+from synthetic_data import generate_records, write_shards
+
+
+def shards(tmp_path, n_rows, file_format='csv', labels=True, name='shards'):
+    directory = str(tmp_path / name)
+    if file_format == 'parquet':
+        pytest.importorskip('pyarrow')
+    write_shards(directory, n_rows, shard_rows=1000, file_format=file_format, seed=5, processes=1,
+                 labels=labels)
+    return directory
+
+
+def streamed(directory, chunksize):
+    """(X, y) chunks of a shard directory, encoded like train_streaming encodes them"""
+    header = next(iter_assessment_chunks(directory, chunksize=1))
+    feature_names = [col for col in header.columns if col != 'biosecurity_score']
+    category_codes = {field: {value: code for code, value in enumerate(sorted(levels))}
+                      for field, levels in SCORING_TABLE.levels.items() if field in feature_names}
+    return lambda: iter_encoded_chunks(directory, feature_names, category_codes, chunksize)
+
+
+class RecordingSGD:
+    """partial_fit learner recording the rows it is given"""
+
+    def __init__(self):
+        from sklearn.linear_model import SGDRegressor
+        self.model = SGDRegressor(random_state=0)
+        self.fitted_rows = []
+
+    def partial_fit(self, X, y):
+        self.fitted_rows.append(len(X))
+        self.model.partial_fit(X, y)
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+def test_chunks_cover_every_shard_in_order(tmp_path, file_format):
+    directory = shards(tmp_path, 2500, file_format)
+
+    chunks = list(iter_assessment_chunks(directory, chunksize=300))
+
+    # Chunks never span shards: 1000, 1000 and 500 rows
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100] * 2 + [300, 200]
+    expected = pd.concat([chunk for chunk in iter_assessment_chunks(directory, chunksize=10_000)],
+                         ignore_index=True)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+def test_unlabelled_chunks_are_scored_on_the_fly(tmp_path):
+    labelled = shards(tmp_path, 1500, name='labelled')
+    unlabelled = shards(tmp_path, 1500, labels=False, name='unlabelled')
+
+    labelled_chunks = streamed(labelled, 400)
+    unlabelled_chunks = streamed(unlabelled, 400)
+
+    for (X, y), (X_unlabelled, y_scored) in zip(labelled_chunks(), unlabelled_chunks()):
+        np.testing.assert_array_equal(X, X_unlabelled)
+        np.testing.assert_allclose(y_scored, y)
+
+
+def test_stream_fit_passes_every_chunk_once_per_epoch(tmp_path):
+    from sklearn.preprocessing import StandardScaler
+    chunks = streamed(shards(tmp_path, 2500), 400)
+    learner = RecordingSGD()
+
+    stats = stream_fit(learner, StandardScaler(), chunks, epochs=3)
+
+    chunk_rows = [400, 400, 200, 400, 400, 200, 400, 100]
+    assert learner.fitted_rows == chunk_rows * 3
+    assert (stats['rows'], stats['epochs']) == (2500, 3)
+    assert np.isfinite(stats['progressive_MAE']) and stats['progressive_R2'] > 0.5
+
+
+def test_memory_stays_flat_as_the_data_grows(tmp_path):
+    from sklearn.preprocessing import StandardScaler
+
+    def peak(n_rows):
+        chunks = streamed(shards(tmp_path, n_rows, name=f'rows-{n_rows}'), 500)
+        tracemalloc.start()
+        try:
+            stream_fit(RecordingSGD(), StandardScaler(), chunks, epochs=1)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    small, large = peak(2000), peak(8000)
+
+    # Four times the rows, about the same peak: one chunk is in memory at a time
+    assert large < 1.25 * small
+
+
+def test_train_streaming_serves_the_streamed_model(tmp_path):
+    model = BiosecurityMLModel()
+
+    stats = model.train_streaming(shards(tmp_path, 3000), chunksize=500, epochs=2)
+
+    assert (stats['rows'], stats['epochs']) == (3000, 2)
+    assert model.best_model_name == 'SGD Regression'
+    records = generate_records(200, np.random.default_rng(4))
+    expected = np.array([SCORING_TABLE.score_record(record)[0] for record in records])
+    scores = model.predict_scores(records)
+    assert np.all((scores >= 0) & (scores <= 100))
+    assert np.mean(np.abs(scores - expected)) < 2 * stats['progressive_MAE']
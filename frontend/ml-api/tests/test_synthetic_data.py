@@ -0,0 +1,72 @@
+import filecmp
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring import SCORING_TABLE
+from synthetic_data import generate_assessments, shard_sizes, write_shards
+
+
+def test_shard_sizes_cover_every_row():
+    assert shard_sizes(10, 4) == [4, 4, 2]
+    assert shard_sizes(8, 4) == [4, 4]
+    assert shard_sizes(3, 4) == [3]
+    assert shard_sizes(0, 4) == []
+
+
+def test_generation_is_deterministic_per_seed():
+    a = generate_assessments(500, np.random.default_rng(3), labels=True)
+    b = generate_assessments(500, np.random.default_rng(3), labels=True)
+    c = generate_assessments(500, np.random.default_rng(4), labels=True)
+    pd.testing.assert_frame_equal(a, b)
+    assert not a.equals(c)
+
+
+@pytest.mark.parametrize('processes', [2, 3])
+def test_csv_shards_are_identical_whatever_the_process_count(tmp_path, processes):
+    serial = write_shards(str(tmp_path / 'serial'), 2500, shard_rows=1000, file_format='csv',
+                          seed=7, processes=1)
+    parallel = write_shards(str(tmp_path / 'parallel'), 2500, shard_rows=1000, file_format='csv',
+                            seed=7, processes=processes)
+
+    assert [os.path.basename(path) for path in serial] == \
+        ['part-00000.csv', 'part-00001.csv', 'part-00002.csv']
+    assert [os.path.basename(path) for path in parallel] == [os.path.basename(path) for path in serial]
+    for a, b in zip(serial, parallel):
+        assert filecmp.cmp(a, b, shallow=False)
+    assert not any(name.endswith('.tmp') for name in os.listdir(tmp_path / 'parallel'))
+
+
+def test_parquet_shards_are_identical_whatever_the_process_count(tmp_path):
+    pytest.importorskip('pyarrow')
+    serial = write_shards(str(tmp_path / 'serial'), 1500, shard_rows=500, seed=7, processes=1)
+    parallel = write_shards(str(tmp_path / 'parallel'), 1500, shard_rows=500, seed=7, processes=3)
+
+    for a, b in zip(serial, parallel):
+        pd.testing.assert_frame_equal(pd.read_parquet(a), pd.read_parquet(b))
+
+
+def test_seed_changes_the_data(tmp_path):
+    a = write_shards(str(tmp_path / 'a'), 200, shard_rows=100, file_format='csv', seed=1, processes=1)
+    b = write_shards(str(tmp_path / 'b'), 200, shard_rows=100, file_format='csv', seed=2, processes=1)
+    assert not filecmp.cmp(a[0], b[0], shallow=False)
+
+
+def test_shards_are_labelled_with_the_scoring_table(tmp_path):
+    paths = write_shards(str(tmp_path), 300, shard_rows=200, file_format='csv', seed=5, processes=1)
+    df = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+
+    assert len(df) == 300
+    expected = SCORING_TABLE.score_frame(df)['biosecurity_score']
+    assert np.array_equal(df['biosecurity_score'].to_numpy(), expected.to_numpy())
+
+
+def test_earlier_shards_do_not_depend_on_the_total_row_count(tmp_path):
+    short = write_shards(str(tmp_path / 'short'), 2000, shard_rows=1000, file_format='csv',
+                         seed=7, processes=1)
+    long = write_shards(str(tmp_path / 'long'), 3500, shard_rows=1000, file_format='csv',
+                        seed=7, processes=2)
+    for a, b in zip(short, long):
+        assert filecmp.cmp(a, b, shallow=False)
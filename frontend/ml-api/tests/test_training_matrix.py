@@ -0,0 +1,97 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from biosecurity_model import SCALED_MODELS, BiosecurityMLModel
+
+
+@pytest.fixture(scope='module')
+def splits():
+    """(model, X_train, X_test, X) over 20k assessments"""
+    from sklearn.model_selection import train_test_split
+    model = BiosecurityMLModel()
+    df = model.generate_synthetic_data(n_samples=20000)
+    df['biosecurity_score'] = model.calculate_biosecurity_scores(df)
+    processed = model.prepare_features(df)
+    X, y = processed.drop(columns='biosecurity_score'), processed['biosecurity_score']
+    X_train, X_test, _, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+    return model, X_train, X_test, X
+
+
+def dense_float32_bytes(X):
+    return X.shape[0] * X.shape[1] * 4
+
+
+def traced(fn, *args):
+    """(result, bytes still allocated, peak bytes) of fn(*args)"""
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+def test_features_are_uint8_codes_and_float32_numerics(splits):
+    model, _, _, X = splits
+    categorical = [col for col in X.columns if col in model.label_encoders]
+
+    assert len(categorical) == 18
+    assert all(X[col].dtype == np.uint8 for col in categorical)
+    assert X['farm_size_acres'].dtype == X['livestock_count'].dtype == np.float32
+    # 18 one-byte codes and 2 four-byte numerics, against 160 bytes as int64
+    assert X.memory_usage(index=False).sum() == 26 * len(X)
+
+
+def test_unscaled_candidates_train_on_the_compact_matrix(splits):
+    model, X_train, X_test, X = splits
+    models = {name: estimator for name, estimator in model.candidate_models().items()
+              if name not in SCALED_MODELS}
+
+    (candidates, _), _, peak = traced(model.candidate_data, models, X_train, X_test, X)
+
+    for estimator, *data in candidates.values():
+        assert [id(matrix) for matrix in data] == [id(X_train), id(X_test), id(X)]
+    assert peak < 0.01 * X.memory_usage(index=False).sum()
+
+
+def test_scaled_candidates_share_float32_splits_and_scale_the_full_data_lazily(splits):
+    model, X_train, X_test, X = splits
+
+    (candidates, full_scaler), retained, peak = traced(
+        model.candidate_data, model.candidate_models(), X_train, X_test, X)
+
+    _, scaled_train, scaled_test, full = candidates['SVR']
+    assert candidates['Neural Network'][1] is scaled_train
+    assert scaled_train.dtype == scaled_test.dtype == np.float32
+    # One float32 copy of the splits; float64 copies or the full data
+    # would double it
+    split_bytes = dense_float32_bytes(X_train) + dense_float32_bytes(X_test)
+    assert retained < 1.05 * split_bytes
+    assert peak < 3 * split_bytes
+    assert not hasattr(full_scaler, 'mean_')
+
+    X_full = full()
+    assert X_full.dtype == np.float32 and X_full.shape == X.shape
+    np.testing.assert_allclose(full_scaler.mean_, X.to_numpy(np.float64).mean(axis=0), rtol=1e-5)
+
+
+@pytest.mark.parametrize('winner', ['Random Forest', 'SGD Regression'])
+def test_scaler_is_kept_only_for_scaled_winners(training_data, monkeypatch, winner):
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import SGDRegressor
+    base, X, y = training_data
+    model = BiosecurityMLModel()
+    model.label_encoders = base.label_encoders
+    model.feature_names = list(X.columns)
+    estimators = {'Random Forest': RandomForestRegressor(n_estimators=10, random_state=0),
+                  'SGD Regression': SGDRegressor(random_state=0)}
+    monkeypatch.setattr(model, 'candidate_models', lambda: {winner: estimators[winner]})
+
+    model.train_models(X, y, n_jobs=1)
+
+    assert model.best_model_name == winner
+    assert ('standard' in model.scalers) == (winner in SCALED_MODELS)
+    assert 0 <= model.predict_score(base.generate_synthetic_data(1, seed=1).iloc[0].to_dict()) <= 100
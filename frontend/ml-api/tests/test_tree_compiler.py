@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from tree_compiler import ALL_TREES_MAX_ROWS, CompiledForest
+
+pytestmark = pytest.mark.filterwarnings('ignore:X does not have valid feature names')
+
+
+def forest(name, categorical_mask):
+    from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor, RandomForestRegressor
+    return {
+        'Random Forest': RandomForestRegressor(n_estimators=10, random_state=0),
+        'Gradient Boosting': GradientBoostingRegressor(n_estimators=30, random_state=0),
+        'Histogram Gradient Boosting': HistGradientBoostingRegressor(
+            categorical_features=categorical_mask, max_iter=50, random_state=0),
+    }[name]
+
+
+def batches(X, seed):
+    """A single row, a batch for the all-trees traversal and one for the per-tree traversal"""
+    rows = np.random.default_rng(seed).integers(0, len(X), ALL_TREES_MAX_ROWS + 1)
+    return [X[:1], X[:ALL_TREES_MAX_ROWS], X[rows]]
+
+
+def with_missing(X, categorical_mask, fraction, seed):
+    """X as float64 with NaN in a fraction of the categorical and the numeric cells"""
+    X = X.astype(np.float64)
+    X[np.random.default_rng(seed).random(X.shape) < fraction] = np.nan
+    # At least one missing level and value in every row's categorical and numeric columns
+    X[::7, np.flatnonzero(categorical_mask)[0]] = np.nan
+    X[3::7, np.flatnonzero(~categorical_mask)[0]] = np.nan
+    return X
+
+
+@pytest.fixture(scope='module')
+def matrix(training_data):
+    """(X as a float32 ndarray, y, categorical column mask)"""
+    model, X, y = training_data
+    return X.to_numpy(dtype=np.float32), y.to_numpy(), np.array([col in model.label_encoders for col in X.columns])
+
+
+def assert_matches_sklearn(estimator, X, seed=0):
+    compiled = CompiledForest.from_sklearn(estimator)
+    for batch in batches(X, seed):
+        np.testing.assert_allclose(compiled.predict(batch), estimator.predict(batch), rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('name', ['Random Forest', 'Gradient Boosting', 'Histogram Gradient Boosting'])
+def test_compiled_forest_matches_sklearn(matrix, name):
+    X, y, categorical_mask = matrix
+    assert_matches_sklearn(forest(name, categorical_mask).fit(X, y), X)
+
+
+def test_categorical_splits_match_sklearn(matrix):
+    X, y, categorical_mask = matrix
+    estimator = forest('Histogram Gradient Boosting', categorical_mask).fit(X, y)
+    compiled = CompiledForest.from_sklearn(estimator)
+
+    split_features = compiled.feature[compiled.bitset >= 0]
+    assert len(split_features) and categorical_mask[split_features].all()
+    # Every level of every categorical column, each in a row of its own
+    probe = np.repeat(X[:1], 256, axis=0)
+    for column in np.flatnonzero(categorical_mask):
+        rows = probe.copy()
+        levels = np.unique(X[:, column])
+        rows[:len(levels), column] = levels
+        np.testing.assert_allclose(compiled.predict(rows[:len(levels)]), estimator.predict(rows[:len(levels)]),
+                                   rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('fitted_with_missing', [False, True])
+def test_missing_values_follow_the_learned_direction(matrix, fitted_with_missing):
+    X, y, categorical_mask = matrix
+    X_fit = with_missing(X, categorical_mask, 0.1, seed=1) if fitted_with_missing else X
+    estimator = forest('Histogram Gradient Boosting', categorical_mask).fit(X_fit, y)
+    compiled = CompiledForest.from_sklearn(estimator)
+
+    assert compiled.missing_left is not None
+    if fitted_with_missing:
+        # Both directions occur, so NaN is not just following one default
+        assert len(np.unique(compiled.missing_left[compiled.children[::2] != np.arange(len(compiled.value))])) == 2
+    assert_matches_sklearn(estimator, with_missing(X, categorical_mask, 0.2, seed=2), seed=3)
@@ -0,0 +1,213 @@
+import numpy as np
+
+# Up to this many rows every tree is traversed at once, one gather per depth
+# level for all (row, tree) pairs. Larger inputs are traversed one tree at a
+# time, which keeps the tree's nodes in cache and is faster at that size.
+ALL_TREES_MAX_ROWS = 4096
+
+# Fitted tree ensembles flatten_forest understands
+FOREST_ESTIMATORS = ['RandomForestRegressor', 'GradientBoostingRegressor', 'HistGradientBoostingRegressor']
+
+
+def _tree_nodes(tree):
+    """Node arrays of a fitted sklearn decision tree"""
+    t = tree.tree_
+    nodes = {'is_leaf': t.children_left == -1, 'left': t.children_left, 'right': t.children_right,
+             'feature': t.feature, 'threshold': t.threshold, 'value': t.value[:, 0, 0],
+             'depth': t.max_depth}
+    # sklearn versions whose trees route missing values store the direction
+    if hasattr(t, 'missing_go_to_left'):
+        nodes['missing_left'] = np.asarray(t.missing_go_to_left).astype(bool)
+    return nodes
+
+
+def _hist_tree_nodes(predictor):
+    """Node arrays of a fitted HistGradientBoosting TreePredictor.
+
+    Categorical nodes send a level left when its bit is set in the node's
+    row of raw_left_cat_bitsets. Missing values (NaN) go the way the node's
+    missing_go_to_left says, for numeric and categorical splits alike.
+    Inputs never hold unknown levels (the feature assembler rejects them).
+    """
+    nodes = predictor.nodes
+    is_leaf = nodes['is_leaf'].astype(bool)
+    return {'is_leaf': is_leaf, 'left': nodes['left'], 'right': nodes['right'],
+            'feature': nodes['feature_idx'], 'threshold': nodes['num_threshold'], 'value': nodes['value'],
+            'depth': int(nodes['depth'].max()),
+            'categorical': nodes['is_categorical'].astype(bool) & ~is_leaf,
+            'bitset': nodes['bitset_idx'].astype(np.int64), 'categories': predictor.raw_left_cat_bitsets,
+            'missing_left': nodes['missing_go_to_left'].astype(bool)}
+
+
+def flatten_trees(trees):
+    """Concatenate trees (_tree_nodes/_hist_tree_nodes) into flat node arrays; returns (arrays, max_depth).
+
+    Children are interleaved (tree_children[2 * node] is the left child,
+    tree_children[2 * node + 1] the right one) and leaves point to
+    themselves. tree_roots holds each tree's first node. When any node
+    splits on categories, tree_bitset holds its row in tree_categories
+    (-1 for threshold splits) and tree_categories the levels going left, one
+    bit per level. When the trees record where missing values go,
+    tree_missing_left holds that direction for every node.
+    """
+    roots, children, feature, threshold, value, bitset, categories = [], [], [], [], [], [], []
+    missing_left = []
+    base = 0
+    n_bitsets = 0
+    max_depth = 0
+    for tree in trees:
+        n_nodes = len(tree['is_leaf'])
+        nodes = np.arange(n_nodes)
+        is_leaf = tree['is_leaf']
+        pairs = np.empty((n_nodes, 2), dtype=np.int64)
+        pairs[:, 0] = np.where(is_leaf, nodes, tree['left']) + base
+        pairs[:, 1] = np.where(is_leaf, nodes, tree['right']) + base
+        roots.append(base)
+        children.append(pairs.ravel())
+        feature.append(np.where(is_leaf, 0, tree['feature']))
+        threshold.append(tree['threshold'])
+        value.append(tree['value'])
+        if 'categorical' in tree:
+            bitset.append(np.where(tree['categorical'], tree['bitset'] + n_bitsets, -1))
+            categories.append(tree['categories'])
+            n_bitsets += len(tree['categories'])
+        else:
+            bitset.append(np.full(n_nodes, -1))
+        if 'missing_left' in tree:
+            missing_left.append(tree['missing_left'])
+        max_depth = max(max_depth, tree['depth'])
+        base += n_nodes
+
+    index_dtype = np.int32 if 2 * base < np.iinfo(np.int32).max else np.int64
+    arrays = {
+        'tree_roots': np.array(roots, dtype=index_dtype),
+        'tree_children': np.concatenate(children).astype(index_dtype),
+        'tree_feature': np.concatenate(feature).astype(index_dtype),
+        'tree_threshold': np.concatenate(threshold).astype(np.float64),
+        'tree_value': np.concatenate(value).astype(np.float64),
+    }
+    if n_bitsets:
+        arrays['tree_bitset'] = np.concatenate(bitset).astype(index_dtype)
+        arrays['tree_categories'] = np.concatenate(categories).astype(np.uint32)
+    if missing_left and len(missing_left) == len(roots):
+        arrays['tree_missing_left'] = np.concatenate(missing_left).astype(np.uint8)
+    return arrays, max_depth
+
+
+def flatten_forest(estimator):
+    """(params, arrays) describing a fitted tree ensemble named in FOREST_ESTIMATORS"""
+    name = type(estimator).__name__
+    if name == 'RandomForestRegressor':
+        arrays, max_depth = flatten_trees([_tree_nodes(tree) for tree in estimator.estimators_])
+        return {'max_depth': max_depth, 'aggregate': 'mean'}, arrays
+    if name == 'GradientBoostingRegressor':
+        arrays, max_depth = flatten_trees([_tree_nodes(tree) for tree in estimator.estimators_[:, 0]])
+        init = 0.0 if estimator.init_ == 'zero' else float(np.ravel(estimator.init_.constant_)[0])
+        return {'max_depth': max_depth, 'aggregate': 'sum', 'init': init,
+                'learning_rate': float(estimator.learning_rate)}, arrays
+    if name == 'HistGradientBoostingRegressor':
+        # Leaf values already include the learning rate; losses such as
+        # poisson map the raw sum through a link this format does not store
+        if type(estimator._loss.link).__name__ != 'IdentityLink':
+            raise ValueError(f"Cannot compile {name} with loss='{estimator.loss}'")
+        arrays, max_depth = flatten_trees([_hist_tree_nodes(predictors[0])
+                                           for predictors in estimator._predictors])
+        return {'max_depth': max_depth, 'aggregate': 'sum',
+                'init': float(np.ravel(estimator._baseline_prediction)[0])}, arrays
+    raise ValueError(f"Cannot compile {name}")
+
+
+class CompiledForest:
+    """Tree ensemble evaluated from flat node arrays (see flatten_trees).
+
+    Because leaves point to themselves, one traversal step for every
+    (row, tree) pair is a few NumPy gathers with no leaf masking. Traversal
+    stops as soon as no node moves; categorical splits (histogram gradient
+    boosting) are looked up in their bitsets afterwards, and when the input
+    holds NaN those rows follow tree_missing_left as sklearn does (left if
+    the trees do not record it). The arrays can be views into a
+    memory-mapped model artifact.
+
+    Small inputs (single requests) beat sklearn's per-call overhead by a wide
+    margin; on large batches sklearn's compiled traversal is faster, so
+    callers that still hold the estimator should send those to it.
+    """
+
+    def __init__(self, params, arrays):
+        self.params = params
+        self.roots = arrays['tree_roots']
+        self.children = arrays['tree_children']
+        self.feature = arrays['tree_feature']
+        self.threshold = arrays['tree_threshold']
+        self.value = arrays['tree_value']
+        self.bitset = arrays.get('tree_bitset')
+        self.categories = arrays.get('tree_categories')
+        self.missing_left = arrays.get('tree_missing_left')
+        self.max_depth = params['max_depth']
+        self.aggregate = params['aggregate']
+        self.init = params.get('init', 0.0)
+        self.learning_rate = params.get('learning_rate', 1.0)
+
+    @classmethod
+    def from_sklearn(cls, estimator):
+        """Compile a fitted tree ensemble named in FOREST_ESTIMATORS"""
+        return cls(*flatten_forest(estimator))
+
+    def predict(self, X):
+        # sklearn trees compare float32 features against float64 thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        # Served inputs never hold NaN, so only inputs that do pay for routing it
+        missing = self.missing_left is not None and bool(np.isnan(X).any())
+        if len(X) <= ALL_TREES_MAX_ROWS:
+            leaf_sum = self._leaf_sum_all_trees(X, missing)
+        else:
+            leaf_sum = self._leaf_sum_per_tree(X, missing)
+        if self.aggregate == 'mean':
+            return leaf_sum / len(self.roots)
+        return self.init + self.learning_rate * leaf_sum
+
+    def _leaf_sum_all_trees(self, X, missing):
+        flat = X.ravel()
+        row_offsets = (np.arange(len(X), dtype=self.children.dtype) * X.shape[1])[:, None]
+        nodes = np.tile(self.roots, (len(X), 1))
+        for _ in range(self.max_depth):
+            next_nodes = self._step(flat, row_offsets, nodes, missing)
+            if np.array_equal(next_nodes, nodes):
+                break
+            nodes = next_nodes
+        return self.value[nodes].sum(axis=1)
+
+    def _leaf_sum_per_tree(self, X, missing):
+        flat = X.ravel()
+        row_offsets = np.arange(len(X), dtype=self.children.dtype) * X.shape[1]
+        leaf_sum = np.zeros(len(X))
+        for root in self.roots:
+            nodes = np.full(len(X), root, dtype=self.children.dtype)
+            for _ in range(self.max_depth):
+                next_nodes = self._step(flat, row_offsets, nodes, missing)
+                if np.array_equal(next_nodes, nodes):
+                    break
+                nodes = next_nodes
+            leaf_sum += self.value[nodes]
+        return leaf_sum
+
+    def _step(self, flat, row_offsets, nodes, missing=False):
+        """Move every node one level down; leaves stay where they are"""
+        x = flat[row_offsets + self.feature[nodes]]
+        go_right = x > self.threshold[nodes]
+        if missing:
+            nan = np.isnan(x)
+        if self.bitset is not None:
+            bitset = self.bitset[nodes]
+            categorical = bitset >= 0
+            if missing:
+                categorical &= ~nan
+            if categorical.any():
+                levels = x[categorical].astype(np.intp)
+                words = self.categories[bitset[categorical], levels >> 5]
+                go_right[categorical] = (words >> (levels & 31).astype(np.uint32)) & 1 == 0
+        if missing:
+            go_right[nan] = self.missing_left[nodes[nan]] == 0
+        return self.children[2 * nodes + go_right]